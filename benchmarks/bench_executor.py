@@ -0,0 +1,61 @@
+"""
+Throughput of 50 concurrent tool calls with and without the worker pool.
+
+Box API latency is simulated with a sleep inside the patched toolkit function,
+so the benchmark runs without Box credentials:
+
+    uv run benchmarks/bench_executor.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from config import ExecutorConfig
+from executor import configure_executor
+from tools.box_tools_folders import box_folder_info_tool
+
+CONCURRENT_CALLS = 50
+BOX_LATENCY = 0.05
+
+
+def fake_box_folder_info(client, folder_id):
+    time.sleep(BOX_LATENCY)
+    return {"folder": {"id": folder_id, "type": "folder"}}
+
+
+async def blocking_folder_info_tool(ctx, folder_id: str) -> dict:
+    """The tool as it was before the worker pool: the toolkit call runs on the loop."""
+    return fake_box_folder_info(client=None, folder_id=folder_id)
+
+
+async def measure(tool) -> float:
+    ctx = MagicMock()
+    start = time.perf_counter()
+    await asyncio.gather(*[tool(ctx, str(i)) for i in range(CONCURRENT_CALLS)])
+    return CONCURRENT_CALLS / (time.perf_counter() - start)
+
+
+async def main():
+    configure_executor(ExecutorConfig(max_workers=CONCURRENT_CALLS))
+    with (
+        patch("tools.box_tools_folders.box_folder_info", fake_box_folder_info),
+        patch("tools.box_tools_folders.get_box_client", return_value=None),
+    ):
+        baseline = await measure(blocking_folder_info_tool)
+        offloaded = await measure(box_folder_info_tool)
+
+    print(
+        f"{CONCURRENT_CALLS} concurrent calls, {BOX_LATENCY * 1000:.0f}ms Box latency"
+    )
+    print(f"  on the event loop: {baseline:8.1f} calls/s")
+    print(f"  worker pool:       {offloaded:8.1f} calls/s")
+    print(f"  speedup:           {offloaded / baseline:8.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
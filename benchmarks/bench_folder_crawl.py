@@ -0,0 +1,73 @@
+"""
+Recursive folder listing, one folder at a time versus the concurrent crawl.
+
+Box is replaced by a local stand-in tree whose folder listings sleep for the
+Box API latency, so the benchmark runs without Box credentials:
+
+    uv run benchmarks/bench_folder_crawl.py [concurrency]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from box_sdk_gen import FileMini, FolderMini
+
+from tools.box_api_async import crawl_folder_async
+
+DEPTH = 4
+WIDTH = 6
+FILES_PER_FOLDER = 5
+BOX_LATENCY = 0.02
+
+
+def build_tree() -> dict:
+    tree = {}
+    level = ["0"]
+    for _ in range(DEPTH):
+        next_level = []
+        for folder_id in level:
+            tree[folder_id] = [f"{folder_id}.{i}" for i in range(WIDTH)]
+            next_level.extend(tree[folder_id])
+        level = next_level
+    return tree
+
+
+TREE = build_tree()
+
+
+async def folder_page_items(client, folder_id, limit, fields):
+    await asyncio.sleep(BOX_LATENCY)
+    folders = [FolderMini(id=child, name=child) for child in TREE.get(folder_id, [])]
+    files = [
+        FileMini(id=f"{folder_id}-{i}", name=f"{i}.pdf")
+        for i in range(FILES_PER_FOLDER)
+    ]
+    return folders + files
+
+
+async def measure(concurrency: int) -> float:
+    start = time.perf_counter()
+    await crawl_folder_async(None, "0", concurrency=concurrency)
+    return time.perf_counter() - start
+
+
+async def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    folders = 1 + sum(len(children) for children in TREE.values())
+    with patch("tools.box_api_async._folder_page_items", folder_page_items):
+        sequential = await measure(1)
+        concurrent = await measure(concurrency)
+
+    print(f"{folders} folders, {BOX_LATENCY * 1000:.0f}ms Box latency per listing")
+    print(f"  one folder at a time:   {sequential:6.2f}s")
+    print(f"  {concurrency:3d} folders at a time: {concurrent:6.2f}s")
+    print(f"  speedup:                {sequential / concurrent:6.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+"""
+Query latency of the local content index.
+
+A stand-in corpus of contracts, each a few thousand words drawn from a
+Zipf distributed vocabulary, is indexed into a temporary database. Each row
+times a query, ranking included and snippets of the ten best files:
+
+    uv run --with numpy benchmarks/bench_local_search.py [files]
+"""
+
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from cache.content_index import ContentIndex
+
+ROUNDS = 50
+WORDS_PER_FILE = 3000
+VOCABULARY = [f"term{i}" for i in range(20000)] + [
+    "indemnify",
+    "termination",
+    "liability",
+    "confidential",
+]
+
+
+def build(index: ContentIndex, files: int) -> None:
+    rng = random.Random(1)
+    weights = [1 / (rank + 1) for rank in range(len(VOCABULARY))]
+    for file_id in range(files):
+        words = rng.choices(VOCABULARY, weights=weights, k=WORDS_PER_FILE)
+        index.store.put(
+            str(file_id), "1", f"contract {file_id}.pdf", "1", " ".join(words)
+        )
+
+
+async def measure(index: ContentIndex, query: str) -> tuple:
+    found = await index.search(query)
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        found = await index.search(query)
+    return (time.perf_counter() - start) / ROUNDS * 1000, found["total_count"]
+
+
+async def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with tempfile.TemporaryDirectory() as directory:
+        index = ContentIndex(["1"], str(Path(directory) / "index.sqlite3"))
+        start = time.perf_counter()
+        build(index, files)
+        print(f"Indexed {files} files in {time.perf_counter() - start:.1f} s")
+        index.synced_at = time.time()
+
+        start = time.perf_counter()
+        await index.search("term1")
+        print(f"Loaded the arrays in {time.perf_counter() - start:.1f} s")
+
+        print(f"{'':36} {'matches':>8} {'ms per query':>12}")
+        for query in [
+            "indemnify",
+            "termination liability",
+            "term2 term3",
+            "confidential indemnify term15000",
+        ]:
+            elapsed, matches = await measure(index, query)
+            print(f"{query:36} {matches:8,d} {elapsed:12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
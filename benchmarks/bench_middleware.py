@@ -0,0 +1,90 @@
+"""
+Per-request overhead of the auth middleware.
+
+Sends requests straight through AuthMiddleware to an app that does nothing,
+so the time measured is the middleware itself. At 10k requests per second a
+request has a budget of 100 microseconds; the overhead is shown as a share of
+that budget. Runs without Box credentials:
+
+    uv run benchmarks/bench_middleware.py
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from config import AppConfig, BoxAuthType, McpAuthType
+from middleware import AuthMiddleware
+
+REQUESTS = 100_000
+BUDGET_US = 1_000_000 / 10_000
+
+# Headers of a typical streamable-http tool call
+HEADERS = [
+    (b"host", b"127.0.0.1:8005"),
+    (b"user-agent", b"python-httpx/0.28.1"),
+    (b"accept", b"application/json, text/event-stream"),
+    (b"content-type", b"application/json"),
+    (b"mcp-protocol-version", b"2025-06-18"),
+    (b"content-length", b"120"),
+]
+
+
+async def app(scope, receive, send):
+    pass
+
+
+async def receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def send(message):
+    pass
+
+
+def make_middleware(mcp_auth_type: McpAuthType, box_auth: BoxAuthType):
+    config = AppConfig()
+    config.server.mcp_auth_type = mcp_auth_type
+    config.server.box_auth = box_auth
+    config.mcp_auth.auth_token = "benchmark-token"
+    return AuthMiddleware(app, app_config=config)
+
+
+async def measure(middleware, authorization: bytes) -> float:
+    """Return the mean time per request in microseconds."""
+    headers = HEADERS + [(b"authorization", authorization)]
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        scope = {"type": "http", "method": "POST", "path": "/mcp", "headers": headers}
+        await middleware(scope, receive, send)
+    return (time.perf_counter() - start) / REQUESTS * 1_000_000
+
+
+async def main():
+    logging.basicConfig(level=logging.WARNING)
+    # Failed requests log a warning each, keep them out of the measurement
+    logging.getLogger("mcp_auth").setLevel(logging.CRITICAL)
+
+    baseline = await measure(app, b"Bearer benchmark-token")
+    cases = [
+        ("none", McpAuthType.NONE, BoxAuthType.CCG, b"Bearer benchmark-token"),
+        ("token", McpAuthType.TOKEN, BoxAuthType.CCG, b"Bearer benchmark-token"),
+        ("token, rejected", McpAuthType.TOKEN, BoxAuthType.CCG, b"Bearer wrong"),
+        ("oauth", McpAuthType.OAUTH, BoxAuthType.OAUTH, b"Bearer box-token"),
+    ]
+    print(f"{REQUESTS} requests per case, {BUDGET_US:.0f} us budget at 10k req/s")
+    for name, mcp_auth_type, box_auth, authorization in cases:
+        middleware = make_middleware(mcp_auth_type, box_auth)
+        overhead = await measure(middleware, authorization) - baseline
+        print(
+            f"  {name:16s} {overhead:6.2f} us/request "
+            f"({overhead / BUDGET_US:5.1%} of budget)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
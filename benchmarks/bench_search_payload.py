@@ -0,0 +1,130 @@
+"""
+Search result payload and processing time, Box SDK models versus projection.
+
+A broad query is stood in by a Box search response of full file objects.
+Each row times decoding the response body, turning it into tool results and
+serializing those for the MCP client, and reports the size of the result:
+
+    uv run benchmarks/bench_search_payload.py [results]
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from box_sdk_gen import SearchResults, deserialize
+
+from tools.box_api_async import SEARCH_FIELDS, project_fields
+
+ROUNDS = 20
+
+
+def user(user_id: str) -> dict:
+    return {
+        "type": "user",
+        "id": user_id,
+        "name": "Ann Example",
+        "login": "ann@example.com",
+    }
+
+
+def full_file(file_id: int) -> dict:
+    folders = [
+        {"type": "folder", "id": str(i), "sequence_id": "1", "etag": "1", "name": name}
+        for i, name in enumerate(["All Files", "Finance", "Contracts", "2025"])
+    ]
+    return {
+        "type": "file",
+        "id": str(file_id),
+        "etag": "3",
+        "sequence_id": "3",
+        "name": f"Master services agreement {file_id}.pdf",
+        "sha1": "85136c79cbf9fe36bb9d05d0639c70c265c18d37",
+        "file_version": {
+            "type": "file_version",
+            "id": str(file_id * 10),
+            "sha1": "85136c79",
+        },
+        "description": "Signed agreement with the supplier, including all amendments",
+        "size": 629644,
+        "path_collection": {"total_count": len(folders), "entries": folders},
+        "created_at": "2025-03-12T10:53:43-08:00",
+        "modified_at": "2025-03-12T10:53:43-08:00",
+        "trashed_at": None,
+        "purged_at": None,
+        "content_created_at": "2025-03-12T10:53:43-08:00",
+        "content_modified_at": "2025-03-12T10:53:43-08:00",
+        "created_by": user("11"),
+        "modified_by": user("11"),
+        "owned_by": user("12"),
+        "shared_link": None,
+        "parent": folders[-1],
+        "item_status": "active",
+    }
+
+
+def response_body(count: int, fields: List[str] | None) -> bytes:
+    entries = [full_file(i) for i in range(count)]
+    if fields is not None:
+        entries = [project_fields(entry, fields) | {"etag": "3"} for entry in entries]
+    return json.dumps(
+        {"type": "search_results_items", "entries": entries, "total_count": count}
+    ).encode()
+
+
+def with_sdk_models(body: bytes) -> str:
+    results = deserialize(json.loads(body), SearchResults)
+    return json.dumps([entry.to_dict() for entry in results.entries])
+
+
+def with_projection(fields: List[str]) -> Callable[[bytes], str]:
+    def run(body: bytes) -> str:
+        entries = json.loads(body)["entries"]
+        return json.dumps([project_fields(entry, fields) for entry in entries])
+
+    return run
+
+
+def measure(body: bytes, process: Callable[[bytes], str]) -> tuple:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        output = process(body)
+    return (time.perf_counter() - start) / ROUNDS * 1000, len(output)
+
+
+def main():
+    results = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rows = [
+        (
+            f"{results} full objects, SDK models",
+            response_body(results, None),
+            with_sdk_models,
+        ),
+        (
+            f"{results} default fields, SDK models",
+            response_body(results, SEARCH_FIELDS),
+            with_sdk_models,
+        ),
+        (
+            f"{results} default fields, projection",
+            response_body(results, SEARCH_FIELDS),
+            with_projection(SEARCH_FIELDS),
+        ),
+        (
+            "30 results, fields=[name], projection",
+            response_body(30, ["name"]),
+            with_projection(["name"]),
+        ),
+    ]
+    print(f"{'':42} {'result bytes':>12} {'ms per call':>12}")
+    for label, body, process in rows:
+        elapsed, size = measure(body, process)
+        print(f"{label:42} {size:12,d} {elapsed:12.2f}")
+
+
+if __name__ == "__main__":
+    main()
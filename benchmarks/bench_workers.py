@@ -0,0 +1,128 @@
+"""
+Requests per second of the http transport with 1..N worker processes.
+
+Starts the server with --workers N on a free port and sends tools/list
+requests from several client processes. tools/list serializes the schemas of
+every tool, so the server is CPU bound and throughput should grow with the
+number of workers up to the number of cores. Runs without Box credentials:
+
+    uv run benchmarks/bench_workers.py [max_workers]
+"""
+
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import httpx
+
+SRC = Path(__file__).parent.parent / "src"
+DURATION = 5.0
+CLIENT_PROCESSES = 4
+CONNECTIONS_PER_CLIENT = 16
+
+REQUEST = {"jsonrpc": "2.0", "id": 1, "method": "tools/list"}
+HEADERS = {
+    "Authorization": "Bearer benchmark",
+    "Accept": "application/json, text/event-stream",
+    "Content-Type": "application/json",
+}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            str(SRC / "mcp_server_box.py"),
+            "--transport=http",
+            "--mcp-auth-type=none",
+            "--box-auth-type=mcp_client",
+            "--host=127.0.0.1",
+            f"--port={port}",
+            f"--workers={workers}",
+        ],
+        cwd=SRC,
+        env={**os.environ, "LOG_LEVEL": "WARNING"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            response = httpx.post(
+                f"http://127.0.0.1:{port}/mcp", json=REQUEST, headers=HEADERS
+            )
+            if response.status_code == 200:
+                return server
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("server did not start")
+
+
+def client_process(port: int, results) -> None:
+    """Send requests on CONNECTIONS_PER_CLIENT threads for DURATION seconds."""
+    count = 0
+    lock = threading.Lock()
+    deadline = time.monotonic() + DURATION
+
+    def run():
+        nonlocal count
+        with httpx.Client(headers=HEADERS) as client:
+            while time.monotonic() < deadline:
+                client.post(f"http://127.0.0.1:{port}/mcp", content=json.dumps(REQUEST))
+                with lock:
+                    count += 1
+
+    threads = [threading.Thread(target=run) for _ in range(CONNECTIONS_PER_CLIENT)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put(count)
+
+
+def measure(workers: int) -> float:
+    port = free_port()
+    server = start_server(workers, port)
+    try:
+        results = multiprocessing.Queue()
+        clients = [
+            multiprocessing.Process(target=client_process, args=(port, results))
+            for _ in range(CLIENT_PROCESSES)
+        ]
+        for client in clients:
+            client.start()
+        total = sum(results.get() for _ in clients)
+        for client in clients:
+            client.join()
+        return total / DURATION
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    print(f"tools/list over http, {os.cpu_count()} cores")
+    baseline = None
+    for workers in range(1, max_workers + 1):
+        rps = measure(workers)
+        baseline = baseline or rps
+        print(f"  {workers:2d} workers: {rps:8.1f} req/s ({rps / baseline:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,638 @@
+"""Local full-text index of the files in selected folders, ranked with BM25."""
+
+import asyncio
+import json
+import logging
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from box_ai_agents_toolkit import box_file_text_extract
+from box_sdk_gen import BoxClient
+
+from config import CacheConfig
+from executor import run_blocking
+from metrics import register_metrics
+from tools.box_api_async import crawl_folder_async
+
+try:
+    import numpy as np
+except ImportError:  # Optional, the index is disabled without it
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# BM25 term frequency saturation and document length normalization
+K1 = 1.2
+B = 0.75
+
+# Characters of text returned around the matched words of a result
+SNIPPET_CHARS = 200
+
+# Longer tokens are not words, e.g. base64 or hashes
+MAX_TOKEN_LENGTH = 64
+
+_TOKEN = re.compile(r"\w+")
+
+# (file ID, name, IDs of the folders above the file separated by spaces,
+# number of words, JSON object of the count of each word)
+FileRow = Tuple[str, str, str, int, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    name TEXT NOT NULL,
+    ancestors TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    terms TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    """Return the case folded words of text."""
+    return [
+        token.casefold()
+        for token in _TOKEN.findall(text)
+        if len(token) <= MAX_TOKEN_LENGTH
+    ]
+
+
+def _is_word(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _find_words(text: str, terms: Set[str]) -> List[Tuple[int, int, str]]:
+    """Return the (start, end, term) of each occurrence of terms as a word, in order."""
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Lower casing changed the offsets, e.g. of a dotted capital I
+        return []
+    hits = []
+    for term in terms:
+        start = lowered.find(term)
+        while start != -1:
+            end = start + len(term)
+            if not (start and _is_word(lowered[start - 1])) and not (
+                end < len(lowered) and _is_word(lowered[end])
+            ):
+                hits.append((start, end, term))
+            start = lowered.find(term, end)
+    hits.sort()
+    return hits
+
+
+def make_snippet(text: str, terms: Set[str], width: int = SNIPPET_CHARS) -> str:
+    """
+    Return about width characters of text around its query words.
+
+    The window holding the most distinct terms wins, the earliest one on a
+    tie. Without any match the snippet is the start of the text.
+    """
+    hits = _find_words(text, terms)
+    best_start, best_count = 0, 0
+    counts: Counter = Counter()
+    left = 0
+    for start, end, term in hits:
+        counts[term] += 1
+        while end - hits[left][0] > width:
+            counts[hits[left][2]] -= 1
+            if not counts[hits[left][2]]:
+                del counts[hits[left][2]]
+            left += 1
+        if len(counts) > best_count:
+            best_start, best_count = hits[left][0], len(counts)
+            if best_count == len(terms):
+                # No window can hold more
+                break
+    # Leave a little context before the first word
+    begin = max(0, best_start - width // 5)
+    end = begin + width
+    snippet = " ".join(text[begin:end].split())
+    if begin > 0:
+        snippet = "…" + snippet
+    if end < len(text):
+        snippet += "…"
+    return snippet
+
+
+def _version(item: Dict[str, Any]) -> str:
+    """Return what identifies the content of a file, its version ID if listed."""
+    return str(
+        (item.get("file_version") or {}).get("id")
+        or item.get("sha1")
+        or item.get("etag")
+        or ""
+    )
+
+
+def _collect_files(
+    items: List[Dict[str, Any]], root: str, found: Dict[str, Tuple[str, str, str]]
+) -> None:
+    """Add the (version, name, ancestors) of the files of a crawl result to found."""
+    pending = [((root,), items)]
+    while pending:
+        path, items = pending.pop()
+        for item in items:
+            if item.get("type") == "file":
+                found[item["id"]] = (
+                    _version(item),
+                    item.get("name") or "",
+                    " ".join(path),
+                )
+            elif item.get("type") == "folder" and item.get("items"):
+                pending.append((path + (item["id"],), item["items"]))
+
+
+class IndexStore:
+    """
+    SQLite table of the indexed files.
+
+    Each file is one row with its word counts, the postings are only put
+    together in memory by the scorer, so indexing a file is a single write.
+    The extracted text is kept for the snippets. The methods are blocking
+    and thread safe, the index calls them through run_blocking.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # A crash loses at most the last files, read again on the next sync
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get_state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM state WHERE key = ?", (key,)
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def set_state(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    def reset(self, roots: Sequence[str]) -> None:
+        """Drop every file, e.g. when other folders are indexed."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM files")
+            self._conn.execute("DELETE FROM state")
+            self._conn.execute(
+                "INSERT INTO state (key, value) VALUES ('roots', ?)",
+                (json.dumps(sorted(roots)),),
+            )
+
+    def files(self) -> Dict[str, Tuple[str, str, str]]:
+        """Return the (version, name, ancestors) of every indexed file by ID."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, version, name, ancestors FROM files"
+            ).fetchall()
+        return {row[0]: (row[1], row[2], row[3]) for row in rows}
+
+    def _index(
+        self, file_id: str, version: str, name: str, ancestors: str, text: str
+    ) -> None:
+        # The name is searched as well, e.g. for files without any text
+        counts = Counter(tokenize(name) + tokenize(text))
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                file_id,
+                version,
+                name,
+                ancestors,
+                sum(counts.values()),
+                json.dumps(counts),
+                text,
+            ),
+        )
+
+    def put(
+        self, file_id: str, version: str, name: str, ancestors: str, text: str
+    ) -> None:
+        """Index a file version, replacing the previous one."""
+        with self._lock, self._conn:
+            self._index(file_id, version, name, ancestors, text)
+
+    def move(self, files: List[Tuple[str, str, str]]) -> None:
+        """Update the (ID, name, ancestors) of files renamed or moved."""
+        with self._lock, self._conn:
+            for file_id, name, ancestors in files:
+                version, text = self._conn.execute(
+                    "SELECT version, text FROM files WHERE id = ?", (file_id,)
+                ).fetchone()
+                self._index(file_id, version, name, ancestors, text)
+
+    def remove(self, file_ids: List[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM files WHERE id = ?", [(file_id,) for file_id in file_ids]
+            )
+
+    def load(self) -> List[FileRow]:
+        """Return every file with its word counts."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, name, ancestors, length, terms FROM files"
+            ).fetchall()
+
+    def texts(self, file_ids: List[str]) -> Dict[str, str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, text FROM files WHERE id IN "
+                f"({', '.join('?' * len(file_ids))})",
+                file_ids,
+            ).fetchall()
+        return dict(rows)
+
+
+class _Scorer:
+    """
+    Inverted index of all the files as NumPy arrays.
+
+    The postings of a term are one slice of the file position and term
+    frequency arrays, so a query adds up the BM25 score of all the files
+    containing a term in one vectorized step.
+    """
+
+    def __init__(self, files: List[FileRow]):
+        self.ids = [row[0] for row in files]
+        self.names = [row[1] for row in files]
+        self.ancestors = [frozenset(row[2].split()) for row in files]
+        self.folders: Set[str] = set().union(*self.ancestors)
+        lengths = np.array([row[3] for row in files], dtype=np.float32)
+        average = float(lengths.mean()) if len(files) else 1.0
+        self._norm = K1 * (1 - B + B * lengths / max(average, 1.0))
+
+        # Term number of each word
+        self._terms: Dict[str, int] = {}
+        term_ids: List[int] = []
+        tfs: List[int] = []
+        sizes: List[int] = []
+        for row in files:
+            counts = json.loads(row[4])
+            term_ids.extend(
+                self._terms.setdefault(term, len(self._terms)) for term in counts
+            )
+            tfs.extend(counts.values())
+            sizes.append(len(counts))
+        term_ids_array = np.array(term_ids, dtype=np.int32)
+        # Group the postings by term, each term's files keep their order
+        order = np.argsort(term_ids_array, kind="stable")
+        self._files = np.repeat(np.arange(len(files), dtype=np.int32), sizes)[order]
+        self._tfs = np.array(tfs, dtype=np.float32)[order]
+        # Postings of term t are self._files[self._starts[t] : self._starts[t + 1]]
+        self._starts = np.zeros(len(self._terms) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(term_ids_array, minlength=len(self._terms)),
+            out=self._starts[1:],
+        )
+
+    def score(
+        self, terms: Set[str], limit: int, folders: Set[str]
+    ) -> Tuple[int, List[Tuple[int, float]]]:
+        """
+        Rank the files containing any of terms.
+
+        Returns:
+            Tuple[int, List[Tuple[int, float]]]: The number of matching files
+                and the (position, score) of the best limit ones, best first
+        """
+        count = len(self.ids)
+        scores = np.zeros(count, dtype=np.float32)
+        for term in terms:
+            term_id = self._terms.get(term)
+            if term_id is None:
+                continue
+            start, end = self._starts[term_id], self._starts[term_id + 1]
+            files = self._files[start:end]
+            tfs = self._tfs[start:end]
+            idf = math.log(1 + (count - len(files) + 0.5) / (len(files) + 0.5))
+            scores[files] += idf * tfs * (K1 + 1) / (tfs + self._norm[files])
+        if folders:
+            inside = np.fromiter(
+                (not folders.isdisjoint(above) for above in self.ancestors),
+                dtype=bool,
+                count=count,
+            )
+            scores[~inside] = 0
+        matched = np.flatnonzero(scores > 0)
+        total = len(matched)
+        if total > limit:
+            matched = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+        ranked = matched[np.argsort(-scores[matched], kind="stable")]
+        return total, [(int(i), float(scores[i])) for i in ranked]
+
+
+class ContentIndex:
+    """
+    Inverted index of the text of the files in the configured root folders.
+
+    Every refresh_interval seconds the roots are crawled and the text of each
+    file whose version changed since the last sync is extracted with
+    box_file_text_extract, so only new and changed files are read. The
+    word counts and texts are stored in SQLite and survive a restart. Queries
+    are ranked with BM25 over NumPy arrays loaded from the database after
+    each change.
+
+    The index only answers while its last sync is at most max_age seconds
+    old, and, as it is built with the server's own account, only for callers
+    without a token of their own.
+    """
+
+    def __init__(
+        self,
+        roots: Sequence[str],
+        path: str,
+        max_age: float = 3600.0,
+        refresh_interval: float = 900.0,
+        concurrency: int = 4,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.roots = list(roots)
+        self.path = path
+        self.max_age = max_age
+        self.refresh_interval = refresh_interval
+        self.concurrency = max(1, concurrency)
+        # Wall clock, the sync time is stored and compared after a restart
+        self._clock = clock
+        self._store: Optional[IndexStore] = None
+        self._scorer: Optional[_Scorer] = None
+        # Bumped on every change, so a scorer loaded meanwhile is not kept
+        self._generation = 0
+        self._task: Optional[asyncio.Task] = None
+        self.synced_at: Optional[float] = None
+        self.searches = 0
+        self.fallbacks = 0
+        self.files_indexed = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any folder is indexed."""
+        return bool(self.roots) and np is not None
+
+    @property
+    def store(self) -> IndexStore:
+        # Opened on first use, a disabled index never creates the database
+        if self._store is None:
+            self._store = IndexStore(self.path)
+        return self._store
+
+    def fresh(self) -> bool:
+        """Whether the index was synced within max_age seconds."""
+        return (
+            self.synced_at is not None
+            and self._clock() - self.synced_at <= self.max_age
+        )
+
+    def start(self, client: BoxClient) -> None:
+        """Start syncing in the background, unless already running."""
+        if not self.enabled:
+            return
+        loop = asyncio.get_running_loop()
+        task = self._task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._task = loop.create_task(self.run(client))
+
+    async def stop(self) -> None:
+        """Stop the background sync."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run(self, client: BoxClient) -> None:
+        """Sync every refresh_interval seconds until cancelled."""
+        await self.open()
+        while True:
+            try:
+                await self.sync(client)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Failed to sync content index: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    async def open(self) -> None:
+        """Serve the stored index, or start over if it has other roots."""
+        store = self.store
+        roots = await run_blocking(store.get_state, "roots")
+        if roots is None or json.loads(roots) != sorted(self.roots):
+            await run_blocking(store.reset, self.roots)
+            self.synced_at = None
+        else:
+            synced_at = await run_blocking(store.get_state, "synced_at")
+            self.synced_at = float(synced_at) if synced_at else None
+        self._generation += 1
+
+    async def sync(self, client: BoxClient) -> int:
+        """
+        Crawl the roots and index the files added or changed since the last sync.
+
+        Files whose text is still being extracted by Box, or fails to
+        extract, keep their previous version and are read again on the next
+        sync. Files without any text are indexed by name. The files below a
+        subfolder that fails to list are kept as they are.
+
+        Returns:
+            int: Number of files read
+
+        Raises:
+            BoxAsyncAPIError: If a root folder cannot be listed
+        """
+        store = self.store
+        skipped: List[str] = []
+        crawls = await asyncio.gather(
+            *(
+                crawl_folder_async(client, root, True, skipped=skipped)
+                for root in self.roots
+            )
+        )
+        found: Dict[str, Tuple[str, str, str]] = {}
+        for root, items in zip(self.roots, crawls):
+            _collect_files(items, root, found)
+        stored = await run_blocking(store.files)
+
+        unlisted = set(skipped)
+        removed = [
+            file_id
+            for file_id, (_, _, ancestors) in stored.items()
+            if file_id not in found and unlisted.isdisjoint(ancestors.split())
+        ]
+        changed = [
+            file_id
+            for file_id, (version, _, _) in found.items()
+            if file_id not in stored or stored[file_id][0] != version
+        ]
+        moved = [
+            (file_id, name, ancestors)
+            for file_id, (version, name, ancestors) in found.items()
+            if file_id in stored
+            and stored[file_id][0] == version
+            and stored[file_id][1:] != (name, ancestors)
+        ]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def read(file_id: str) -> bool:
+            async with semaphore:
+                try:
+                    result = await run_blocking(box_file_text_extract, client, file_id)
+                except Exception as e:
+                    self.errors += 1
+                    logger.warning(f"Failed to extract text of file {file_id}: {e}")
+                    return False
+            if "content" in result:
+                text = result["content"]
+            elif result.get("status") == "impossible":
+                text = ""
+            else:
+                # Still being generated, or failed for now
+                return False
+            version, name, ancestors = found[file_id]
+            await run_blocking(store.put, file_id, version, name, ancestors, text)
+            return True
+
+        read_files = sum(await asyncio.gather(*(read(file_id) for file_id in changed)))
+        if removed:
+            await run_blocking(store.remove, removed)
+        if moved:
+            await run_blocking(store.move, moved)
+        if read_files or removed or moved:
+            self._generation += 1
+            self._scorer = None
+        # Load the arrays here rather than on the next search
+        await self._get_scorer()
+
+        self.synced_at = self._clock()
+        await run_blocking(store.set_state, "synced_at", str(self.synced_at))
+        self.files_indexed += read_files
+        logger.info(
+            f"Content index synced: {read_files} files read, "
+            f"{len(removed)} removed, {len(found)} indexed"
+        )
+        return read_files
+
+    async def _get_scorer(self) -> _Scorer:
+        scorer = self._scorer
+        if scorer is None:
+            generation = self._generation
+            scorer = await run_blocking(lambda: _Scorer(self.store.load()))
+            if generation == self._generation:
+                self._scorer = scorer
+        return scorer
+
+    async def search(
+        self,
+        query: str,
+        limit: int = 10,
+        ancestor_folder_ids: Optional[List[str]] = None,
+        identity: str = "",
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Search the indexed text.
+
+        Args:
+            query: Words to look for, files containing any of them match
+            limit: Maximum number of results
+            ancestor_folder_ids: Only return files below these folders
+            identity: Caller key from get_caller_identity
+
+        Returns:
+            Optional[dict]: The results with their score and snippet, and the
+                total_count of matching files, or None if the index cannot
+                answer
+        """
+        folders = set(ancestor_folder_ids or [])
+        if not (self.enabled and identity == "" and self.fresh()):
+            self.fallbacks += 1
+            return None
+        scorer = await self._get_scorer()
+        if not folders <= scorer.folders | set(self.roots):
+            # Outside the indexed folders
+            self.fallbacks += 1
+            return None
+        self.searches += 1
+        terms = set(tokenize(query))
+        return await run_blocking(self._search, scorer, terms, max(1, limit), folders)
+
+    def _search(
+        self, scorer: _Scorer, terms: Set[str], limit: int, folders: Set[str]
+    ) -> Dict[str, Any]:
+        total, ranked = scorer.score(terms, limit, folders)
+        texts = self.store.texts([scorer.ids[position] for position, _ in ranked])
+        return {
+            "results": [
+                {
+                    "type": "file",
+                    "id": scorer.ids[position],
+                    "name": scorer.names[position],
+                    "score": round(score, 4),
+                    "snippet": make_snippet(texts.get(scorer.ids[position], ""), terms),
+                }
+                for position, score in ranked
+            ],
+            "total_count": total,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Return index statistics."""
+        return {
+            "roots": len(self.roots),
+            "seconds_since_sync": (
+                None if self.synced_at is None else self._clock() - self.synced_at
+            ),
+            "searches": self.searches,
+            "fallbacks": self.fallbacks,
+            "files_indexed": self.files_indexed,
+            "errors": self.errors,
+        }
+
+
+def _create_index(config: CacheConfig) -> ContentIndex:
+    if config.content_index_roots and np is None:
+        logger.warning(
+            "Content index configured but the numpy package is not installed, "
+            "local search is disabled"
+        )
+    return ContentIndex(
+        config.content_index_roots,
+        config.content_index_path,
+        max_age=config.content_index_max_age,
+        refresh_interval=config.content_index_refresh_interval,
+        concurrency=config.content_index_concurrency,
+    )
+
+
+_content_index = _create_index(CacheConfig())
+register_metrics("content_index", lambda: _content_index.stats())
+
+
+def configure_content_index(config: CacheConfig) -> None:
+    """
+    Replace the content index.
+
+    Args:
+        config: CacheConfig with the content index settings
+    """
+    global _content_index
+    _content_index = _create_index(config)
+
+
+def get_content_index() -> ContentIndex:
+    """Return the content index."""
+    return _content_index
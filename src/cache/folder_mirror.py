@@ -0,0 +1,671 @@
+"""Local SQLite mirror of selected folder trees, kept current from the Box events stream."""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+)
+
+from box_sdk_gen import BoxClient
+
+from cache.path_resolver import get_path_resolver
+from config import CacheConfig
+from executor import run_blocking
+from metrics import register_metrics
+from tools.box_api_async import (
+    BoxAsyncAPIError,
+    box_events_async,
+    box_events_long_poll_async,
+    crawl_folder_async,
+)
+
+logger = logging.getLogger(__name__)
+
+ITEM_TYPES = ("folder", "file", "web_link")
+
+# Events after which the cached paths through an item are wrong
+PATH_EVENTS = {"ITEM_RENAME", "ITEM_MOVE", "ITEM_TRASH"}
+
+# Fields of an event source kept for an item, those a folder listing returns
+ITEM_FIELDS = ("type", "id", "file_version", "sequence_id", "etag", "sha1", "name")
+
+# Longest wait between two sync attempts after repeated failures
+MAX_RETRY_DELAY = 300.0
+
+# (type, id, parent_id, name, sequence_id, data)
+Row = Tuple[str, str, str, str, Optional[int], str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    type TEXT NOT NULL,
+    id TEXT NOT NULL,
+    parent_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    sequence_id INTEGER,
+    data TEXT NOT NULL,
+    PRIMARY KEY (type, id)
+);
+CREATE INDEX IF NOT EXISTS items_by_parent ON items (parent_id);
+CREATE INDEX IF NOT EXISTS items_by_name ON items (name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS roots (id TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS unlisted (id TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+# Folders first, then files and web links, each by name as Box sorts them
+_ORDER = (
+    "CASE type WHEN 'folder' THEN 0 WHEN 'file' THEN 1 ELSE 2 END,"
+    " name COLLATE NOCASE, id"
+)
+
+_SUBTREE = """
+WITH RECURSIVE subtree(type, id) AS (
+    SELECT type, id FROM items WHERE parent_id = ?
+    UNION
+    SELECT items.type, items.id FROM items
+    JOIN subtree ON subtree.type = 'folder' AND items.parent_id = subtree.id
+)
+"""
+
+
+def _sequence(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _row(item: Dict[str, Any], parent_id: str) -> Row:
+    data = {field: item[field] for field in ITEM_FIELDS if item.get(field) is not None}
+    return (
+        item["type"],
+        item["id"],
+        parent_id,
+        item.get("name") or "",
+        _sequence(item.get("sequence_id")),
+        json.dumps(data),
+    )
+
+
+def _flatten(items: Iterable[Dict[str, Any]], parent_id: str) -> List[Row]:
+    """Turn a nested crawl result into rows."""
+    rows: List[Row] = []
+    pending = [(parent_id, items)]
+    while pending:
+        parent_id, items = pending.pop()
+        for item in items:
+            rows.append(_row(item, parent_id))
+            if item.get("items"):
+                pending.append((item["id"], item["items"]))
+    return rows
+
+
+class MirrorStore:
+    """
+    SQLite tables of the mirrored items.
+
+    Every item is stored with its parent folder, so a folder is listed with
+    one indexed query. The methods are blocking and thread safe, the mirror
+    calls them through run_blocking.
+    """
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def roots(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT id FROM roots")]
+
+    def get_state(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM state WHERE key = ?", (key,)
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def set_state(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    def replace(
+        self,
+        roots: Sequence[str],
+        rows: List[Row],
+        position: str,
+        skipped: Sequence[str] = (),
+    ) -> None:
+        """
+        Replace the whole mirror with a fresh crawl.
+
+        The stored contents of the skipped folders, which the crawl failed to
+        list, are kept. Skipped folders without stored contents are marked as
+        unlisted and not served.
+        """
+        with self._lock, self._conn:
+            kept: List[Row] = []
+            unlisted: List[str] = []
+            for folder_id in skipped:
+                if not self._is_listed(folder_id):
+                    unlisted.append(folder_id)
+                    continue
+                kept.extend(
+                    self._conn.execute(
+                        _SUBTREE + "SELECT * FROM items WHERE (type, id) IN subtree",
+                        (folder_id,),
+                    ).fetchall()
+                )
+                unlisted.extend(
+                    row[0]
+                    for row in self._conn.execute(
+                        _SUBTREE + "SELECT id FROM unlisted "
+                        "WHERE id IN (SELECT id FROM subtree WHERE type = 'folder')",
+                        (folder_id,),
+                    )
+                )
+            self._conn.execute("DELETE FROM items")
+            self._conn.execute("DELETE FROM roots")
+            self._conn.execute("DELETE FROM unlisted")
+            self._conn.executemany(
+                "INSERT INTO roots (id) VALUES (?)", [(root,) for root in roots]
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?)", kept
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO unlisted (id) VALUES (?)",
+                [(folder_id,) for folder_id in unlisted],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO state (key, value) VALUES ('position', ?)",
+                (position,),
+            )
+
+    def add(self, rows: List[Row], unlisted: Sequence[str] = ()) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO unlisted (id) VALUES (?)",
+                [(folder_id,) for folder_id in unlisted],
+            )
+
+    def complete(self) -> bool:
+        """Whether every mirrored folder is listed."""
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM unlisted").fetchone() is None
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def _is_folder(self, folder_id: Optional[str]) -> bool:
+        if folder_id is None:
+            return False
+        return (
+            self._conn.execute(
+                "SELECT 1 FROM roots WHERE id = ? UNION ALL "
+                "SELECT 1 FROM items WHERE type = 'folder' AND id = ?",
+                (folder_id, folder_id),
+            ).fetchone()
+            is not None
+        )
+
+    def _is_listed(self, folder_id: str) -> bool:
+        return (
+            self._is_folder(folder_id)
+            and self._conn.execute(
+                "SELECT 1 FROM unlisted WHERE id = ?", (folder_id,)
+            ).fetchone()
+            is None
+        )
+
+    def contains_folder(self, folder_id: str, is_recursive: bool = False) -> bool:
+        """Whether the contents of folder_id, or its whole subtree, are mirrored."""
+        with self._lock:
+            if not self._is_listed(folder_id):
+                return False
+            return (
+                not is_recursive
+                or self._conn.execute(
+                    _SUBTREE + "SELECT 1 FROM unlisted "
+                    "WHERE id IN (SELECT id FROM subtree WHERE type = 'folder')",
+                    (folder_id,),
+                ).fetchone()
+                is None
+            )
+
+    def _remove(self, item_type: str, item_id: str) -> None:
+        if item_type == "folder":
+            self._conn.execute(
+                _SUBTREE + "DELETE FROM unlisted "
+                "WHERE id IN (SELECT id FROM subtree WHERE type = 'folder')",
+                (item_id,),
+            )
+            self._conn.execute(
+                _SUBTREE + "DELETE FROM items WHERE (type, id) IN subtree",
+                (item_id,),
+            )
+            self._conn.execute("DELETE FROM unlisted WHERE id = ?", (item_id,))
+        self._conn.execute(
+            "DELETE FROM items WHERE type = ? AND id = ?", (item_type, item_id)
+        )
+
+    def apply_event(self, event: Dict[str, Any]) -> Optional[str]:
+        """
+        Apply one change event.
+
+        Returns:
+            Optional[str]: The ID of a folder that entered the mirror with
+                contents that still need to be listed, e.g. after a move
+        """
+        source = event.get("source") or {}
+        item_type = source.get("type")
+        item_id = source.get("id")
+        if item_type not in ITEM_TYPES or not item_id:
+            return None
+        parent_id = (source.get("parent") or {}).get("id")
+        sequence_id = _sequence(source.get("sequence_id"))
+        active = (
+            event.get("event_type") != "ITEM_TRASH"
+            and source.get("item_status", "active") == "active"
+        )
+        with self._lock, self._conn:
+            if (
+                item_type == "folder"
+                and self._conn.execute(
+                    "SELECT 1 FROM roots WHERE id = ?", (item_id,)
+                ).fetchone()
+            ):
+                # A root stays mirrored wherever it is moved
+                return None
+            stored = self._conn.execute(
+                "SELECT sequence_id FROM items WHERE type = ? AND id = ?",
+                (item_type, item_id),
+            ).fetchone()
+            if (
+                stored is not None
+                and stored[0] is not None
+                and sequence_id is not None
+                and sequence_id < stored[0]
+            ):
+                # Events may be delivered twice and out of order
+                return None
+            if not active or not self._is_folder(parent_id):
+                self._remove(item_type, item_id)
+                return None
+            self._conn.execute(
+                "INSERT OR REPLACE INTO items VALUES (?, ?, ?, ?, ?, ?)",
+                _row(source, parent_id),
+            )
+            if (
+                item_type == "folder"
+                and stored is None
+                and event.get("event_type") != "ITEM_CREATE"
+            ):
+                return item_id
+        return None
+
+    def children(self, folder_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM items WHERE parent_id = ? ORDER BY {_ORDER}",
+                (folder_id,),
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def tree(self, folder_id: str) -> List[Dict[str, Any]]:
+        """List a folder with its subfolder items nested under 'items'."""
+        with self._lock:
+            rows = self._conn.execute(
+                _SUBTREE + "SELECT parent_id, data FROM items "
+                f"WHERE (type, id) IN subtree ORDER BY {_ORDER}",
+                (folder_id,),
+            ).fetchall()
+        by_parent: Dict[str, List[Dict[str, Any]]] = {}
+        for parent_id, data in rows:
+            by_parent.setdefault(parent_id, []).append(json.loads(data))
+        for items in by_parent.values():
+            for item in items:
+                if item["type"] == "folder" and item["id"] in by_parent:
+                    item["items"] = by_parent[item["id"]]
+        return by_parent.get(folder_id, [])
+
+    def find_folders(self, name: str) -> List[Dict[str, Any]]:
+        """Return the folders whose name contains name, ignoring case."""
+        pattern = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, name FROM items WHERE type = 'folder' "
+                "AND name LIKE ? ESCAPE '\\' ORDER BY name COLLATE NOCASE, id",
+                (f"%{pattern}%",),
+            ).fetchall()
+        return [
+            {"id": folder_id, "type": "folder", "name": folder_name}
+            for folder_id, folder_name in rows
+        ]
+
+
+class EventSource(Protocol):
+    """Where the mirror reads changes from, the Box events stream by default."""
+
+    async def current_position(self, client: BoxClient) -> str:
+        """Return the stream position of the latest event."""
+        ...
+
+    async def next_events(
+        self, client: BoxClient, stream_position: str
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """Wait for events after stream_position, return them and the next position."""
+        ...
+
+
+class BoxEventSource:
+    """
+    Change events of the Box events API.
+
+    When no event is pending, next_events long-polls the Box real-time
+    server for up to poll_timeout seconds and returns no events if nothing
+    changed meanwhile.
+    """
+
+    def __init__(self, poll_timeout: float = 60.0):
+        self.poll_timeout = poll_timeout
+
+    async def current_position(self, client: BoxClient) -> str:
+        page = await box_events_async(client, "now")
+        return str(page["next_stream_position"])
+
+    async def next_events(
+        self, client: BoxClient, stream_position: str
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        page = await box_events_async(client, stream_position)
+        if not page.get("entries") and await box_events_long_poll_async(
+            client, stream_position, self.poll_timeout
+        ):
+            page = await box_events_async(client, stream_position)
+        return (
+            page.get("entries") or [],
+            str(page.get("next_stream_position", stream_position)),
+        )
+
+
+class FolderMirror:
+    """
+    Items of the configured root folders, mirrored to a SQLite database.
+
+    The mirror is bootstrapped by a concurrent crawl of the roots, then kept
+    current by applying the change events that followed the crawl. A
+    subfolder the crawl fails to list keeps its stored contents, or is not
+    served if it has none. The
+    stream position is stored with the items, so a restart resumes from the
+    events instead of crawling again. Answers are only served while the last
+    successful sync is at most max_lag seconds old; otherwise the folder
+    tools go to Box.
+
+    The mirror is built with the server's own account, so it only answers
+    callers without a token of their own.
+    """
+
+    def __init__(
+        self,
+        roots: Sequence[str],
+        path: str,
+        max_lag: float = 120.0,
+        events: Optional[EventSource] = None,
+        clock: Callable[[], float] = time.monotonic,
+        retry_delay: float = 5.0,
+    ):
+        self.roots = list(roots)
+        self.path = path
+        self.max_lag = max_lag
+        self.events: EventSource = events or BoxEventSource()
+        self.retry_delay = retry_delay
+        self._clock = clock
+        self._store: Optional[MirrorStore] = None
+        self._position: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self.synced_at: Optional[float] = None
+        self.hits = 0
+        self.bootstraps = 0
+        self.events_applied = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any folder is mirrored."""
+        return bool(self.roots)
+
+    @property
+    def store(self) -> MirrorStore:
+        # Opened on first use, a disabled mirror never creates the database
+        if self._store is None:
+            self._store = MirrorStore(self.path)
+        return self._store
+
+    def fresh(self) -> bool:
+        """Whether the mirror was synced within max_lag seconds."""
+        return (
+            self.synced_at is not None
+            and self._clock() - self.synced_at <= self.max_lag
+        )
+
+    def start(self, client: BoxClient) -> None:
+        """Start syncing in the background, unless already running."""
+        if not self.enabled:
+            return
+        loop = asyncio.get_running_loop()
+        task = self._task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._task = loop.create_task(self.run(client))
+
+    async def stop(self) -> None:
+        """Stop the background sync."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def run(self, client: BoxClient) -> None:
+        """Sync until cancelled, retrying failures with exponential backoff."""
+        delay = self.retry_delay
+        while True:
+            try:
+                if self._position is None:
+                    await self.open(client)
+                await self.poll(client)
+                delay = self.retry_delay
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"Failed to sync folder mirror: {e}")
+                if isinstance(e, BoxAsyncAPIError) and e.status_code == 400:
+                    # The stored stream position is no longer valid
+                    self._position = None
+                    await run_blocking(self.store.set_state, "position", "")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+
+    async def open(self, client: BoxClient) -> None:
+        """Resume from the stored stream position, or crawl the roots."""
+        store = self.store
+        stored_roots = await run_blocking(store.roots)
+        position = await run_blocking(store.get_state, "position")
+        if position and sorted(stored_roots) == sorted(self.roots):
+            logger.info(f"Resuming folder mirror at stream position {position}")
+            self._position = position
+            return
+        await self.bootstrap(client)
+
+    async def bootstrap(self, client: BoxClient) -> None:
+        """Crawl the roots and replace the mirror with the result."""
+        # Read first, so changes made during the crawl are replayed after it
+        position = await self.events.current_position(client)
+        skipped: List[str] = []
+        crawls = await asyncio.gather(
+            *(
+                crawl_folder_async(client, root, True, skipped=skipped)
+                for root in self.roots
+            )
+        )
+        rows = [
+            row
+            for root, items in zip(self.roots, crawls)
+            for row in _flatten(items, root)
+        ]
+        await run_blocking(self.store.replace, self.roots, rows, position, skipped)
+        self._position = position
+        self.synced_at = self._clock()
+        self.bootstraps += 1
+        logger.info(f"Mirrored {len(rows)} items of {len(self.roots)} folders")
+
+    async def poll(self, client: BoxClient) -> int:
+        """
+        Wait for the next events and apply them.
+
+        Returns:
+            int: Number of events read
+        """
+        if self._position is None:
+            raise RuntimeError("Folder mirror is not open")
+        events, position = await self.events.next_events(client, self._position)
+        await self.apply(client, events)
+        await run_blocking(self.store.set_state, "position", position)
+        self._position = position
+        self.synced_at = self._clock()
+        return len(events)
+
+    async def apply(self, client: BoxClient, events: List[Dict[str, Any]]) -> None:
+        """
+        Apply change events, listing folders that entered the mirror.
+
+        Renames, moves and deletions also drop the resolved paths going
+        through the item, even outside the mirrored folders.
+        """
+        store = self.store
+
+        def write() -> List[str]:
+            added = [store.apply_event(event) for event in events]
+            return [folder_id for folder_id in added if folder_id is not None]
+
+        resolver = get_path_resolver()
+        for event in events:
+            source = event.get("source") or {}
+            if event.get("event_type") in PATH_EVENTS and source.get("id"):
+                resolver.invalidate(source["id"])
+
+        for folder_id in await run_blocking(write):
+            skipped: List[str] = []
+            try:
+                items = await crawl_folder_async(
+                    client, folder_id, True, skipped=skipped
+                )
+            except BoxAsyncAPIError as e:
+                # Gone again, a later event removes it
+                logger.warning(f"Failed to mirror folder {folder_id}: {e.message}")
+                continue
+            await run_blocking(store.add, _flatten(items, folder_id), skipped)
+        self.events_applied += len(events)
+
+    def _serves(self, identity: str) -> bool:
+        return self.enabled and identity == "" and self.fresh()
+
+    async def list_items(
+        self, folder_id: str, is_recursive: bool = False, identity: str = ""
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        List a folder from the mirror.
+
+        Returns:
+            Optional[List[dict]]: The items, nested like a recursive folder
+                listing, or None if the mirror cannot answer
+        """
+        if not self._serves(identity):
+            return None
+        store = self.store
+        if not await run_blocking(store.contains_folder, folder_id, is_recursive):
+            return None
+        self.hits += 1
+        if is_recursive:
+            return await run_blocking(store.tree, folder_id)
+        return await run_blocking(store.children, folder_id)
+
+    async def find_folders(
+        self, name: str, identity: str = ""
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return the folders whose name contains name, ignoring case.
+
+        Only a mirror of the whole account, with the root folder "0" listed
+        completely, can answer; otherwise this returns None.
+        """
+        if not self._serves(identity) or "0" not in self.roots:
+            return None
+        if not await run_blocking(self.store.complete):
+            return None
+        self.hits += 1
+        return await run_blocking(self.store.find_folders, name)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return mirror statistics."""
+        return {
+            "roots": len(self.roots),
+            "seconds_since_sync": (
+                None if self.synced_at is None else self._clock() - self.synced_at
+            ),
+            "hits": self.hits,
+            "bootstraps": self.bootstraps,
+            "events_applied": self.events_applied,
+            "errors": self.errors,
+        }
+
+
+def _create_mirror(config: CacheConfig) -> FolderMirror:
+    return FolderMirror(
+        config.folder_mirror_roots,
+        config.folder_mirror_path,
+        max_lag=config.folder_mirror_max_lag,
+        events=BoxEventSource(poll_timeout=config.folder_mirror_poll_timeout),
+    )
+
+
+_folder_mirror = _create_mirror(CacheConfig())
+register_metrics("folder_mirror", lambda: _folder_mirror.stats())
+
+
+def configure_folder_mirror(config: CacheConfig) -> None:
+    """
+    Replace the folder mirror.
+
+    Args:
+        config: CacheConfig with the folder mirror settings
+    """
+    global _folder_mirror
+    _folder_mirror = _create_mirror(config)
+
+
+def get_folder_mirror() -> FolderMirror:
+    """Return the folder mirror."""
+    return _folder_mirror
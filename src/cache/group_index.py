@@ -0,0 +1,200 @@
+"""Cached group memberships in both directions, and a local group name index."""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from box_sdk_gen import BoxClient
+
+from cache.snapshot_cache import SnapshotCache
+from cache.text_index import TextIndex
+from cache.ttl_cache import TTLCache
+from config import CacheConfig
+from metrics import register_metrics
+from tools.box_api_async import (
+    list_group_memberships_async,
+    list_groups_async,
+    list_user_memberships_async,
+)
+
+# Memberships keyed by the ID of the other side: user ID for the members of a
+# group, group ID for the groups of a user
+Memberships = Dict[str, Dict[str, Any]]
+
+
+def _member_id(membership: Dict[str, Any], side: str) -> Optional[str]:
+    return (membership.get(side) or {}).get("id")
+
+
+class GroupNames:
+    """The groups of an enterprise with a partial match index on their names."""
+
+    def __init__(self, groups: List[Dict[str, Any]]):
+        self.groups = groups
+        self._text = TextIndex((group.get("name") or "",) for group in groups)
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Return the groups whose name starts with or contains query."""
+        return [self.groups[position] for position in self._text.search(query)]
+
+
+async def _load_group_names(client: BoxClient) -> GroupNames:
+    return GroupNames(await list_groups_async(client))
+
+
+class GroupIndex:
+    """
+    Group memberships of each caller, looked up by group and by user.
+
+    The members of a group and the groups of a user are fetched from Box on
+    first use and kept for ttl seconds. Every fetch also updates the cached
+    lists of the other direction: listing a group's members adds the group to
+    the cached group lists of its members and removes it from those of former
+    members, and listing a user's groups does the same for the member lists.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        max_size: int = 10000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self._by_group: TTLCache[Tuple[str, str], Memberships] = TTLCache(
+            max_size=max_size, ttl=ttl, clock=clock
+        )
+        self._by_user: TTLCache[Tuple[str, str], Memberships] = TTLCache(
+            max_size=max_size, ttl=ttl, clock=clock
+        )
+        # The last fetched memberships, without expiry
+        self._previous: TTLCache[Tuple[str, str, str], Memberships] = TTLCache(
+            max_size=2 * max_size, ttl=float("inf"), clock=clock
+        )
+        # The group lists of at most max_size callers
+        self.names: SnapshotCache[GroupNames] = SnapshotCache(
+            "group names",
+            _load_group_names,
+            ttl=ttl,
+            max_stale=ttl,
+            max_size=max_size,
+            clock=clock,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the group tools use the index, a ttl of 0 disables it."""
+        return self.ttl > 0
+
+    async def list_members(
+        self, client: BoxClient, group_id: str, identity: str = ""
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the memberships of a group.
+
+        Raises:
+            BoxAsyncAPIError: If the memberships are not cached and Box fails
+        """
+        members = self._by_group.get((identity, group_id))
+        if members is None:
+            fetched = await list_group_memberships_async(client, group_id)
+            members = self._store(identity, group_id, fetched, "group", "user")
+        return list(members.values())
+
+    async def list_by_user(
+        self, client: BoxClient, user_id: str, identity: str = ""
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the group memberships of a user.
+
+        Raises:
+            BoxAsyncAPIError: If the memberships are not cached and Box fails
+        """
+        groups = self._by_user.get((identity, user_id))
+        if groups is None:
+            fetched = await list_user_memberships_async(client, user_id)
+            groups = self._store(identity, user_id, fetched, "user", "group")
+        return list(groups.values())
+
+    async def search(
+        self, client: BoxClient, query: str, identity: str = ""
+    ) -> List[Dict[str, Any]]:
+        """Return the groups matching query from the caller's group list."""
+        names = await self.names.get(client, identity)
+        return names.search(query)
+
+    def _store(
+        self,
+        identity: str,
+        owner_id: str,
+        memberships: List[Dict[str, Any]],
+        owner_side: str,
+        other_side: str,
+    ) -> Memberships:
+        """Cache the memberships of one group or user and update the reverse side."""
+        forward, reverse = (
+            (self._by_group, self._by_user)
+            if owner_side == "group"
+            else (self._by_user, self._by_group)
+        )
+        entries: Memberships = {}
+        for membership in memberships:
+            other_id = _member_id(membership, other_side)
+            if other_id is not None:
+                entries[other_id] = membership
+        previous = self._previous.pop((owner_side, identity, owner_id)) or {}
+        forward.set((identity, owner_id), entries)
+        # Kept beyond the TTL, to find former members when this is fetched again
+        self._previous.set((owner_side, identity, owner_id), entries)
+
+        # Only reverse entries that are cached are updated, a missing entry
+        # would not list the other memberships of that user or group
+        for other_id in entries.keys() | previous.keys():
+            reverse_entries = reverse.get((identity, other_id))
+            if reverse_entries is None:
+                continue
+            if other_id in entries:
+                reverse_entries[owner_id] = entries[other_id]
+            else:
+                reverse_entries.pop(owner_id, None)
+        return entries
+
+    def invalidate(self) -> None:
+        """Forget every cached membership and group list."""
+        self._by_group.clear()
+        self._by_user.clear()
+        self._previous.clear()
+        self.names.invalidate()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        return {
+            "by_group": self._by_group.stats(),
+            "by_user": self._by_user.stats(),
+            "names": self.names.stats(),
+        }
+
+
+def _create_index(config: CacheConfig) -> GroupIndex:
+    return GroupIndex(
+        ttl=config.group_index_ttl if config.group_index else 0,
+        max_size=config.group_index_max_size,
+    )
+
+
+_group_index = _create_index(CacheConfig())
+register_metrics("group_index", lambda: _group_index.stats())
+
+
+def configure_group_index(config: CacheConfig) -> None:
+    """
+    Replace the group membership index.
+
+    Args:
+        config: CacheConfig with the group index settings
+    """
+    global _group_index
+    _group_index = _create_index(config)
+
+
+def get_group_index() -> GroupIndex:
+    """Return the group membership index."""
+    return _group_index
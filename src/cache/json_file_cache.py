@@ -0,0 +1,96 @@
+"""In-memory copy of a JSON file, reloaded when the file changes."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class JsonFileEntry:
+    """Parsed content of a JSON file with its pre-serialized response body."""
+
+    data: Dict[str, Any] = field(default_factory=dict)
+    body: bytes = b""
+    etag: str = '""'
+
+
+def _serialize(data: Dict[str, Any]) -> bytes:
+    # Same compact encoding as starlette's JSONResponse
+    return json.dumps(
+        data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class JsonFileCache:
+    """
+    Parse a JSON file once and serve it from memory.
+
+    The file is checked for changes at most every check_interval seconds and
+    parsed again only when its modification time or size changed. A missing
+    or invalid file is cached as an empty document.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        check_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entry = JsonFileEntry()
+        self._stat_key: Optional[tuple] = None
+        self._checked_at: Optional[float] = None
+        self.loads = 0
+
+    def get(self) -> JsonFileEntry:
+        """Return the current content of the file."""
+        now = self._clock()
+        if (
+            self._checked_at is not None
+            and now - self._checked_at < self.check_interval
+        ):
+            return self._entry
+
+        with self._lock:
+            self._checked_at = now
+            try:
+                stat = os.stat(self.path)
+                stat_key = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                stat_key = None
+            if stat_key != self._stat_key or self.loads == 0:
+                self._stat_key = stat_key
+                self._entry = self._load() if stat_key else self._missing()
+                self.loads += 1
+            return self._entry
+
+    def _missing(self) -> JsonFileEntry:
+        logger.error(f"Config file not found: {self.path.absolute()}")
+        return JsonFileEntry()
+
+    def _load(self) -> JsonFileEntry:
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON in config file {self.path}: {e}")
+            return JsonFileEntry()
+        except Exception as e:
+            logger.error(f"Error loading config file {self.path}: {e}")
+            return JsonFileEntry()
+
+        logger.info(f"Loaded config file {self.path}")
+        body = _serialize(data)
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        return JsonFileEntry(data=data, body=body, etag=etag)
@@ -0,0 +1,35 @@
+"""Last known field values of metadata instances, the base of update diffs."""
+
+from typing import Any, Dict, Tuple
+
+from cache.ttl_cache import TTLCache
+from config import CacheConfig
+from metrics import register_metrics
+
+# Keyed by caller identity, file ID and template key
+InstanceKey = Tuple[str, str, str]
+
+_instance_cache: TTLCache[InstanceKey, Dict[str, Any]] = TTLCache(
+    max_size=CacheConfig.metadata_instance_cache_max_size,
+    ttl=CacheConfig.metadata_instance_ttl,
+)
+register_metrics("metadata_instances", lambda: _instance_cache.stats())
+
+
+def configure_metadata_instance_cache(config: CacheConfig) -> None:
+    """
+    Replace the metadata instance cache.
+
+    Args:
+        config: CacheConfig with the instance cache size and time to live
+    """
+    global _instance_cache
+    _instance_cache = TTLCache(
+        max_size=config.metadata_instance_cache_max_size,
+        ttl=config.metadata_instance_ttl,
+    )
+
+
+def get_metadata_instance_cache() -> TTLCache[InstanceKey, Dict[str, Any]]:
+    """Return the metadata instance cache."""
+    return _instance_cache
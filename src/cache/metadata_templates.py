@@ -0,0 +1,256 @@
+"""Per-enterprise cache of the metadata template definitions."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from box_ai_agents_toolkit import BoxClient, box_metadata_template_list
+
+from cache.ttl_cache import TTLCache
+from config import CacheConfig
+from executor import run_blocking
+from metadata_validation import MetadataValidator
+from metrics import register_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class MetadataTemplateError(Exception):
+    """The template list could not be loaded from Box."""
+
+
+@dataclass(frozen=True)
+class TemplateIndex:
+    """The enterprise templates with lookups by key and display name."""
+
+    templates: List[Dict[str, Any]] = field(default_factory=list)
+    by_key: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Display names are matched case insensitively, like the toolkit does
+    by_name: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    loaded_at: float = 0.0
+    # Compiled on first use, dropped with the index when it is reloaded
+    validators: Dict[str, MetadataValidator] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls, templates: List[Dict[str, Any]], loaded_at: float
+    ) -> "TemplateIndex":
+        by_key: Dict[str, Dict[str, Any]] = {}
+        by_name: Dict[str, Dict[str, Any]] = {}
+        for template in templates:
+            if template.get("templateKey"):
+                by_key[template["templateKey"]] = template
+            name = (template.get("displayName") or "").lower()
+            # The first template wins, as in a scan of the list
+            by_name.setdefault(name, template)
+        return cls(templates, by_key, by_name, loaded_at)
+
+
+class MetadataTemplateCache:
+    """
+    Keep the metadata templates of each enterprise in memory.
+
+    Templates are loaded with one list call and indexed by key and display
+    name. After ttl seconds the index is still served for up to max_stale
+    seconds while it is reloaded in the background, and then dropped; at
+    most max_size enterprises are kept, the least recently used is dropped
+    first. Concurrent loads of the same enterprise share one list call.
+    Creating a template invalidates the index of the enterprise.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300.0,
+        max_stale: float = 3600.0,
+        max_size: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.miss_reload_interval = 10.0
+        self._clock = clock
+        self._indexes: TTLCache[str, TemplateIndex] = TTLCache(
+            max_size=max_size, ttl=ttl + max_stale, clock=clock
+        )
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Incremented on invalidation, a load started before is not stored
+        self._generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.loads = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the tools use the cache, a ttl of 0 disables it."""
+        return self.ttl > 0
+
+    async def get_index(
+        self, client: BoxClient, enterprise: str = "", refresh: bool = False
+    ) -> TemplateIndex:
+        """
+        Return the template index of the caller's enterprise.
+
+        Args:
+            client: Box client of the caller, used to load the templates
+            enterprise: Enterprise key from get_caller_enterprise
+            refresh: Load the templates again even if the index is fresh
+
+        Raises:
+            MetadataTemplateError: If the templates cannot be loaded and no
+                index is cached
+        """
+        index = self._indexes.get(enterprise)
+        if index is not None and not refresh:
+            age = self._clock() - index.loaded_at
+            if age < self.ttl:
+                self.hits += 1
+                return index
+            if age < self.ttl + self.max_stale:
+                self.stale_hits += 1
+                self._load_task(client, enterprise)
+                return index
+
+        try:
+            return await asyncio.shield(self._load_task(client, enterprise))
+        except MetadataTemplateError:
+            if index is not None:
+                return index
+            raise
+
+    async def get_template(
+        self, client: BoxClient, template_key: str, enterprise: str = ""
+    ) -> Optional[Dict[str, Any]]:
+        """Return a template by key, None if the enterprise has no such template."""
+        return await self._lookup(
+            client, enterprise, lambda i: i.by_key.get(template_key)
+        )
+
+    async def find_template_by_name(
+        self, client: BoxClient, display_name: str, enterprise: str = ""
+    ) -> Optional[Dict[str, Any]]:
+        """Return a template by display name, ignoring case, None if not found."""
+        name = display_name.lower()
+        return await self._lookup(client, enterprise, lambda i: i.by_name.get(name))
+
+    async def get_validator(
+        self, client: BoxClient, template_key: str, enterprise: str = ""
+    ) -> Optional[MetadataValidator]:
+        """Return the compiled validator of a template, None if not found."""
+        index = await self.get_index(client, enterprise)
+        validator = index.validators.get(template_key)
+        if validator is not None:
+            return validator
+        template = await self.get_template(client, template_key, enterprise)
+        if template is None:
+            return None
+        validator = MetadataValidator.compile(template)
+        # Stored on the index the template came from, which may be newer
+        index = self._indexes.get(enterprise) or index
+        if index.by_key.get(template_key) is template:
+            index.validators[template_key] = validator
+        return validator
+
+    async def _lookup(
+        self,
+        client: BoxClient,
+        enterprise: str,
+        find: Callable[[TemplateIndex], Optional[Dict[str, Any]]],
+    ) -> Optional[Dict[str, Any]]:
+        # A template missing from an index older than miss_reload_interval
+        # seconds triggers one reload, so templates created elsewhere are found
+        index = await self.get_index(client, enterprise)
+        template = find(index)
+        if (
+            template is None
+            and self._clock() - index.loaded_at >= self.miss_reload_interval
+        ):
+            template = find(await self.get_index(client, enterprise, refresh=True))
+        return template
+
+    def _load_task(self, client: BoxClient, enterprise: str) -> asyncio.Task:
+        """Return the running load of an enterprise, starting one if needed."""
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(enterprise)
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._load(client, enterprise))
+            task.add_done_callback(lambda done: self._load_done(enterprise, done))
+            self._inflight[enterprise] = task
+        return task
+
+    def _load_done(self, enterprise: str, task: asyncio.Task) -> None:
+        # A newer load of the same enterprise may have replaced this one
+        if self._inflight.get(enterprise) is task:
+            del self._inflight[enterprise]
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+            logger.warning(f"Failed to load metadata templates: {task.exception()}")
+
+    async def _load(self, client: BoxClient, enterprise: str) -> TemplateIndex:
+        loaded_at = self._clock()
+        generation = self._generation
+        result = await run_blocking(box_metadata_template_list, client)
+        if isinstance(result, dict) and "error" in result:
+            raise MetadataTemplateError(result["error"])
+        if isinstance(result, dict):
+            # {"message": "No templates found"} for an enterprise without any
+            result = result.get("metadata_templates", [])
+        index = TemplateIndex.build(list(result), loaded_at)
+        if generation == self._generation:
+            # Expires max_stale seconds after going stale, counted from the load
+            self._indexes.set(
+                enterprise,
+                index,
+                ttl=loaded_at + self.ttl + self.max_stale - self._clock(),
+            )
+        self.loads += 1
+        logger.debug(f"Loaded {len(index.templates)} metadata templates")
+        return index
+
+    def invalidate(self, enterprise: Optional[str] = None) -> None:
+        """Forget the index of one enterprise, or of every enterprise."""
+        self._generation += 1
+        if enterprise is None:
+            self._indexes.clear()
+        else:
+            self._indexes.pop(enterprise)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        return {
+            "enterprises": len(self._indexes),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "loads": self.loads,
+            "errors": self.errors,
+        }
+
+
+_template_cache = MetadataTemplateCache(
+    ttl=CacheConfig.metadata_template_ttl,
+    max_stale=CacheConfig.metadata_template_max_stale,
+    max_size=CacheConfig.metadata_template_max_size,
+)
+register_metrics("metadata_templates", lambda: _template_cache.stats())
+
+
+def configure_metadata_template_cache(config: CacheConfig) -> None:
+    """
+    Replace the metadata template cache.
+
+    Args:
+        config: CacheConfig with the template cache time to live
+    """
+    global _template_cache
+    _template_cache = MetadataTemplateCache(
+        ttl=config.metadata_template_ttl,
+        max_stale=config.metadata_template_max_stale,
+        max_size=config.metadata_template_max_size,
+    )
+
+
+def get_metadata_template_cache() -> MetadataTemplateCache:
+    """Return the metadata template cache."""
+    return _template_cache
@@ -0,0 +1,110 @@
+"""Cache of the upstream OAuth authorization server metadata document."""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from http_pool import get_async_client
+
+logger = logging.getLogger(__name__)
+
+BOX_AUTHORIZATION_SERVER_METADATA_URL = (
+    "https://account.box.com/.well-known/oauth-authorization-server"
+)
+
+
+class AuthorizationServerMetadataCache:
+    """
+    Serve the authorization server metadata from memory.
+
+    The document is fetched at most once at a time (concurrent callers share
+    one request) and kept for ttl seconds. After that the stale document is
+    still served for up to max_stale seconds while a fresh copy is fetched in
+    the background. If a fetch fails, the last document is served.
+    """
+
+    def __init__(
+        self,
+        url: str = BOX_AUTHORIZATION_SERVER_METADATA_URL,
+        ttl: float = 3600.0,
+        max_stale: float = 86400.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.url = url
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._clock = clock
+        self._document: Optional[Dict[str, Any]] = None
+        self._fetched_at = 0.0
+        self._inflight: Optional[asyncio.Task] = None
+        # Incremented on every fetched document, lets callers memoize results
+        self.generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.fetches = 0
+        self.errors = 0
+
+    async def get(self) -> Dict[str, Any]:
+        """
+        Return the metadata document.
+
+        Raises:
+            httpx.HTTPError: If no document was ever fetched and the fetch fails
+        """
+        if self._document is not None:
+            age = self._clock() - self._fetched_at
+            if age < self.ttl:
+                self.hits += 1
+                return self._document
+            if age < self.ttl + self.max_stale:
+                self.stale_hits += 1
+                self._refresh_task()
+                return self._document
+
+        try:
+            return await asyncio.shield(self._refresh_task())
+        except Exception:
+            if self._document is not None:
+                return self._document
+            raise
+
+    def _refresh_task(self) -> asyncio.Task:
+        """Return the running fetch, starting one if none is in flight."""
+        loop = asyncio.get_running_loop()
+        task = self._inflight
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._fetch())
+            task.add_done_callback(self._fetch_done)
+            self._inflight = task
+        return task
+
+    def _fetch_done(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+            logger.warning(
+                f"Failed to fetch authorization server metadata: {task.exception()}"
+            )
+
+    async def _fetch(self) -> Dict[str, Any]:
+        response = await get_async_client().get(self.url, timeout=10.0)
+        response.raise_for_status()
+        document = response.json()
+        self._document = document
+        self._fetched_at = self._clock()
+        self.generation += 1
+        self.fetches += 1
+        logger.info(f"Fetched authorization server metadata from {self.url}")
+        return document
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "fetches": self.fetches,
+            "errors": self.errors,
+            "age": (
+                self._clock() - self._fetched_at if self._document is not None else None
+            ),
+        }
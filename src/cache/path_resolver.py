@@ -0,0 +1,236 @@
+"""Resolve folder and file paths to Box IDs, caching every resolved path."""
+
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from box_sdk_gen import BoxClient
+
+from cache.ttl_cache import TTLCache
+from config import CacheConfig
+from metrics import register_metrics
+from tools.box_api_async import list_folder_items_by_name_async
+
+# Box lists folders before files before web links, each group sorted by name
+_TYPE_ORDER = {"folder": 0, "file": 1, "web_link": 2}
+
+PAGE_SIZE = 1000
+
+# Names Box's locale sort orders like their case folded code points
+_PLAIN_NAME = re.compile(r"[0-9a-z ]*")
+
+
+def split_path(path: str) -> List[str]:
+    """Return the names of a slash separated path, ignoring empty segments."""
+    return [segment for segment in path.strip().split("/") if segment.strip()]
+
+
+@dataclass(frozen=True)
+class ResolvedPath:
+    """A resolved path with the IDs it went through."""
+
+    type: str
+    id: str
+    names: Tuple[str, ...]
+    # IDs of every item along the path, the resolved item last
+    ids: Tuple[str, ...]
+    # Invalidation counter of the resolver when the path was resolved
+    version: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "type": self.type,
+            "id": self.id,
+            "name": self.names[-1],
+            "path": "/" + "/".join(self.names),
+        }
+
+
+class PathResolver:
+    """
+    Resolve paths such as /Finance/2025/Q3 one name at a time.
+
+    Each resolved path is cached per caller, so a path resolved before costs
+    one lookup and a path below it only lists the folders past the longest
+    cached prefix. Folders are listed in pages sorted by name and, for names
+    of letters, digits and spaces, the walk stops as soon as the names pass
+    the one looked for.
+    Names match ignoring case, as Box does not allow two items whose names
+    only differ in case in one folder.
+
+    Renaming, moving or deleting an item through invalidate() drops every
+    cached path that goes through it. Changes made elsewhere are picked up
+    once the cached paths expire after ttl seconds.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 4096,
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self._paths: TTLCache[Tuple[str, str, Tuple[str, ...]], ResolvedPath] = (
+            TTLCache(max_size=max_size, ttl=ttl, clock=clock)
+        )
+        # Invalidation counter by item ID, kept as long as the paths that
+        # may still go through the item
+        self._invalidated: TTLCache[str, int] = TTLCache(
+            max_size=max_size, ttl=ttl, clock=clock
+        )
+        self._version = 0
+        self.pages_listed = 0
+
+    async def resolve(
+        self,
+        client: BoxClient,
+        path: str,
+        base_folder_id: str = "0",
+        identity: str = "",
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the type, ID, name and path of the item at path.
+
+        Args:
+            client: Authenticated Box client
+            path: Slash separated names, relative to base_folder_id
+            base_folder_id: Folder the path starts at, the root by default
+            identity: Caller key from get_caller_identity
+
+        Returns:
+            Optional[dict]: The item, None if the path does not exist
+
+        Raises:
+            BoxAsyncAPIError: If a folder along the path cannot be listed
+        """
+        names = split_path(path)
+        if not names:
+            return {"type": "folder", "id": base_folder_id, "path": "/"}
+        folded = tuple(name.casefold() for name in names)
+
+        # Start below the longest cached prefix
+        parent: Optional[ResolvedPath] = None
+        for depth in range(len(names), 0, -1):
+            parent = self._lookup((identity, base_folder_id, folded[:depth]))
+            if parent is not None:
+                break
+        if parent is not None and len(parent.names) == len(names):
+            return parent.to_dict()
+
+        version = self._version
+        start = len(parent.names) if parent is not None else 0
+        folder_id = parent.id if parent is not None else base_folder_id
+        resolved_names = parent.names if parent is not None else ()
+        ids = parent.ids if parent is not None else ()
+        for depth in range(start, len(names)):
+            last = depth == len(names) - 1
+            item = await self._find_child(client, folder_id, names[depth], last)
+            if item is None:
+                return None
+            resolved = ResolvedPath(
+                type=item["type"],
+                id=item["id"],
+                names=resolved_names + (item.get("name") or names[depth],),
+                ids=ids + (item["id"],),
+                version=version,
+            )
+            self._paths.set((identity, base_folder_id, folded[: depth + 1]), resolved)
+            folder_id, resolved_names, ids = resolved.id, resolved.names, resolved.ids
+        return resolved.to_dict()
+
+    def _lookup(self, key: Tuple[str, str, Tuple[str, ...]]) -> Optional[ResolvedPath]:
+        resolved = self._paths.get(key)
+        if resolved is None:
+            return None
+        for item_id in resolved.ids:
+            invalidated = self._invalidated.get(item_id)
+            if invalidated is not None and invalidated > resolved.version:
+                self._paths.pop(key)
+                return None
+        return resolved
+
+    async def _find_child(
+        self, client: BoxClient, folder_id: str, name: str, last: bool
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Find the item called name in a folder.
+
+        Only the last name of a path may be a file. Web links are not
+        resolved, so the walk can stop once the files pass the name.
+        Box sorts names by locale, e.g. "Ä" next to "A" and "~" before
+        letters, which only agrees with comparing case folded names made of
+        a-z, digits and spaces; other names never stop the walk.
+        """
+        target = name.casefold()
+        offset = 0
+        # Past this sort key the item cannot come any more
+        stop_after = (1 if last else 0, target)
+        can_stop = _PLAIN_NAME.fullmatch(target) is not None
+        # The walk only stops early if the names come in the order they are
+        # compared in here
+        previous: Optional[Tuple[int, str]] = None
+        in_order = True
+        while True:
+            page = await list_folder_items_by_name_async(
+                client, folder_id, offset, PAGE_SIZE, ["id", "type", "name"]
+            )
+            self.pages_listed += 1
+            entries = page.get("entries") or []
+            for entry in entries:
+                entry_type = entry.get("type")
+                entry_name = (entry.get("name") or "").casefold()
+                if entry_name == target and (
+                    entry_type == "folder" or (last and entry_type == "file")
+                ):
+                    return entry
+                if not can_stop or not _PLAIN_NAME.fullmatch(entry_name):
+                    continue
+                key = (_TYPE_ORDER.get(entry_type, 3), entry_name)
+                in_order = in_order and (previous is None or previous <= key)
+                previous = key
+                if in_order and key > stop_after:
+                    return None
+            offset += len(entries)
+            if not entries or offset >= page.get("total_count", 0):
+                return None
+
+    def invalidate(self, item_id: str) -> None:
+        """Forget the cached paths going through an item that was renamed, moved or deleted."""
+        self._version += 1
+        if len(self._invalidated) >= self._invalidated.max_size:
+            # An evicted invalidation could let a stale path through
+            self._paths.clear()
+        self._invalidated.set(item_id, self._version)
+
+    def clear(self) -> None:
+        """Forget every cached path."""
+        self._paths.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache statistics."""
+        return {**self._paths.stats(), "pages_listed": self.pages_listed}
+
+
+def _create_resolver(config: CacheConfig) -> PathResolver:
+    return PathResolver(max_size=config.path_cache_max_size, ttl=config.path_cache_ttl)
+
+
+_path_resolver = _create_resolver(CacheConfig())
+register_metrics("path_resolver", lambda: _path_resolver.stats())
+
+
+def configure_path_resolver(config: CacheConfig) -> None:
+    """
+    Replace the path resolver.
+
+    Args:
+        config: CacheConfig with the path cache settings
+    """
+    global _path_resolver
+    _path_resolver = _create_resolver(config)
+
+
+def get_path_resolver() -> PathResolver:
+    """Return the path resolver."""
+    return _path_resolver
@@ -0,0 +1,424 @@
+"""Read-through cache of tool results with ETag revalidation and write invalidation."""
+
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple, TypeVar
+
+from cache.ttl_cache import TTLCache
+from config import CacheConfig
+from metrics import register_metrics
+from tools.box_api_async import BoxAsyncAPIError, box_api_request
+from tools.box_tools_generic import get_box_client, get_caller_identity
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CacheKey = Tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How the result of a read tool is cached."""
+
+    # Seconds a result is served without asking Box
+    ttl: float = 60.0
+    # Argument holding the ID of the object the tool reads
+    object_arg: Optional[str] = None
+    # API path of that object, e.g. "/folders/{}"; enables ETag revalidation
+    object_path: Optional[str] = None
+    # The result holds the object with its etag, no separate etag request needed
+    etag_in_result: bool = False
+
+
+# Read tools whose results are cached, TTLs can be overridden per tool
+READ_POLICIES: Dict[str, CachePolicy] = {
+    "box_folder_info_tool": CachePolicy(60.0, "folder_id", "/folders/{}", True),
+    "box_folder_list_tags_tool": CachePolicy(60.0, "folder_id", "/folders/{}"),
+    "box_collaboration_list_by_file_tool": CachePolicy(60.0, "file_id"),
+    "box_collaboration_list_by_folder_tool": CachePolicy(60.0, "folder_id"),
+    "box_shared_link_file_get_tool": CachePolicy(60.0, "file_id", "/files/{}"),
+    "box_shared_link_folder_get_tool": CachePolicy(60.0, "folder_id", "/folders/{}"),
+    "box_shared_link_web_link_get_tool": CachePolicy(
+        60.0, "web_link_id", "/web_links/{}"
+    ),
+    "box_web_link_get_by_id_tool": CachePolicy(
+        60.0, "web_link_id", "/web_links/{}", True
+    ),
+    "box_metadata_get_instance_on_file_tool": CachePolicy(60.0, "file_id"),
+    "box_task_details_tool": CachePolicy(60.0, "task_id"),
+    "box_task_file_list_tool": CachePolicy(60.0, "file_id"),
+    "box_task_assignments_list_tool": CachePolicy(60.0, "task_id"),
+    "box_groups_list_members_tool": CachePolicy(60.0, "group_id"),
+}
+
+# Tools that change Box objects, a new write tool has to be listed here
+WRITE_TOOLS = frozenset(
+    {
+        "box_collaboration_delete_tool",
+        "box_collaboration_file_group_by_group_id_tool",
+        "box_collaboration_file_user_by_user_id_tool",
+        "box_collaboration_file_user_by_user_login_tool",
+        "box_collaboration_folder_group_by_group_id_tool",
+        "box_collaboration_folder_user_by_user_id_tool",
+        "box_collaboration_folder_user_by_user_login_tool",
+        "box_collaboration_update_tool",
+        "box_docgen_create_batch_tool",
+        "box_docgen_create_single_file_from_user_input_tool",
+        "box_docgen_template_create_tool",
+        "box_docgen_template_delete_tool",
+        "box_folder_copy_tool",
+        "box_folder_create_tool",
+        "box_folder_delete_tool",
+        "box_folder_favorites_add_tool",
+        "box_folder_favorites_remove_tool",
+        "box_folder_move_tool",
+        "box_folder_rename_tool",
+        "box_folder_set_collaboration_tool",
+        "box_folder_set_description_tool",
+        "box_folder_set_sync_tool",
+        "box_folder_set_upload_email_tool",
+        "box_folder_tag_add_tool",
+        "box_folder_tag_remove_tool",
+        "box_metadata_delete_instance_on_file_tool",
+        "box_metadata_set_instance_on_file_tool",
+        "box_metadata_template_create_tool",
+        "box_metadata_update_instance_on_file_tool",
+        "box_shared_link_file_create_or_update_tool",
+        "box_shared_link_file_remove_tool",
+        "box_shared_link_folder_create_or_update_tool",
+        "box_shared_link_folder_remove_tool",
+        "box_shared_link_web_link_create_or_update_tool",
+        "box_shared_link_web_link_remove_tool",
+        "box_task_assign_by_email_tool",
+        "box_task_assign_by_user_id_tool",
+        "box_task_assignment_remove_tool",
+        "box_task_assignment_update_tool",
+        "box_task_complete_create_tool",
+        "box_task_remove_tool",
+        "box_task_review_create_tool",
+        "box_task_update_tool",
+        "box_upload_file_from_content_tool",
+        "box_upload_file_from_path_tool",
+        "box_web_link_create_tool",
+        "box_web_link_delete_by_id_tool",
+        "box_web_link_update_by_id_tool",
+    }
+)
+
+
+def is_write_tool(tool_name: str) -> bool:
+    """Return whether a tool changes Box objects."""
+    return tool_name in WRITE_TOOLS
+
+
+def collect_object_ids(value: Any, ids: Optional[Set[str]] = None) -> Set[str]:
+    """Return every "id" found in a tool result, at any depth."""
+    if ids is None:
+        ids = set()
+    if isinstance(value, dict):
+        object_id = value.get("id")
+        if isinstance(object_id, (str, int)):
+            ids.add(str(object_id))
+        for item in value.values():
+            if isinstance(item, (dict, list)):
+                collect_object_ids(item, ids)
+    elif isinstance(value, list):
+        for item in value:
+            if isinstance(item, (dict, list)):
+                collect_object_ids(item, ids)
+    return ids
+
+
+def _find_etag(value: Any, object_id: str) -> Optional[str]:
+    """Return the etag of the object with the given ID in a tool result."""
+    if isinstance(value, dict):
+        if str(value.get("id")) == object_id and value.get("etag"):
+            return value["etag"]
+        for item in value.values():
+            if isinstance(item, dict):
+                etag = _find_etag(item, object_id)
+                if etag is not None:
+                    return etag
+    return None
+
+
+@dataclass
+class CachedResponse:
+    result: Any
+    # Position in the cache history when stored, compared with invalidations
+    sequence: int
+    object_ids: Set[str]
+    fresh_until: float
+    etag: Optional[str] = None
+
+
+class ResponseCache:
+    """
+    Cache of read tool results keyed by (identity, tool, arguments).
+
+    A result is served from memory for the tool's TTL. Results of tools that
+    read a single Box object keep the object's etag; once the TTL is over the
+    result is revalidated with If-None-Match, so it costs a 304 rather than
+    the full call. Write tools invalidate every cached result that contains
+    one of the object IDs they were called with or returned.
+    """
+
+    def __init__(
+        self,
+        config: CacheConfig,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttls = {
+            name: config.response_cache_ttls.get(name, policy.ttl)
+            for name, policy in READ_POLICIES.items()
+        }
+        self.max_stale = config.response_cache_max_stale
+        self._clock = clock
+        max_ttl = max(self.ttls.values(), default=0.0)
+        self._lifetime = max_ttl + self.max_stale
+        self._entries: TTLCache[CacheKey, CachedResponse] = TTLCache(
+            max_size=config.response_cache_max_size, ttl=self._lifetime, clock=clock
+        )
+        # Object ID -> (sequence, time) of the last write that touched it
+        self._invalidated: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.invalidations = 0
+
+    def is_cached(self, tool_name: str) -> bool:
+        """Return whether results of a tool are cached."""
+        return self.ttls.get(tool_name, 0) > 0
+
+    def next_sequence(self) -> int:
+        """Return the position in the cache history before reading from Box."""
+        with self._lock:
+            self._sequence += 1
+            return self._sequence
+
+    def is_fresh(self, entry: CachedResponse) -> bool:
+        """Return whether an entry is served without asking Box."""
+        return self._clock() < entry.fresh_until
+
+    def is_invalidated(self, entry: CachedResponse) -> bool:
+        """Return whether a write touched an object of the entry after it was stored."""
+        invalidated = self._invalidated
+        for object_id in entry.object_ids:
+            record = invalidated.get(object_id)
+            if record is not None and record[0] > entry.sequence:
+                return True
+        return False
+
+    def lookup(self, key: CacheKey) -> Optional[CachedResponse]:
+        """Return the cached entry for a call, None if missing or invalidated."""
+        entry = self._entries.get(key)
+        if entry is not None and self.is_invalidated(entry):
+            self._entries.pop(key)
+            entry = None
+        return entry
+
+    def store(
+        self,
+        key: CacheKey,
+        result: Any,
+        object_ids: Set[str],
+        etag: Optional[str],
+        sequence: int,
+    ) -> None:
+        """Cache a result obtained after the given sequence number."""
+        ttl = self.ttls[key[1]]
+        entry = CachedResponse(
+            result=result,
+            sequence=sequence,
+            object_ids=object_ids,
+            fresh_until=self._clock() + ttl,
+            etag=etag,
+        )
+        # Results without an etag cannot be revalidated once stale
+        self._entries.set(key, entry, ttl=self._lifetime if etag else ttl)
+
+    def renew(self, entry: CachedResponse, tool_name: str) -> None:
+        """Serve an entry Box confirmed as unchanged for another TTL."""
+        entry.fresh_until = self._clock() + self.ttls[tool_name]
+
+    def invalidate(self, object_ids: Set[str]) -> None:
+        """Drop every cached result that refers to one of the objects."""
+        if not object_ids:
+            return
+        now = self._clock()
+        with self._lock:
+            self._sequence += 1
+            for object_id in object_ids:
+                self._invalidated[object_id] = (self._sequence, now)
+            self.invalidations += 1
+            # Records older than any entry can be forgotten
+            if len(self._invalidated) > self._entries.max_size:
+                self._invalidated = {
+                    object_id: record
+                    for object_id, record in self._invalidated.items()
+                    if now - record[1] < self._lifetime
+                }
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the size and counters of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified,
+            "invalidations": self.invalidations,
+        }
+
+
+_response_cache: Optional[ResponseCache] = None
+register_metrics(
+    "response_cache",
+    lambda: _response_cache.stats() if _response_cache is not None else {},
+)
+
+
+def configure_response_cache(config: CacheConfig) -> Optional[ResponseCache]:
+    """
+    Enable or disable the process wide response cache.
+
+    Args:
+        config: CacheConfig with the response cache settings
+
+    Returns:
+        Optional[ResponseCache]: The new cache, None if disabled
+    """
+    global _response_cache
+    _response_cache = ResponseCache(config) if config.response_cache else None
+    return _response_cache
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process wide response cache, None if disabled."""
+    return _response_cache
+
+
+async def _fetch_etag(ctx: Any, path: str, etag: Optional[str] = None) -> Any:
+    """GET the etag of an object, conditionally if an etag is given."""
+    headers = {"If-None-Match": etag} if etag else None
+    return await box_api_request(
+        get_box_client(ctx), "GET", path, params={"fields": "etag"}, headers=headers
+    )
+
+
+async def _current_etag(ctx: Any, path: str) -> Optional[str]:
+    try:
+        return (await _fetch_etag(ctx, path)).json().get("etag")
+    except (BoxAsyncAPIError, ValueError) as e:
+        logger.debug(f"Could not get etag of {path}: {e}")
+        return None
+
+
+def cache_responses(
+    func: Callable[..., Awaitable[T]],
+) -> Callable[..., Awaitable[T]]:
+    """
+    Wrap an async tool with the response cache.
+
+    Read tools listed in READ_POLICIES are served from the cache, write tools
+    invalidate the objects they touch. Other tools are returned unchanged. The
+    wrapper keeps the signature of the tool, so FastMCP still sees the
+    original arguments and the Context parameter.
+    """
+    tool_name = func.__name__
+    policy = READ_POLICIES.get(tool_name)
+    write = is_write_tool(tool_name)
+    if policy is None and not write:
+        return func
+    signature = inspect.signature(func)
+
+    def bind(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[Any, Dict]:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        return arguments.pop("ctx", None), arguments
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        cache = _response_cache
+        if cache is None:
+            return await func(*args, **kwargs)
+
+        ctx, arguments = bind(args, kwargs)
+        if write:
+            # Invalidate before and after, a concurrent read may store the old state
+            touched = {
+                str(value)
+                for name, value in arguments.items()
+                if name.endswith("_id") and value is not None
+            }
+            cache.invalidate(touched)
+            result = await func(*args, **kwargs)
+            cache.invalidate(touched | collect_object_ids(result))
+            return result
+
+        if not cache.is_cached(tool_name):
+            return await func(*args, **kwargs)
+
+        key = (
+            get_caller_identity(ctx),
+            tool_name,
+            json.dumps(arguments, sort_keys=True, default=str),
+        )
+        object_id = arguments.get(policy.object_arg) if policy.object_arg else None
+        path = (
+            policy.object_path.format(object_id)
+            if policy.object_path and object_id is not None
+            else None
+        )
+
+        entry = cache.lookup(key)
+        if entry is not None:
+            if cache.is_fresh(entry):
+                cache.hits += 1
+                return entry.result
+            if entry.etag and path:
+                cache.revalidations += 1
+                try:
+                    response = await _fetch_etag(ctx, path, entry.etag)
+                    if response.status_code == 304 and not cache.is_invalidated(entry):
+                        cache.not_modified += 1
+                        cache.hits += 1
+                        cache.renew(entry, tool_name)
+                        return entry.result
+                except BoxAsyncAPIError as e:
+                    logger.debug(f"Revalidation of {path} failed: {e}")
+
+        cache.misses += 1
+        sequence = cache.next_sequence()
+        etag = None
+        if path is not None and not policy.etag_in_result:
+            # Taken before the call, a change in between fails the next revalidation
+            etag = await _current_etag(ctx, path)
+        result = await func(*args, **kwargs)
+        if isinstance(result, dict) and "error" in result:
+            return result
+        if path is not None and policy.etag_in_result:
+            etag = _find_etag(result, str(object_id))
+        object_ids = collect_object_ids(result)
+        if object_id is not None:
+            object_ids.add(str(object_id))
+        cache.store(key, result, object_ids, etag, sequence)
+        return result
+
+    return wrapper
@@ -0,0 +1,175 @@
+"""Snapshots of Box data that are loaded whole and reloaded in the background."""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+from box_sdk_gen import BoxClient
+
+from cache.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SnapshotCache(Generic[T]):
+    """
+    Keep one snapshot per key, e.g. per enterprise, built by an async loader.
+
+    A snapshot is served for ttl seconds. After that it is still served for
+    up to max_stale seconds while a new one is loaded in the background, and
+    then dropped. At most max_size snapshots are kept, the least recently
+    used is dropped first. Concurrent loads for the same key share one
+    loader call, and a failed load leaves the previous snapshot in place. A
+    key without a snapshot whose load failed gets the same error for
+    retry_after seconds instead of another load.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[BoxClient], Awaitable[T]],
+        ttl: float,
+        max_stale: float,
+        retry_after: float = 0.0,
+        max_size: int = 64,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.retry_after = retry_after
+        self._loader = loader
+        self._clock = clock
+        self._snapshots: TTLCache[str, Tuple[float, T]] = TTLCache(
+            max_size=max_size, ttl=ttl + max_stale, clock=clock
+        )
+        self._failures: TTLCache[str, Exception] = TTLCache(
+            max_size=max_size, ttl=retry_after, clock=clock
+        )
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Incremented on invalidation, a load started before is not stored
+        self._generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.loads = 0
+        self.errors = 0
+        self.failure_hits = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache is used, a ttl of 0 disables it."""
+        return self.ttl > 0
+
+    async def get(
+        self, client: BoxClient, identity: str = "", refresh: bool = False
+    ) -> T:
+        """
+        Return the snapshot of a key, loading it if needed.
+
+        Args:
+            client: Box client of the caller, passed to the loader
+            identity: Snapshot key, from get_caller_enterprise or
+                get_caller_identity
+            refresh: Load a new snapshot even if the current one is fresh
+
+        Raises:
+            Exception: Whatever the loader raised, if no snapshot is cached
+        """
+        entry = self._snapshots.get(identity)
+        if entry is not None and not refresh:
+            age = self._clock() - entry[0]
+            if age < self.ttl:
+                self.hits += 1
+                return entry[1]
+            if age < self.ttl + self.max_stale:
+                self.stale_hits += 1
+                self._load_task(client, identity)
+                return entry[1]
+        elif entry is None and not refresh:
+            failure = self._failures.get(identity)
+            if failure is not None:
+                self.failure_hits += 1
+                raise failure
+
+        try:
+            return await asyncio.shield(self._load_task(client, identity))
+        except Exception:
+            if entry is not None:
+                return entry[1]
+            raise
+
+    def preload(self, client: BoxClient, identity: str = "") -> None:
+        """Start loading the snapshot of a key in the background."""
+        if self.enabled and identity not in self._snapshots:
+            self._load_task(client, identity)
+
+    def peek(self, identity: str = "") -> Optional[T]:
+        """Return the cached snapshot of a key without loading it."""
+        entry = self._snapshots.get(identity)
+        return None if entry is None else entry[1]
+
+    def age(self, identity: str = "") -> Optional[float]:
+        """Return the age of a key's snapshot in seconds, None if missing."""
+        entry = self._snapshots.get(identity)
+        return None if entry is None else self._clock() - entry[0]
+
+    def _load_task(self, client: BoxClient, identity: str) -> asyncio.Task:
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(identity)
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._load(client, identity))
+            task.add_done_callback(lambda done: self._load_done(identity, done))
+            self._inflight[identity] = task
+        return task
+
+    def _load_done(self, identity: str, task: asyncio.Task) -> None:
+        # A newer load of the same key may have replaced this one
+        if self._inflight.get(identity) is task:
+            del self._inflight[identity]
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+            logger.warning(f"Failed to load {self.name}: {task.exception()}")
+
+    async def _load(self, client: BoxClient, identity: str) -> T:
+        loaded_at = self._clock()
+        generation = self._generation
+        try:
+            value = await self._loader(client)
+        except Exception as error:
+            if generation == self._generation:
+                self._failures.set(identity, error)
+            raise
+        self._failures.pop(identity)
+        if generation == self._generation:
+            # Expires max_stale seconds after going stale, counted from the load
+            self._snapshots.set(
+                identity,
+                (loaded_at, value),
+                ttl=loaded_at + self.ttl + self.max_stale - self._clock(),
+            )
+        self.loads += 1
+        return value
+
+    def invalidate(self, identity: Optional[str] = None) -> None:
+        """Forget the snapshot of one key, or of every key."""
+        self._generation += 1
+        if identity is None:
+            self._snapshots.clear()
+            self._failures.clear()
+        else:
+            self._snapshots.pop(identity)
+            self._failures.pop(identity)
+
+    def stats(self) -> Dict[str, float]:
+        """Return cache statistics."""
+        return {
+            "snapshots": len(self._snapshots),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "loads": self.loads,
+            "errors": self.errors,
+            "failure_hits": self.failure_hits,
+        }
@@ -0,0 +1,87 @@
+"""Prefix and substring search over short texts such as names and logins."""
+
+import bisect
+from array import array
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class TextIndex:
+    """
+    Case insensitive partial match index over a list of entries.
+
+    Each entry is a few texts, e.g. a user's name and login. The lower cased
+    texts and their words are kept in a sorted list for prefix matches, and
+    a trigram index finds entries containing the query anywhere.
+    """
+
+    def __init__(self, entries: Iterable[Iterable[str]]):
+        # (token, entry position) pairs sorted by token
+        self._prefixes: List[Tuple[str, int]] = []
+        self._trigrams: Dict[str, array] = {}
+        # Lower cased texts of each entry, to confirm trigram matches
+        self._haystacks: List[str] = []
+
+        for position, texts in enumerate(entries):
+            texts = [text.lower() for text in texts if text]
+            haystack = "\n".join(texts)
+            self._haystacks.append(haystack)
+            tokens = set(texts)
+            for text in texts:
+                tokens.update(text.split())
+            self._prefixes.extend((token, position) for token in tokens)
+            for trigram in _trigrams(haystack):
+                postings = self._trigrams.get(trigram)
+                if postings is None:
+                    postings = self._trigrams[trigram] = array("I")
+                postings.append(position)
+        self._prefixes.sort()
+
+    def search(self, query: str) -> List[int]:
+        """
+        Return the positions of the entries matching query.
+
+        Entries with a text or word starting with the query come first. For
+        queries of three or more characters they are followed by entries
+        containing the query elsewhere. Both groups keep the entry order.
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+        positions: Dict[int, None] = {}
+        index = bisect.bisect_left(self._prefixes, (query,))
+        while index < len(self._prefixes):
+            token, position = self._prefixes[index]
+            if not token.startswith(query):
+                break
+            positions[position] = None
+            index += 1
+        matches = sorted(positions)
+        # Shorter queries would match nearly everything somewhere
+        if len(query) >= 3:
+            matches.extend(
+                position
+                for position in self._containing(query)
+                if position not in positions
+            )
+        return matches
+
+    def _containing(self, query: str) -> List[int]:
+        postings = []
+        for trigram in _trigrams(query):
+            found = self._trigrams.get(trigram)
+            if found is None:
+                return []
+            postings.append(found)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for found in postings[1:]:
+            candidates.intersection_update(found)
+        return [
+            position
+            for position in sorted(candidates)
+            if query in self._haystacks[position]
+        ]
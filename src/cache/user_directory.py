@@ -0,0 +1,123 @@
+"""In-memory index of the enterprise users, backing the user tools."""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from box_sdk_gen import BoxClient
+
+from cache.snapshot_cache import SnapshotCache
+from cache.text_index import TextIndex
+from config import CacheConfig
+from executor import run_blocking
+from metrics import register_metrics
+from tools.box_api_async import list_users_async
+
+
+class UserRecord:
+    """One user, with the fields the user tools return."""
+
+    __slots__ = ("id", "type", "name", "login", "role")
+
+    def __init__(self, user: Dict[str, Any]):
+        self.id = user.get("id")
+        self.type = user.get("type", "user")
+        self.name = user.get("name")
+        self.login = user.get("login")
+        self.role = user.get("role")
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Missing fields are left out, like the Box SDK models do
+        return {
+            field: getattr(self, field)
+            for field in self.__slots__
+            if getattr(self, field) is not None
+        }
+
+
+class UserDirectory:
+    """
+    Users of an enterprise with exact and partial match indexes.
+
+    Logins and names are indexed for exact lookups, and a TextIndex over
+    both serves partial search.
+    """
+
+    def __init__(self, users: Iterable[Dict[str, Any]]):
+        self.records: List[UserRecord] = [UserRecord(user) for user in users]
+        self._by_login: Dict[str, int] = {}
+        self._by_name: Dict[str, int] = {}
+        for position, record in enumerate(self.records):
+            # The first user wins, as in a scan of the user list
+            if record.login:
+                self._by_login.setdefault(record.login, position)
+            if record.name:
+                self._by_name.setdefault(record.name, position)
+        self._text = TextIndex(
+            (record.name or "", record.login or "") for record in self.records
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def users(self) -> List[Dict[str, Any]]:
+        """Return every user."""
+        return [record.to_dict() for record in self.records]
+
+    def locate_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Return the user whose login is exactly email, or None."""
+        position = self._by_login.get(email)
+        return None if position is None else self.records[position].to_dict()
+
+    def locate_by_name(self, name: str) -> Optional[Dict[str, Any]]:
+        """Return the first user whose name is exactly name, or None."""
+        position = self._by_name.get(name)
+        return None if position is None else self.records[position].to_dict()
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Return the users whose name or login matches query, ignoring case.
+
+        Users with a name, name word or login starting with the query come
+        first, as Box's filter_term returns them. For queries of three or
+        more characters they are followed by users whose name or login
+        contains the query elsewhere.
+        """
+        return [
+            self.records[position].to_dict() for position in self._text.search(query)
+        ]
+
+
+async def _load_directory(client: BoxClient) -> UserDirectory:
+    users = await list_users_async(client)
+    # Indexing a large enterprise takes long enough to stall the event loop
+    return await run_blocking(UserDirectory, users)
+
+
+def _create_cache(config: CacheConfig) -> SnapshotCache[UserDirectory]:
+    return SnapshotCache(
+        "user directory",
+        _load_directory,
+        ttl=config.user_directory_ttl if config.user_directory else 0,
+        max_stale=config.user_directory_max_stale,
+        retry_after=config.user_directory_retry_after,
+        max_size=config.user_directory_max_size,
+    )
+
+
+_user_directory = _create_cache(CacheConfig())
+register_metrics("user_directory", lambda: _user_directory.stats())
+
+
+def configure_user_directory(config: CacheConfig) -> None:
+    """
+    Replace the user directory cache.
+
+    Args:
+        config: CacheConfig with the user directory settings
+    """
+    global _user_directory
+    _user_directory = _create_cache(config)
+
+
+def get_user_directory() -> SnapshotCache[UserDirectory]:
+    """Return the user directory cache."""
+    return _user_directory
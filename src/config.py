@@ -5,11 +5,13 @@ import os
 import sys
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from typing import Callable, Dict, List, Optional, TypeVar
 
 import colorlog
 import dotenv
 
+T = TypeVar("T")
+
 
 class TransportType(str, Enum):
     """Available transport types for the MCP server."""
@@ -46,6 +48,7 @@ class ServerConfig:
     box_auth: BoxAuthType = BoxAuthType.OAUTH
     mcp_auth_type: McpAuthType = McpAuthType.TOKEN
     server_name: str = "Box Community MCP"
+    workers: int = 1
 
 
 @dataclass
@@ -68,7 +71,144 @@ class BoxApiConfig:
     # JWT config file (alternative to env vars)
     jwt_config_file: Optional[str] = None
 
+    # Share CCG/JWT tokens between worker processes through a locked file
+    shared_token_store: bool = True
+
+
+@dataclass
+class ExecutorConfig:
+    """Configuration for the worker pool that runs blocking Box API calls."""
+
+    # Number of worker threads shared by all tools
+    max_workers: int = 32
+
+    # Concurrent calls allowed per tool, 0 means only bounded by max_workers
+    default_tool_concurrency: int = 0
+
+    # Per-tool overrides, keyed by tool name
+    tool_concurrency: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class HttpConfig:
+    """Configuration for the HTTP connection pool shared by all Box clients."""
+
+    # Number of hosts to keep a connection pool for
+    pool_connections: int = 10
+
+    # Maximum connections kept open per host
+    pool_maxsize: int = 32
+
+    # Negotiate HTTP/2 on the asyncio client (requires the h2 package)
+    http2: bool = False
+
+    # Serve the most frequent read tools from the native asyncio client
+    async_reads: bool = False
 
+    # Folders listed at the same time by a recursive folder listing
+    folder_concurrency: int = 8
+
+    # Searches over several folders or extension groups run as concurrent
+    # shards, at most search_rate search calls start per second (0 for no
+    # limit) and shards still running after search_deadline are cut short
+    search_concurrency: int = 4
+    search_rate: float = 10.0
+    search_deadline: float = 10.0
+
+
+@dataclass
+class CacheConfig:
+    """Configuration for the in-memory caches."""
+
+    # Box clients built from MCP client bearer tokens (mcp_client mode)
+    client_cache_max_size: int = 1024
+    client_cache_ttl: float = 900.0
+
+    # Upstream OAuth authorization server metadata, served stale for up to
+    # oauth_metadata_max_stale seconds while it is fetched again
+    oauth_metadata_ttl: float = 3600.0
+    oauth_metadata_max_stale: float = 86400.0
+
+    # Outcome of MCP client token validation, rejected tokens are kept shorter
+    token_cache_max_size: int = 10000
+    token_cache_ttl: float = 300.0
+    token_negative_cache_ttl: float = 60.0
+
+    # Results of read tools, revalidated with Box ETags for up to
+    # response_cache_max_stale seconds after their TTL
+    response_cache: bool = False
+    response_cache_max_size: int = 4096
+    response_cache_max_stale: float = 3600.0
+    response_cache_ttls: Dict[str, float] = field(default_factory=dict)
+
+    # Enterprise metadata templates, reloaded in the background once older
+    # than metadata_template_ttl seconds; 0 disables the cache. At most
+    # metadata_template_max_size enterprises are kept
+    metadata_template_ttl: float = 300.0
+    metadata_template_max_stale: float = 3600.0
+    metadata_template_max_size: int = 256
+
+    # Field values of metadata instances last read or written, diffed against
+    # by updates; 0 makes every update read the instance first
+    metadata_instance_cache_max_size: int = 4096
+    metadata_instance_ttl: float = 30.0
+
+    # Enterprise users indexed in memory for the user tools, loaded at startup
+    # and reloaded in the background once older than user_directory_ttl. An
+    # enterprise whose users can't be listed isn't retried for
+    # user_directory_retry_after; at most user_directory_max_size
+    # enterprises are kept
+    user_directory: bool = False
+    user_directory_ttl: float = 900.0
+    user_directory_max_stale: float = 86400.0
+    user_directory_retry_after: float = 300.0
+    user_directory_max_size: int = 16
+
+    # Group memberships by group and by user, and the group names searched by
+    # box_groups_search_tool, each kept for group_index_ttl seconds
+    group_index: bool = False
+    group_index_ttl: float = 300.0
+    group_index_max_size: int = 10000
+
+    # Paths resolved by box_resolve_path_tool, renamed or moved items are
+    # dropped at once, other changes are seen after path_cache_ttl seconds
+    path_cache_max_size: int = 4096
+    path_cache_ttl: float = 300.0
+
+    # Folder trees mirrored to a local SQLite database and kept current from
+    # the Box events stream; the folder tools only answer from the mirror
+    # while its last sync is at most folder_mirror_max_lag seconds old
+    folder_mirror_roots: List[str] = field(default_factory=list)
+    folder_mirror_path: str = ".box-folder-mirror.sqlite3"
+    folder_mirror_max_lag: float = 120.0
+    folder_mirror_poll_timeout: float = 60.0
+
+    # Full-text index of the files below these folders, searched by
+    # box_local_search_tool while its last sync is at most
+    # content_index_max_age seconds old; requires numpy
+    content_index_roots: List[str] = field(default_factory=list)
+    content_index_path: str = ".box-content-index.sqlite3"
+    content_index_max_age: float = 3600.0
+    content_index_refresh_interval: float = 900.0
+    content_index_concurrency: int = 4
+
+
+@dataclass
+class TokenRefreshConfig:
+    """Configuration for the background refresh of CCG and JWT access tokens."""
+
+    # Refresh service tokens in the background instead of on a tool call
+    enabled: bool = True
+
+    # Seconds before expiry at which the token is refreshed
+    refresh_margin: float = 300.0
+
+    # Fraction of the refresh delay randomly taken off, so workers spread out
+    jitter: float = 0.1
+
+    # Retry delays after a failed refresh, doubled on each failure
+    min_backoff: float = 1.0
+    max_backoff: float = 300.0
 
 
 @dataclass
@@ -81,6 +221,14 @@ class McpAuthConfig:
     # OAuth protected resource config file
     oauth_protected_resources_config_file: str = ".oauth-protected-resource.json"
 
+    # Upstream authorization server metadata, extended by this server
+    oauth_authorization_server_metadata_url: str = (
+        "https://account.box.com/.well-known/oauth-authorization-server"
+    )
+
+    # Check MCP client bearer tokens with Box before passing the request on
+    validate_tokens: bool = False
+
 
 @dataclass
 class LoggingConfig:
@@ -97,6 +245,10 @@ class AppConfig:
     box_api: BoxApiConfig = field(default_factory=BoxApiConfig)
     mcp_auth: McpAuthConfig = field(default_factory=McpAuthConfig)
     logging: LoggingConfig = field(default_factory=LoggingConfig)
+    executor: ExecutorConfig = field(default_factory=ExecutorConfig)
+    cache: CacheConfig = field(default_factory=CacheConfig)
+    http: HttpConfig = field(default_factory=HttpConfig)
+    token_refresh: TokenRefreshConfig = field(default_factory=TokenRefreshConfig)
 
     @classmethod
     def from_env(cls) -> "AppConfig":
@@ -120,6 +272,8 @@ class AppConfig:
             private_key=os.getenv("BOX_PRIVATE_KEY"),
             private_key_passphrase=os.getenv("BOX_PRIVATE_KEY_PASSPHRASE"),
             jwt_config_file=os.getenv("BOX_JWT_CONFIG_FILE"),
+            shared_token_store=os.getenv("BOX_MCP_SHARED_TOKEN_STORE", "true").lower()
+            == "true",
         )
 
         # MCP Auth configuration
@@ -129,6 +283,126 @@ class AppConfig:
                 "OAUTH_PROTECTED_RESOURCES_CONFIG_FILE",
                 ".oauth-protected-resource.json"
             ),
+            oauth_authorization_server_metadata_url=os.getenv(
+                "OAUTH_AUTHORIZATION_SERVER_METADATA_URL",
+                "https://account.box.com/.well-known/oauth-authorization-server",
+            ),
+            validate_tokens=os.getenv("BOX_MCP_VALIDATE_TOKENS", "false").lower()
+            == "true",
+        )
+
+        # Worker pool configuration
+        executor_config = ExecutorConfig(
+            max_workers=int(os.getenv("BOX_MCP_EXECUTOR_MAX_WORKERS", "32")),
+            default_tool_concurrency=int(os.getenv("BOX_MCP_TOOL_CONCURRENCY", "0")),
+            tool_concurrency=parse_tool_limits(
+                os.getenv("BOX_MCP_TOOL_CONCURRENCY_LIMITS", "")
+            ),
+        )
+
+        # Cache configuration
+        cache_config = CacheConfig(
+            client_cache_max_size=int(os.getenv("BOX_MCP_CLIENT_CACHE_SIZE", "1024")),
+            client_cache_ttl=float(os.getenv("BOX_MCP_CLIENT_CACHE_TTL", "900")),
+            oauth_metadata_ttl=float(os.getenv("BOX_MCP_OAUTH_METADATA_TTL", "3600")),
+            oauth_metadata_max_stale=float(
+                os.getenv("BOX_MCP_OAUTH_METADATA_MAX_STALE", "86400")
+            ),
+            token_cache_max_size=int(os.getenv("BOX_MCP_TOKEN_CACHE_SIZE", "10000")),
+            token_cache_ttl=float(os.getenv("BOX_MCP_TOKEN_CACHE_TTL", "300")),
+            token_negative_cache_ttl=float(
+                os.getenv("BOX_MCP_TOKEN_NEGATIVE_CACHE_TTL", "60")
+            ),
+            response_cache=os.getenv("BOX_MCP_RESPONSE_CACHE", "false").lower()
+            == "true",
+            response_cache_max_size=int(
+                os.getenv("BOX_MCP_RESPONSE_CACHE_SIZE", "4096")
+            ),
+            response_cache_max_stale=float(
+                os.getenv("BOX_MCP_RESPONSE_CACHE_MAX_STALE", "3600")
+            ),
+            response_cache_ttls=parse_tool_ttls(
+                os.getenv("BOX_MCP_RESPONSE_CACHE_TTLS", "")
+            ),
+            metadata_template_ttl=float(
+                os.getenv("BOX_MCP_METADATA_TEMPLATE_TTL", "300")
+            ),
+            metadata_template_max_stale=float(
+                os.getenv("BOX_MCP_METADATA_TEMPLATE_MAX_STALE", "3600")
+            ),
+            metadata_template_max_size=int(
+                os.getenv("BOX_MCP_METADATA_TEMPLATE_SIZE", "256")
+            ),
+            metadata_instance_cache_max_size=int(
+                os.getenv("BOX_MCP_METADATA_INSTANCE_CACHE_SIZE", "4096")
+            ),
+            metadata_instance_ttl=float(
+                os.getenv("BOX_MCP_METADATA_INSTANCE_TTL", "30")
+            ),
+            user_directory=os.getenv("BOX_MCP_USER_DIRECTORY", "false").lower()
+            == "true",
+            user_directory_ttl=float(os.getenv("BOX_MCP_USER_DIRECTORY_TTL", "900")),
+            user_directory_max_stale=float(
+                os.getenv("BOX_MCP_USER_DIRECTORY_MAX_STALE", "86400")
+            ),
+            user_directory_retry_after=float(
+                os.getenv("BOX_MCP_USER_DIRECTORY_RETRY_AFTER", "300")
+            ),
+            user_directory_max_size=int(os.getenv("BOX_MCP_USER_DIRECTORY_SIZE", "16")),
+            group_index=os.getenv("BOX_MCP_GROUP_INDEX", "false").lower() == "true",
+            group_index_ttl=float(os.getenv("BOX_MCP_GROUP_INDEX_TTL", "300")),
+            group_index_max_size=int(os.getenv("BOX_MCP_GROUP_INDEX_SIZE", "10000")),
+            path_cache_max_size=int(os.getenv("BOX_MCP_PATH_CACHE_SIZE", "4096")),
+            path_cache_ttl=float(os.getenv("BOX_MCP_PATH_CACHE_TTL", "300")),
+            folder_mirror_roots=[
+                root.strip()
+                for root in os.getenv("BOX_MCP_FOLDER_MIRROR_ROOTS", "").split(",")
+                if root.strip()
+            ],
+            folder_mirror_path=os.getenv(
+                "BOX_MCP_FOLDER_MIRROR_PATH", ".box-folder-mirror.sqlite3"
+            ),
+            folder_mirror_max_lag=float(
+                os.getenv("BOX_MCP_FOLDER_MIRROR_MAX_LAG", "120")
+            ),
+            folder_mirror_poll_timeout=float(
+                os.getenv("BOX_MCP_FOLDER_MIRROR_POLL_TIMEOUT", "60")
+            ),
+            content_index_roots=[
+                root.strip()
+                for root in os.getenv("BOX_MCP_CONTENT_INDEX_ROOTS", "").split(",")
+                if root.strip()
+            ],
+            content_index_path=os.getenv(
+                "BOX_MCP_CONTENT_INDEX_PATH", ".box-content-index.sqlite3"
+            ),
+            content_index_max_age=float(
+                os.getenv("BOX_MCP_CONTENT_INDEX_MAX_AGE", "3600")
+            ),
+            content_index_refresh_interval=float(
+                os.getenv("BOX_MCP_CONTENT_INDEX_REFRESH", "900")
+            ),
+            content_index_concurrency=int(
+                os.getenv("BOX_MCP_CONTENT_INDEX_CONCURRENCY", "4")
+            ),
+        )
+
+        # HTTP connection pool configuration
+        http_config = HttpConfig(
+            pool_connections=int(os.getenv("BOX_MCP_HTTP_POOL_HOSTS", "10")),
+            pool_maxsize=int(os.getenv("BOX_MCP_HTTP_POOL_MAXSIZE", "32")),
+            http2=os.getenv("BOX_MCP_HTTP2", "false").lower() == "true",
+            async_reads=os.getenv("BOX_MCP_ASYNC_READS", "false").lower() == "true",
+            folder_concurrency=int(os.getenv("BOX_MCP_FOLDER_CONCURRENCY", "8")),
+            search_concurrency=int(os.getenv("BOX_MCP_SEARCH_CONCURRENCY", "4")),
+            search_rate=float(os.getenv("BOX_MCP_SEARCH_RATE", "10")),
+            search_deadline=float(os.getenv("BOX_MCP_SEARCH_DEADLINE", "10")),
+        )
+
+        # Background token refresh configuration
+        token_refresh_config = TokenRefreshConfig(
+            enabled=os.getenv("BOX_MCP_TOKEN_REFRESH", "true").lower() == "true",
+            refresh_margin=float(os.getenv("BOX_MCP_TOKEN_REFRESH_MARGIN", "300")),
         )
 
         # Logging configuration
@@ -141,9 +415,67 @@ class AppConfig:
             box_api=box_api_config,
             mcp_auth=mcp_auth_config,
             logging=logging_config,
+            executor=executor_config,
+            cache=cache_config,
+            http=http_config,
+            token_refresh=token_refresh_config,
         )
 
 
+def _parse_tool_map(value: str, cast: Callable[[str], T]) -> Dict[str, T]:
+    """
+    Parse a comma separated list of tool=value pairs.
+
+    Raises:
+        ValueError: If an entry is not a tool=value pair, or cast rejects
+            the value
+    """
+    parsed: Dict[str, T] = {}
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        tool_name, sep, setting = entry.partition("=")
+        if not sep or not tool_name.strip():
+            raise ValueError(f"Invalid tool setting, expected tool=value: {entry}")
+        parsed[tool_name.strip()] = cast(setting)
+    return parsed
+
+
+def parse_tool_limits(value: str) -> Dict[str, int]:
+    """
+    Parse per-tool concurrency limits.
+
+    Args:
+        value: Comma separated list of tool=limit pairs,
+            e.g. "box_ai_extract_freeform_tool=4,box_search_tool=8"
+
+    Returns:
+        Dict[str, int]: Limits keyed by tool name
+
+    Raises:
+        ValueError: If an entry is not a tool=limit pair
+    """
+    return _parse_tool_map(value, int)
+
+
+def parse_tool_ttls(value: str) -> Dict[str, float]:
+    """
+    Parse per-tool cache TTLs.
+
+    Args:
+        value: Comma separated list of tool=seconds pairs, 0 disables caching,
+            e.g. "box_folder_info_tool=300,box_folder_list_tags_tool=0"
+
+    Returns:
+        Dict[str, float]: TTLs keyed by tool name
+
+    Raises:
+        ValueError: If an entry is not a tool=seconds pair
+    """
+    return _parse_tool_map(value, float)
+
+
 # Global instances (kept for backward compatibility during migration)
 DEFAULT_CONFIG = ServerConfig()
 
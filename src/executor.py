@@ -0,0 +1,144 @@
+"""Bounded worker pool for running blocking Box API calls off the event loop."""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from config import ExecutorConfig
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ToolExecutor:
+    """
+    Runs blocking callables on a shared thread pool.
+
+    The box_ai_agents_toolkit functions are synchronous, so calling them directly
+    from an async tool blocks the event loop and serializes every client. The
+    executor dispatches those calls to a bounded pool of worker threads and
+    optionally caps how many calls of a single tool may run at the same time.
+    """
+
+    def __init__(self, config: ExecutorConfig):
+        self.config = config
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        # Semaphores are bound to the event loop they are used on
+        self._semaphores: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]
+        ] = weakref.WeakKeyDictionary()
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        """The worker thread pool, created on first use."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    logger.info(
+                        f"Starting Box worker pool with {self.config.max_workers} threads"
+                    )
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.config.max_workers,
+                        thread_name_prefix="box-worker",
+                    )
+        return self._pool
+
+    def tool_limit(self, tool_name: str) -> int:
+        """Return the concurrency cap for a tool, 0 meaning no cap."""
+        return self.config.tool_concurrency.get(
+            tool_name, self.config.default_tool_concurrency
+        )
+
+    def semaphore(self, tool_name: str) -> Optional[asyncio.Semaphore]:
+        """Return the semaphore capping a tool on the running loop, if any."""
+        limit = self.tool_limit(tool_name)
+        if limit <= 0:
+            return None
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.setdefault(loop, {})
+        if tool_name not in semaphores:
+            semaphores[tool_name] = asyncio.Semaphore(limit)
+        return semaphores[tool_name]
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking callable on the worker pool and await its result.
+
+        Context variables of the calling task are visible to the worker thread.
+
+        Args:
+            func: The blocking callable
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The value returned by func
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        return await loop.run_in_executor(self.pool, call)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool. A new one is created on next use."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
+
+
+_executor = ToolExecutor(ExecutorConfig())
+
+
+def get_executor() -> ToolExecutor:
+    """Return the process wide tool executor."""
+    return _executor
+
+
+def configure_executor(config: ExecutorConfig) -> ToolExecutor:
+    """
+    Replace the process wide tool executor.
+
+    Args:
+        config: ExecutorConfig with the pool size and tool limits
+
+    Returns:
+        ToolExecutor: The new executor
+    """
+    global _executor
+    _executor.shutdown(wait=False)
+    _executor = ToolExecutor(config)
+    return _executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking Box call on the shared worker pool."""
+    return await _executor.run(func, *args, **kwargs)
+
+
+def limit_concurrency(
+    func: Callable[..., Awaitable[T]],
+) -> Callable[..., Awaitable[T]]:
+    """
+    Wrap an async tool so that at most tool_limit(name) calls run at once.
+
+    The wrapper keeps the signature of the tool, so FastMCP still sees the
+    original arguments and the Context parameter.
+    """
+    tool_name = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        semaphore = _executor.semaphore(tool_name)
+        if semaphore is None:
+            return await func(*args, **kwargs)
+        async with semaphore:
+            return await func(*args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,159 @@
+"""Process wide HTTP connection pool shared by all Box clients."""
+
+import asyncio
+import importlib.util
+import logging
+import weakref
+from typing import Any, Dict
+
+import httpx
+import requests
+from box_sdk_gen import BoxNetworkClient, NetworkSession
+from requests.adapters import HTTPAdapter
+
+from config import HttpConfig
+from metrics import register_metrics
+
+logger = logging.getLogger(__name__)
+
+
+def _create_requests_session(config: HttpConfig) -> requests.Session:
+    """Create a keep-alive requests session with a sized connection pool."""
+    session = requests.Session()
+    # The Box SDK retries on its own, the adapter must not retry as well
+    adapter = HTTPAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        max_retries=0,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_config = HttpConfig()
+_requests_session = _create_requests_session(_config)
+_network_session = NetworkSession(
+    network_client=BoxNetworkClient(requests_session=_requests_session)
+)
+
+# httpx clients are bound to the event loop that opened their connections
+_async_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, httpx.AsyncClient
+] = weakref.WeakKeyDictionary()
+
+
+def configure_http_pool(config: HttpConfig) -> None:
+    """
+    Replace the shared connection pool.
+
+    Clients created before the call keep using the previous pool.
+
+    Args:
+        config: HttpConfig with the pool sizes
+    """
+    global _config, _requests_session, _network_session
+    logger.info(
+        f"Configuring HTTP pool with {config.pool_maxsize} connections per host"
+    )
+    _config = config
+    _requests_session = _create_requests_session(config)
+    _network_session = NetworkSession(
+        network_client=BoxNetworkClient(requests_session=_requests_session)
+    )
+    _async_clients.clear()
+
+
+def get_http_config() -> HttpConfig:
+    """Return the configuration of the shared pools."""
+    return _config
+
+
+def async_reads_enabled() -> bool:
+    """Whether read tools use the native asyncio client."""
+    return _config.async_reads
+
+
+def _http2_enabled() -> bool:
+    if not _config.http2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning(
+            "HTTP/2 requested but the h2 package is not installed, using HTTP/1.1"
+        )
+        return False
+    return True
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the asyncio HTTP client of the running event loop.
+
+    The client keeps a keep-alive pool of up to pool_maxsize connections per
+    host and negotiates HTTP/2 when enabled.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            http2=_http2_enabled(),
+            limits=httpx.Limits(
+                max_connections=_config.pool_maxsize * _config.pool_connections,
+                max_keepalive_connections=_config.pool_maxsize,
+            ),
+            timeout=httpx.Timeout(60.0, connect=10.0),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def close_async_client() -> None:
+    """Close the asyncio HTTP client of the running event loop, if any."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def get_requests_session() -> requests.Session:
+    """Return the requests session holding the shared connection pool."""
+    return _requests_session
+
+
+def get_network_session() -> NetworkSession:
+    """
+    Return the Box SDK network session backed by the shared connection pool.
+
+    Pass it to every BoxClient so TLS connections to api.box.com are reused
+    across clients and auth modes.
+    """
+    return _network_session
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Return connection statistics of the shared pool."""
+    hosts = 0
+    connections_opened = 0
+    requests_sent = 0
+    idle_connections = 0
+    adapter = _requests_session.get_adapter("https://")
+    pools = adapter.poolmanager.pools
+    for key in list(pools.keys()):
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        hosts += 1
+        connections_opened += pool.num_connections
+        requests_sent += pool.num_requests
+        if pool.pool is not None:
+            # The queue is padded with None placeholders for unopened slots
+            idle_connections += sum(conn is not None for conn in list(pool.pool.queue))
+    return {
+        "hosts": hosts,
+        "pool_maxsize": _config.pool_maxsize,
+        "connections_opened": connections_opened,
+        "idle_connections": idle_connections,
+        "requests": requests_sent,
+    }
+
+
+register_metrics("http_pool", get_pool_stats)
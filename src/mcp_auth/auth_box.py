@@ -1,52 +1,40 @@
 import logging
 from typing import Optional
 
-from fastapi import status
 from starlette.responses import JSONResponse
 
+from mcp_auth.auth_header import (
+    BEARER_PREFIX,
+    INVALID_SCHEME_RESPONSE,
+    MISSING_HEADER_RESPONSE,
+    get_authorization_header,
+)
+
 logger = logging.getLogger(__name__)
 
 
 def box_auth_validate_token(scope) -> Optional[JSONResponse]:
-    """Validate if the auth token is properly configured."""
-
-    path = scope["path"]
-    logger.debug(f"Token validation processing: {scope['method']} {path}")
+    """
+    Check that the request carries a Bearer token for the Box client.
 
-    # Extract authorization header
-    headers = dict(scope.get("headers", []))
-    auth_header = headers.get(b"authorization", b"").decode("utf-8")
+    The token is stored in scope["oauth_token"] for use in request handlers.
 
-    # Validate authentication
-    response = None
+    Args:
+        scope: ASGI scope containing request information
 
+    Returns:
+        Optional[JSONResponse]: Error response if validation fails, None if successful
+    """
+    auth_header = get_authorization_header(scope)
     if not auth_header:
         logger.warning(
-            f"[Token] Missing authorization header for {scope['method']} {path}"
-        )
-        response = JSONResponse(
-            content={
-                "error": "invalid_request",
-                "error_description": "Missing Authorization header",
-            },
-            status_code=status.HTTP_401_UNAUTHORIZED,
+            f"[Token] Missing authorization header for {scope['method']} {scope['path']}"
         )
-    elif not auth_header.startswith("Bearer "):
-        logger.warning("[Token] Invalid authorization header format")
-        response = JSONResponse(
-            content={
-                "error": "invalid_request",
-                "error_description": "Authorization header must use Bearer scheme",
-            },
-            status_code=status.HTTP_401_UNAUTHORIZED,
-        )
-    else:
-        token = auth_header.replace("Bearer ", "")
+        return MISSING_HEADER_RESPONSE
 
-        logger.debug(f"Token is present for {scope['method']} {path}")
-        logger.debug("A box client will be created using the provided token.")
-        # Store the OAuth token in the scope for use in request handlers
-        scope["oauth_token"] = token
-        return None
+    if not auth_header.startswith(BEARER_PREFIX):
+        logger.warning("[Token] Invalid authorization header format")
+        return INVALID_SCHEME_RESPONSE
 
-    return response
+    scope["oauth_token"] = auth_header[len(BEARER_PREFIX) :].decode("utf-8")
+    return None
@@ -11,9 +11,33 @@ from box_sdk_gen import (
     FileWithInMemoryCacheTokenStorage,
     JWTConfig,
     OAuthConfig,
+    TokenStorage,
 )
 
 from config import BoxApiConfig
+from http_pool import get_network_session
+from mcp_auth.token_storage import (
+    SharedFileTokenStorage,
+    SharedTokenCCGAuth,
+    SharedTokenJWTAuth,
+)
+
+
+def get_service_token_storage(config: "BoxApiConfig", name: str) -> TokenStorage:
+    """
+    Get the token storage of a CCG or JWT service account.
+
+    Args:
+        config: BoxApiConfig with the shared_token_store setting
+        name: Base name of the token file, e.g. ".auth.ccg.enterprise.12345"
+
+    Returns:
+        TokenStorage: A storage shared by all worker processes when
+        shared_token_store is set, otherwise a per-process storage
+    """
+    if config.shared_token_store:
+        return SharedFileTokenStorage(f"{name}.json")
+    return FileWithInMemoryCacheTokenStorage(name)
 
 
 def get_oauth_config(config: "BoxApiConfig") -> OAuthConfig:
@@ -58,7 +82,9 @@ def get_oauth_client(config: "BoxApiConfig") -> BoxClient:
     """
     conf = get_oauth_config(config)
     auth = BoxOAuth(conf)
-    return add_extra_header_to_box_client(BoxClient(auth))
+    return add_extra_header_to_box_client(
+        BoxClient(auth, network_session=get_network_session())
+    )
 
 
 def get_ccg_config(config: "BoxApiConfig") -> CCGConfig:
@@ -97,8 +123,8 @@ def get_ccg_config(config: "BoxApiConfig") -> CCGConfig:
         client_secret=config.client_secret,
         enterprise_id=enterprise_id,
         user_id=user_id,
-        token_storage=FileWithInMemoryCacheTokenStorage(
-            f".auth.ccg.{config.subject_type}.{config.subject_id}"
+        token_storage=get_service_token_storage(
+            config, f".auth.ccg.{config.subject_type}.{config.subject_id}"
         ),
     )
 
@@ -114,8 +140,13 @@ def get_ccg_client(config: "BoxApiConfig") -> BoxClient:
         BoxClient: Authenticated Box client
     """
     conf = get_ccg_config(config)
-    auth = BoxCCGAuth(conf)
-    return add_extra_header_to_box_client(BoxClient(auth))
+    if isinstance(conf.token_storage, SharedFileTokenStorage):
+        auth = SharedTokenCCGAuth(conf)
+    else:
+        auth = BoxCCGAuth(conf)
+    return add_extra_header_to_box_client(
+        BoxClient(auth, network_session=get_network_session())
+    )
 
 
 def get_jwt_config(config: "BoxApiConfig") -> JWTConfig:
@@ -189,8 +220,8 @@ def get_jwt_config_from_env(config: "BoxApiConfig") -> JWTConfig:
         private_key_passphrase=config.private_key_passphrase,
         enterprise_id=enterprise_id,
         user_id=user_id,
-        token_storage=FileWithInMemoryCacheTokenStorage(
-            f".auth.jwt.{config.subject_type}.{config.subject_id}"
+        token_storage=get_service_token_storage(
+            config, f".auth.jwt.{config.subject_type}.{config.subject_id}"
         ),
     )
 
@@ -236,8 +267,8 @@ def get_jwt_config_from_file(config: "BoxApiConfig") -> JWTConfig:
 
     jwt_config = JWTConfig.from_config_json_string(
         config_json_string=json.dumps(jwt_file_config),
-        token_storage=FileWithInMemoryCacheTokenStorage(
-            f".auth.jwt.{subject_type}.{subject_id}"
+        token_storage=get_service_token_storage(
+            config, f".auth.jwt.{subject_type}.{subject_id}"
         ),
     )
 
@@ -263,13 +294,18 @@ def get_jwt_client(config: "BoxApiConfig") -> BoxClient:
         BoxClient: Authenticated Box client
     """
     conf = get_jwt_config(config)
-    auth = BoxJWTAuth(conf)
+    if isinstance(conf.token_storage, SharedFileTokenStorage):
+        auth = SharedTokenJWTAuth(conf)
+    else:
+        auth = BoxJWTAuth(conf)
 
     # Box API does not seem to recognize the JWT client with user vs enterprise set
     # refreshing the token seems to fix this issue
-    auth.refresh_token()
+    auth.refresh_token(network_session=get_network_session())
 
-    return add_extra_header_to_box_client(BoxClient(auth))
+    return add_extra_header_to_box_client(
+        BoxClient(auth, network_session=get_network_session())
+    )
 
 
 def add_extra_header_to_box_client(box_client: BoxClient) -> BoxClient:
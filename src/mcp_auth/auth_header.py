@@ -0,0 +1,59 @@
+"""Authorization header parsing and prebuilt error responses shared by the auth checks."""
+
+from typing import Optional
+
+from fastapi import status
+from starlette.responses import JSONResponse
+
+BEARER_PREFIX = b"Bearer "
+
+WWW_AUTHENTICATE_HEADERS = {
+    "WWW-Authenticate": 'Bearer realm="OAuth", resource_metadata="/.well-known/oauth-protected-resource"'
+}
+
+
+def _error_response(status_code: int, error: str, description: str) -> JSONResponse:
+    return JSONResponse(
+        content={"error": error, "error_description": description},
+        status_code=status_code,
+        headers=WWW_AUTHENTICATE_HEADERS,
+    )
+
+
+# Built once and sent as is, responses are not modified after construction
+MISSING_HEADER_RESPONSE = _error_response(
+    status.HTTP_401_UNAUTHORIZED, "invalid_request", "Missing Authorization header"
+)
+INVALID_SCHEME_RESPONSE = _error_response(
+    status.HTTP_401_UNAUTHORIZED,
+    "invalid_request",
+    "Authorization header must use Bearer scheme",
+)
+INVALID_TOKEN_RESPONSE = _error_response(
+    status.HTTP_401_UNAUTHORIZED,
+    "invalid_token",
+    "The access token is invalid or expired",
+)
+NOT_CONFIGURED_RESPONSE = _error_response(
+    status.HTTP_500_INTERNAL_SERVER_ERROR,
+    "invalid_token",
+    "Server authentication not properly configured",
+)
+
+
+def get_authorization_header(scope) -> Optional[bytes]:
+    """
+    Return the raw Authorization header of an ASGI request.
+
+    Scans the header list instead of building a dict of all headers.
+
+    Args:
+        scope: ASGI scope containing request information
+
+    Returns:
+        Optional[bytes]: Header value, None if the header is missing
+    """
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            return value
+    return None
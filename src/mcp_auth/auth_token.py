@@ -1,18 +1,34 @@
+import hmac
 import logging
+from functools import lru_cache
 from typing import Optional
 
-from fastapi import status
 from starlette.responses import JSONResponse
 
 from config import McpAuthConfig
+from mcp_auth.auth_header import (
+    BEARER_PREFIX,
+    INVALID_SCHEME_RESPONSE,
+    INVALID_TOKEN_RESPONSE,
+    MISSING_HEADER_RESPONSE,
+    NOT_CONFIGURED_RESPONSE,
+    get_authorization_header,
+)
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _encode_token(token: str) -> bytes:
+    return token.encode("utf-8")
+
+
 def auth_validate_token(scope, config: "McpAuthConfig") -> Optional[JSONResponse]:
     """
     Validate if the auth token is properly configured.
 
+    The token is compared in constant time.
+
     Args:
         scope: ASGI scope containing request information
         config: McpAuthConfig containing the expected auth token
@@ -20,63 +36,25 @@ def auth_validate_token(scope, config: "McpAuthConfig") -> Optional[JSONResponse
     Returns:
         Optional[JSONResponse]: Error response if validation fails, None if successful
     """
-
-    path = scope["path"]
-    logger.debug(f"Token validation processing: {scope['method']} {path}")
-
     expected_token = config.auth_token
-
-    # Extract authorization header
-    headers = dict(scope.get("headers", []))
-    auth_header = headers.get(b"authorization", b"").decode("utf-8")
-
-    # Validate authentication
-    response = None
-
     if not expected_token:
         logger.error("BOX_MCP_SERVER_AUTH_TOKEN not configured")
-        response = JSONResponse(
-            content={
-                "error": "invalid_token",
-                "error_description": "Server authentication not properly configured",
-            },
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
-    elif not auth_header:
+        return NOT_CONFIGURED_RESPONSE
+
+    auth_header = get_authorization_header(scope)
+    if not auth_header:
         logger.warning(
-            f"[Token] Missing authorization header for {scope['method']} {path}"
-        )
-        response = JSONResponse(
-            content={
-                "error": "invalid_request",
-                "error_description": "Missing Authorization header",
-            },
-            status_code=status.HTTP_401_UNAUTHORIZED,
+            f"[Token] Missing authorization header for {scope['method']} {scope['path']}"
         )
-    elif not auth_header.startswith("Bearer "):
+        return MISSING_HEADER_RESPONSE
+
+    if not auth_header.startswith(BEARER_PREFIX):
         logger.warning("[Token] Invalid authorization header format")
-        response = JSONResponse(
-            content={
-                "error": "invalid_request",
-                "error_description": "Authorization header must use Bearer scheme",
-            },
-            status_code=status.HTTP_401_UNAUTHORIZED,
-        )
-    else:
-        token = auth_header.replace("Bearer ", "")
-        if token != expected_token:
-            logger.warning(f"[Token] Invalid token for {scope['method']} {path}")
-            response = JSONResponse(
-                content={
-                    "error": "invalid_token",
-                    "error_description": "The access token is invalid or expired",
-                },
-                status_code=status.HTTP_401_UNAUTHORIZED,
-            )
-        else:
-            logger.debug(
-                f"[Token] Token authentication successful for {scope['method']} {path}"
-            )
-            return None
+        return INVALID_SCHEME_RESPONSE
+
+    token = auth_header[len(BEARER_PREFIX) :]
+    if not hmac.compare_digest(token, _encode_token(expected_token)):
+        logger.warning(f"[Token] Invalid token for {scope['method']} {scope['path']}")
+        return INVALID_TOKEN_RESPONSE
 
-    return response
+    return None
@@ -0,0 +1,203 @@
+"""Background refresh of CCG and JWT access tokens."""
+
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from box_sdk_gen import Authentication
+
+from config import TokenRefreshConfig
+from http_pool import get_network_session
+from mcp_auth.token_storage import SharedFileTokenStorage
+from metrics import register_metrics
+
+logger = logging.getLogger(__name__)
+
+
+class TokenRefresher:
+    """
+    Refresh the access token of a service account before it expires.
+
+    The new token is written to the token storage of the auth object, which
+    the Box client reads on every request, so tool calls never wait on a
+    token fetch.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        auth: Authentication,
+        config: TokenRefreshConfig,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.name = name
+        self.auth = auth
+        self.config = config
+        self._clock = clock
+        self._expires_at: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._consecutive_failures = 0
+        self.refreshes = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def token_refreshed(self) -> None:
+        """Record that the token in storage was fetched just now."""
+        storage = self.auth.token_storage
+        if isinstance(storage, SharedFileTokenStorage):
+            self._expires_at = storage.expires_at()
+            return
+        token = storage.get()
+        if token is not None and token.expires_in:
+            self._expires_at = self._clock() + token.expires_in
+
+    def _adopt_shared_token(self) -> bool:
+        """Use a token another worker process stored, if it is still fresh."""
+        storage = self.auth.token_storage
+        if not isinstance(storage, SharedFileTokenStorage):
+            return False
+        expires_at = storage.expires_at()
+        if expires_at is None:
+            return False
+        if self._expires_at is not None and expires_at <= self._expires_at:
+            return False
+        if expires_at - self._clock() <= self.config.refresh_margin:
+            return False
+        self._expires_at = expires_at
+        self._consecutive_failures = 0
+        logger.debug(f"Using {self.name} token refreshed by another worker")
+        return True
+
+    def refresh(self) -> None:
+        """Fetch a new access token and store it."""
+        if self._adopt_shared_token():
+            return
+        token = self.auth.refresh_token(network_session=get_network_session())
+        storage = self.auth.token_storage
+        expires_at = None
+        if isinstance(storage, SharedFileTokenStorage):
+            # Another worker may have fetched the returned token a while ago
+            expires_at = storage.expires_at()
+        if expires_at is None:
+            expires_at = self._clock() + (token.expires_in or 0)
+        self._expires_at = expires_at
+        self.refreshes += 1
+        self._consecutive_failures = 0
+        logger.debug(f"Refreshed {self.name} token, expires in {token.expires_in}s")
+
+    def seconds_until_expiry(self) -> Optional[float]:
+        """Seconds until the current token expires, None if unknown."""
+        if self._expires_at is None:
+            return None
+        return self._expires_at - self._clock()
+
+    def next_delay(self) -> float:
+        """Seconds to wait before the next refresh."""
+        if self._consecutive_failures:
+            backoff = min(
+                self.config.max_backoff,
+                self.config.min_backoff * 2 ** (self._consecutive_failures - 1),
+            )
+            return backoff * random.uniform(0.5, 1.0)
+
+        remaining = self.seconds_until_expiry()
+        if remaining is None:
+            return 0.0
+        margin = self.config.refresh_margin
+        # Short lived tokens are refreshed half way through their lifetime
+        delay = remaining - margin if remaining > 2 * margin else remaining / 2
+        return max(0.0, delay * (1 - random.uniform(0, self.config.jitter)))
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.next_delay()):
+            try:
+                self.refresh()
+            except Exception as e:
+                self.failures += 1
+                self._consecutive_failures += 1
+                self.last_error = str(e)
+                logger.warning(f"Failed to refresh {self.name} token: {e}")
+
+    def start(self) -> None:
+        """Start refreshing in a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"token-refresh-{self.name}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the refresh thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return refresh statistics."""
+        return {
+            "seconds_until_expiry": self.seconds_until_expiry(),
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "last_error": self.last_error,
+            "running": self._thread is not None and self._thread.is_alive(),
+        }
+
+
+# Lifespans may run once per request, so refreshers are process wide
+_refreshers: Dict[str, TokenRefresher] = {}
+_refreshers_lock = threading.Lock()
+
+
+def start_token_refresher(
+    name: str,
+    auth: Authentication,
+    config: TokenRefreshConfig,
+    token_fetched: bool = False,
+) -> TokenRefresher:
+    """
+    Start the background refresher for a service account, once per process.
+
+    Args:
+        name: Key of the service account, e.g. "ccg.enterprise.12345"
+        auth: Auth object of the Box client
+        config: TokenRefreshConfig with margin, jitter and backoff
+        token_fetched: Whether the token in storage was fetched just now,
+            otherwise the first refresh happens immediately
+
+    Returns:
+        TokenRefresher: The running refresher
+    """
+    with _refreshers_lock:
+        refresher = _refreshers.get(name)
+        if refresher is None:
+            refresher = TokenRefresher(name, auth, config)
+            if token_fetched:
+                refresher.token_refreshed()
+            _refreshers[name] = refresher
+            logger.info(f"Starting background token refresh for {name}")
+        refresher.start()
+        return refresher
+
+
+def stop_token_refreshers() -> None:
+    """Stop and forget all background refreshers."""
+    with _refreshers_lock:
+        refreshers = list(_refreshers.values())
+        _refreshers.clear()
+    for refresher in refreshers:
+        refresher.stop()
+
+
+def get_token_refresh_stats() -> Dict[str, Any]:
+    """Return the statistics of every refresher, keyed by name."""
+    with _refreshers_lock:
+        return {name: r.stats() for name, r in _refreshers.items()}
+
+
+register_metrics("token_refresh", get_token_refresh_stats)
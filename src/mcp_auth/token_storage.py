@@ -0,0 +1,178 @@
+"""Token storage shared by the worker processes of one server."""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from box_sdk_gen import (
+    AccessToken,
+    BoxCCGAuth,
+    BoxJWTAuth,
+    NetworkSession,
+    TokenStorage,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+
+class SharedFileTokenStorage(TokenStorage):
+    """
+    Token storage in a JSON file that several processes can share.
+
+    Tokens are written to a temporary file and moved over the storage file,
+    so readers never see a partial write. The file also records when the
+    token was fetched, so every process knows when it expires. lock() takes
+    an exclusive lock on a separate lock file to coordinate token fetches.
+    """
+
+    def __init__(self, filename: str, clock=time.time):
+        self.filename = filename
+        self.lock_filename = f"{filename}.lock"
+        self._clock = clock
+        self._thread_lock = threading.Lock()
+        self._cache_lock = threading.Lock()
+        self._cached_stat: Optional[tuple] = None
+        self._cached_entry: Optional[dict] = None
+
+    def _read_entry(self) -> Optional[dict]:
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+
+        # Re-read the file only after another process replaced it
+        key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._cache_lock:
+            if key != self._cached_stat:
+                try:
+                    with open(self.filename, "r", encoding="utf-8") as f:
+                        self._cached_entry = json.load(f)
+                except (OSError, ValueError) as e:
+                    logger.warning(
+                        f"Ignoring unreadable token file {self.filename}: {e}"
+                    )
+                    self._cached_entry = None
+                self._cached_stat = key
+            return self._cached_entry
+
+    def store(self, token: AccessToken) -> None:
+        entry = {"token": token.to_dict(), "fetched_at": self._clock()}
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=f".{os.path.basename(self.filename)}."
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self.filename)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self) -> Optional[AccessToken]:
+        entry = self._read_entry()
+        if not entry or "token" not in entry:
+            return None
+        return AccessToken.from_dict(entry["token"])
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.filename)
+        except FileNotFoundError:
+            pass
+
+    def fetched_at(self) -> Optional[float]:
+        """Time the stored token was fetched, None if unknown."""
+        entry = self._read_entry()
+        return entry.get("fetched_at") if entry else None
+
+    def expires_at(self) -> Optional[float]:
+        """Time the stored token expires, None if unknown."""
+        entry = self._read_entry()
+        if not entry or not entry.get("fetched_at"):
+            return None
+        expires_in = entry.get("token", {}).get("expires_in")
+        return entry["fetched_at"] + expires_in if expires_in else None
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold an exclusive lock shared by all processes using the file."""
+        with self._thread_lock, open(self.lock_filename, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            else:
+                f.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        # LK_LOCK gives up after about ten seconds
+                        continue
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class SharedTokenAuthMixin:
+    """
+    Fetch tokens at most once across the processes sharing a token file.
+
+    A process that needs a token takes the storage lock first. If another
+    process stored a new token while it waited, or fetched one moments ago,
+    that token is used instead of fetching another one.
+    """
+
+    token_storage: SharedFileTokenStorage
+
+    # A token fetched this recently by another process is not fetched again
+    min_refresh_interval: float = 30.0
+
+    def retrieve_token(
+        self, *, network_session: Optional[NetworkSession] = None
+    ) -> AccessToken:
+        token = self.token_storage.get()
+        if token is not None:
+            return token
+        return self.refresh_token(network_session=network_session)
+
+    def refresh_token(
+        self, *, network_session: Optional[NetworkSession] = None
+    ) -> AccessToken:
+        seen = self.token_storage.get()
+        with self.token_storage.lock():
+            current = self.token_storage.get()
+            if current is not None:
+                if seen is None or current.access_token != seen.access_token:
+                    return current
+                fetched_at = self.token_storage.fetched_at()
+                if (
+                    fetched_at is not None
+                    and time.time() - fetched_at < self.min_refresh_interval
+                ):
+                    return current
+            return super().refresh_token(network_session=network_session)
+
+
+class SharedTokenCCGAuth(SharedTokenAuthMixin, BoxCCGAuth):
+    """CCG auth that shares its token with the other worker processes."""
+
+
+class SharedTokenJWTAuth(SharedTokenAuthMixin, BoxJWTAuth):
+    """JWT auth that shares its token with the other worker processes."""
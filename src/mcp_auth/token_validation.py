@@ -0,0 +1,148 @@
+"""Validation of MCP client bearer tokens against the Box API, with caching."""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Optional
+
+import httpx
+
+from cache.ttl_cache import TTLCache
+from config import CacheConfig
+from http_pool import get_async_client, get_network_session
+from metrics import register_metrics
+from server_context import hash_token
+
+logger = logging.getLogger(__name__)
+
+
+class TokenValidator:
+    """
+    Check bearer tokens with a users/me probe and remember the outcome.
+
+    Valid tokens are cached for token_cache_ttl seconds and rejected tokens
+    for token_negative_cache_ttl seconds, so a repeated bad token is refused
+    without a Box round trip. Concurrent checks of the same token share one probe. If Box
+    cannot be reached, or answers with anything but 200 or 401, the token is
+    let through uncached and the tool call reports the actual error.
+    """
+
+    def __init__(
+        self,
+        config: CacheConfig,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.valid_tokens: TTLCache[str, bool] = TTLCache(
+            max_size=config.token_cache_max_size,
+            ttl=config.token_cache_ttl,
+            clock=clock,
+        )
+        self.invalid_tokens: TTLCache[str, bool] = TTLCache(
+            max_size=config.token_cache_max_size,
+            ttl=config.token_negative_cache_ttl,
+            clock=clock,
+        )
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.probes = 0
+        self.rejections = 0
+        self.errors = 0
+
+    async def validate(self, token: str) -> bool:
+        """
+        Return whether Box accepts the token.
+
+        Args:
+            token: Bearer token of the MCP client
+
+        Returns:
+            bool: False if Box rejected the token, True otherwise
+        """
+        key = hash_token(token)
+        if self.valid_tokens.get(key):
+            return True
+        if self.invalid_tokens.get(key):
+            self.rejections += 1
+            return False
+
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._probe(key, token))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        valid = await asyncio.shield(task)
+        if not valid:
+            self.rejections += 1
+        return valid
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        # A newer probe of the same token may have replaced this one
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def _probe(self, key: str, token: str) -> bool:
+        self.probes += 1
+        url = f"{get_network_session().base_urls.base_url}/2.0/users/me"
+        try:
+            response = await get_async_client().get(
+                url,
+                params={"fields": "id"},
+                headers={"Authorization": f"Bearer {token}"},
+                timeout=10.0,
+            )
+        except httpx.HTTPError as e:
+            self.errors += 1
+            logger.warning(f"Token validation failed, letting the request through: {e}")
+            return True
+
+        if response.status_code == 200:
+            self.valid_tokens.set(key, True)
+            return True
+        if response.status_code == 401:
+            logger.warning("[Token] Box rejected the bearer token")
+            self.invalid_tokens.set(key, True)
+            return False
+
+        self.errors += 1
+        logger.warning(
+            f"Token validation returned {response.status_code}, letting the request through"
+        )
+        return True
+
+    def invalidate(self, token: str) -> None:
+        """Forget the cached outcome for a token."""
+        key = hash_token(token)
+        self.valid_tokens.pop(key)
+        self.invalid_tokens.pop(key)
+
+    def stats(self) -> Dict[str, float]:
+        """Return the hit rates of both caches and the probe counters."""
+        valid = self.valid_tokens.stats()
+        invalid = self.invalid_tokens.stats()
+        return {
+            "valid_size": valid["size"],
+            "valid_hits": valid["hits"],
+            "valid_hit_rate": valid["hit_rate"],
+            "invalid_size": invalid["size"],
+            "invalid_hits": invalid["hits"],
+            "invalid_hit_rate": invalid["hit_rate"],
+            "probes": self.probes,
+            "rejections": self.rejections,
+            "errors": self.errors,
+        }
+
+
+_validator: Optional[TokenValidator] = None
+
+
+def get_token_validator(config: CacheConfig) -> TokenValidator:
+    """
+    Return the process wide token validator, creating it on first use.
+
+    Args:
+        config: CacheConfig with the token cache size and time to live
+    """
+    global _validator
+    if _validator is None:
+        _validator = TokenValidator(config)
+        register_metrics("token_validation", _validator.stats)
+    return _validator
@@ -11,7 +11,8 @@ from config import (
     TransportType,
     setup_logging,
 )
-from server import create_mcp_server, create_server_info_tool, register_tools
+from server import build_mcp_server
+from server_workers import run_workers
 
 # Load configuration from environment once at startup
 app_config = AppConfig.from_env()
@@ -56,6 +57,13 @@ def parse_arguments() -> argparse.Namespace:
         help=f"Authentication type for Box API (default: {app_config.server.box_auth.value})",
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=app_config.server.workers,
+        help=f"Worker processes for the http transport (default: {app_config.server.workers})",
+    )
+
     return parser.parse_args()
 
 
@@ -69,6 +77,7 @@ def main() -> int:
     app_config.server.port = args.port
     app_config.server.box_auth = args.box_auth_type
     app_config.server.mcp_auth_type = args.mcp_auth_type
+    app_config.server.workers = max(1, args.workers)
 
     # Validate and adjust config based on transport type
     # if the transport is stdio, then the mcp auth must be none
@@ -86,16 +95,26 @@ def main() -> int:
             )
         app_config.server.box_auth = BoxAuthType.MCP_CLIENT
 
-    # Create and configure MCP server
-    mcp = create_mcp_server(
-        app_config=app_config,
-    )
-
-    # Register all tools
-    register_tools(mcp)
-
-    # Register server info tool
-    create_server_info_tool(mcp, config=app_config.server)
+    # Only the stateless http transport can spread requests over processes,
+    # sse sessions live in the process that opened them
+    if app_config.server.workers > 1 and app_config.server.transport != TransportType.STREAMABLE_HTTP:
+        logger.warning(
+            f"--workers requires the http transport, running a single {app_config.server.transport.value} process."
+        )
+        app_config.server.workers = 1
+
+    if app_config.server.workers > 1:
+        try:
+            logger.info(f"Starting {app_config.server.server_name}")
+            logger.info(f"Listening on {app_config.server.host}:{app_config.server.port}")
+            run_workers(app_config)
+            return 0
+        except Exception as e:
+            logger.error(f"Error starting server: {e}")
+            return 1
+
+    # Create and configure MCP server with all tools
+    mcp = build_mcp_server(app_config)
 
     # Run server
     try:
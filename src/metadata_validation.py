@@ -0,0 +1,165 @@
+"""Validate metadata instances against a template before sending them to Box."""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+# A field check returns the value to send, or raises ValueError
+FieldCheck = Callable[[Any], Any]
+
+
+class MetadataValidationError(ValueError):
+    """A metadata instance does not match its template."""
+
+    def __init__(self, template_key: str, errors: List[str]):
+        self.template_key = template_key
+        self.errors = errors
+        super().__init__(
+            f"Invalid metadata for template {template_key}: " + "; ".join(errors)
+        )
+
+
+def _check_string(value: Any) -> str:
+    if not isinstance(value, str):
+        raise ValueError("expected a string")
+    return value
+
+
+def _check_float(value: Any) -> float:
+    if isinstance(value, bool):
+        raise ValueError("expected a number")
+    if isinstance(value, str):
+        try:
+            value = float(value.strip())
+        except ValueError:
+            raise ValueError("expected a number") from None
+    if not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError("expected a number")
+    return float(value)
+
+
+def _check_date(value: Any) -> str:
+    if not isinstance(value, str):
+        raise ValueError("expected a date")
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError:
+        raise ValueError("expected a date, e.g. 2023-10-01T00:00:00.000Z") from None
+    # Box stores dates in UTC, a date without a time zone is taken as UTC
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime("%Y-%m-%dT%H:%M:%S.") + f"{parsed.microsecond // 1000:03d}Z"
+
+
+def _option_keys(field: Dict[str, Any]) -> Tuple[str, ...]:
+    return tuple(
+        option["key"] for option in field.get("options") or [] if "key" in option
+    )
+
+
+def _enum_check(options: Tuple[str, ...]) -> FieldCheck:
+    allowed = frozenset(options)
+
+    def check(value: Any) -> str:
+        if value not in allowed:
+            raise ValueError(f"expected one of {', '.join(options)}")
+        return value
+
+    return check
+
+
+def _multi_select_check(options: Tuple[str, ...]) -> FieldCheck:
+    allowed = frozenset(options)
+
+    def check(value: Any) -> List[str]:
+        # A single option is accepted for a multi select field
+        values = [value] if isinstance(value, str) else value
+        if not isinstance(values, list) or not all(v in allowed for v in values):
+            raise ValueError(f"expected a list of {', '.join(options)}")
+        return values
+
+    return check
+
+
+_SIMPLE_CHECKS: Dict[str, FieldCheck] = {
+    "string": _check_string,
+    "float": _check_float,
+    "date": _check_date,
+}
+
+
+@dataclass(frozen=True)
+class MetadataValidator:
+    """
+    Checks of every field of a metadata template.
+
+    Built once per template with compile(), validate() then only looks up
+    one check per key of the instance.
+    """
+
+    template_key: str
+    checks: Dict[str, FieldCheck]
+
+    @classmethod
+    def compile(cls, template: Dict[str, Any]) -> "MetadataValidator":
+        """
+        Build the validator of a template definition.
+
+        Args:
+            template: Template as returned by the metadata template tools
+
+        Returns:
+            MetadataValidator: Validator of the template's fields
+        """
+        checks: Dict[str, FieldCheck] = {}
+        for field in template.get("fields") or []:
+            key = field.get("key")
+            field_type = field.get("type")
+            if not key:
+                continue
+            if field_type in _SIMPLE_CHECKS:
+                checks[key] = _SIMPLE_CHECKS[field_type]
+            elif field_type == "enum":
+                checks[key] = _enum_check(_option_keys(field))
+            elif field_type == "multiSelect":
+                checks[key] = _multi_select_check(_option_keys(field))
+            else:
+                # Types this server does not know about are left to Box
+                checks[key] = lambda value: value
+        return cls(template.get("templateKey", ""), checks)
+
+    def validate(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Check a metadata instance and coerce its values.
+
+        Numbers given as strings become floats and dates are converted to
+        the UTC format Box returns. None values are passed through.
+
+        Args:
+            metadata: Field values by field key
+
+        Returns:
+            Dict[str, Any]: The metadata with coerced values
+
+        Raises:
+            MetadataValidationError: If a key is not a field of the template
+                or a value does not match its field
+        """
+        result: Dict[str, Any] = {}
+        errors: List[str] = []
+        for key, value in metadata.items():
+            check = self.checks.get(key)
+            if check is None:
+                errors.append(f"'{key}' is not a field of the template")
+            elif value is None:
+                result[key] = None
+            else:
+                try:
+                    result[key] = check(value)
+                except ValueError as e:
+                    errors.append(f"'{key}': {e}")
+        if errors:
+            raise MetadataValidationError(self.template_key, errors)
+        return result
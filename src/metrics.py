@@ -0,0 +1,37 @@
+"""Registry of runtime statistics reported by the server."""
+
+import logging
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+MetricsProvider = Callable[[], Dict[str, Any]]
+
+_providers: Dict[str, MetricsProvider] = {}
+
+
+def register_metrics(name: str, provider: MetricsProvider) -> None:
+    """
+    Register a callable that reports a group of statistics.
+
+    Args:
+        name: Name of the group, e.g. "client_cache"
+        provider: Callable returning a dict of statistics
+    """
+    _providers[name] = provider
+
+
+def unregister_metrics(name: str) -> None:
+    """Remove a group of statistics."""
+    _providers.pop(name, None)
+
+
+def collect_metrics() -> Dict[str, Dict[str, Any]]:
+    """Return the current statistics of every registered group."""
+    metrics: Dict[str, Dict[str, Any]] = {}
+    for name, provider in list(_providers.items()):
+        try:
+            metrics[name] = provider()
+        except Exception as e:
+            logger.warning(f"Error collecting metrics for {name}: {e}")
+    return metrics
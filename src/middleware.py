@@ -1,13 +1,18 @@
 """Authentication middleware for MCP server."""
 
 import logging
+from functools import partial
+from typing import Callable, Optional
 
 from mcp.server.fastmcp import FastMCP
 from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import Response
 
 from config import AppConfig, BoxAuthType, McpAuthType, TransportType
 from mcp_auth.auth_box import box_auth_validate_token
+from mcp_auth.auth_header import INVALID_TOKEN_RESPONSE
 from mcp_auth.auth_token import auth_validate_token
+from mcp_auth.token_validation import get_token_validator
 from oauth_endpoints import add_oauth_endpoints
 
 logger = logging.getLogger(__name__)
@@ -35,11 +40,22 @@ class AuthMiddleware:
         self.app = app
         self.app_config = app_config
         self.mcp_auth_type = McpAuthType(app_config.server.mcp_auth_type)
-        self.www_header = {
-            # "WWW-Authenticate": f'Bearer realm="OAuth", resource_metadata="http://{self.app_config.server.host}:{self.app_config.server.port}/.well-known/oauth-protected-resource"'
-            # "WWW-Authenticate": f'Bearer realm="OAuth", resource_metadata="https://{self.app_config.server.host}/.well-known/oauth-protected-resource"'
-            "WWW-Authenticate": 'Bearer realm="OAuth", resource_metadata="/.well-known/oauth-protected-resource"'
-        }
+        self.validate = self._select_validator()
+        # Upstream check of the bearer token the Box client will use
+        self.token_validator = None
+        if self.validate is box_auth_validate_token and app_config.mcp_auth.validate_tokens:
+            self.token_validator = get_token_validator(app_config.cache)
+
+    def _select_validator(self) -> Optional[Callable[[dict], Optional[Response]]]:
+        """Pick the token check once, None if no authentication is required."""
+        if self.mcp_auth_type == McpAuthType.TOKEN:
+            return partial(auth_validate_token, config=self.app_config.mcp_auth)
+        if self.mcp_auth_type == McpAuthType.OAUTH:
+            return box_auth_validate_token
+        if self.app_config.server.box_auth == BoxAuthType.MCP_CLIENT:
+            # MCP auth type is NONE, but the Box client needs the caller's token
+            return box_auth_validate_token
+        return None
 
     async def __call__(self, scope, receive, send):
         """Pure ASGI middleware - handles streaming properly."""
@@ -48,45 +64,35 @@ class AuthMiddleware:
             return
 
         path = scope["path"]
-        logger.debug(f"AuthMiddleware processing: {scope['method']} {path}")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        if debug:
+            logger.debug(f"AuthMiddleware processing: {scope['method']} {path}")
 
         # Allow public OAuth discovery endpoints without authentication
         if path in self.PUBLIC_PATHS:
-            logger.debug(f"Public OAuth discovery endpoint accessed: {path}")
+            if debug:
+                logger.debug(f"Public OAuth discovery endpoint accessed: {path}")
             await self.app(scope, receive, send)
             return
 
         # If no authentication required, pass through
-        if self.mcp_auth_type == McpAuthType.NONE and self.app_config.server.box_auth != BoxAuthType.MCP_CLIENT:
-            logger.debug("MCP auth type is NONE, skipping authentication")
+        if self.validate is None:
             await self.app(scope, receive, send)
             return
 
-        error_response = None
-
-        if self.mcp_auth_type == McpAuthType.NONE and self.app_config.server.box_auth == BoxAuthType.MCP_CLIENT:
-            logger.debug("MCP auth type is NONE, box auth type is MCP_CLIENT, skipping expecting an authorization header")
-            error_response = box_auth_validate_token(scope=scope)
-
-        if self.mcp_auth_type == McpAuthType.TOKEN:
-            logger.debug("MCP auth type is TOKEN, performing token authentication")
-            error_response = auth_validate_token(scope=scope, config=self.app_config.mcp_auth)
-
-        if self.mcp_auth_type == McpAuthType.OAUTH:
-            logger.debug("MCP auth type is OAUTH, performing OAuth authentication")
-            error_response = box_auth_validate_token(scope=scope)
-
-        # If there's an error, send error response
+        error_response = self.validate(scope)
+        if error_response is None and self.token_validator is not None:
+            if not await self.token_validator.validate(scope["oauth_token"]):
+                error_response = INVALID_TOKEN_RESPONSE
         if error_response is not None:
-            # add headers to response
-            error_response.headers.update(self.www_header)
             await error_response(scope, receive, send)
             return
 
         # Authentication successful, pass to next layer
-        logger.debug(
-            f"[Middleware]Authentication successful for {scope['method']} {path}"
-        )
+        if debug:
+            logger.debug(
+                f"[Middleware]Authentication successful for {scope['method']} {path}"
+            )
         await self.app(scope, receive, send)
 
 
@@ -1,19 +1,43 @@
 """OAuth 2.1 discovery endpoints for MCP server."""
 
-import json
 import logging
 from datetime import datetime, timezone
-from pathlib import Path
+from typing import Dict
 
 from fastapi import Request
-from httpx import AsyncClient
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 
+from cache.json_file_cache import JsonFileCache, JsonFileEntry
+from cache.oauth_metadata import AuthorizationServerMetadataCache
 from config import AppConfig
+from metrics import register_metrics
 
 logger = logging.getLogger(__name__)
 
 
+# Parsed protected resource config files, keyed by path
+_metadata_files: Dict[str, JsonFileCache] = {}
+
+
+def get_protected_resource_metadata(config_file: str) -> JsonFileEntry:
+    """
+    Get the OAuth Protected Resource Metadata with its serialized response body.
+
+    The file is parsed once and parsed again only after it changed.
+
+    Args:
+        config_file: Path to the OAuth protected resource config file
+
+    Returns:
+        JsonFileEntry: Metadata, response body and ETag; empty if the file is
+        missing or invalid
+    """
+    cache = _metadata_files.get(config_file)
+    if cache is None:
+        cache = _metadata_files.setdefault(config_file, JsonFileCache(config_file))
+    return cache.get()
+
+
 def load_protected_resource_metadata(config_file: str) -> dict:
     """
     Load OAuth Protected Resource Metadata from configuration file.
@@ -24,25 +48,7 @@ def load_protected_resource_metadata(config_file: str) -> dict:
     Returns:
         dict: OAuth Protected Resource metadata
     """
-    config_path = Path(config_file)
-
-    if not config_path.exists():
-        logger.error(
-            f"OAuth Protected Resource config file not found: {config_path.absolute()}"
-        )
-        return {}
-
-    try:
-        with open(config_path, "r") as f:
-            metadata = json.load(f)
-            logger.info(f"Loaded OAuth Protected Resource metadata from {config_path}")
-            return metadata
-    except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in OAuth config file {config_path}: {e}")
-        return {}
-    except Exception as e:
-        logger.error(f"Error loading OAuth config file {config_path}: {e}")
-        return {}
+    return get_protected_resource_metadata(config_file).data
 
 
 def create_oauth_protected_resource_handler(app_config: AppConfig):
@@ -68,11 +74,11 @@ def create_oauth_protected_resource_handler(app_config: AppConfig):
                 },
             )
 
-        metadata = load_protected_resource_metadata(
+        metadata = get_protected_resource_metadata(
             app_config.mcp_auth.oauth_protected_resources_config_file
         )
 
-        if not metadata:
+        if not metadata.data:
             return JSONResponse(
                 status_code=500,
                 content={
@@ -84,14 +90,20 @@ def create_oauth_protected_resource_handler(app_config: AppConfig):
                 },
             )
 
-        return JSONResponse(
+        headers = {
+            "Cache-Control": "public, max-age=3600",  # Cache for 1 hour
+            "Access-Control-Allow-Origin": "*",
+            "ETag": metadata.etag,
+        }
+
+        # The client already has the current metadata
+        if metadata.etag in request.headers.get("if-none-match", ""):
+            return Response(status_code=304, headers=headers)
+
+        return Response(
             status_code=200,
-            content=metadata,
-            headers={
-                "Content-Type": "application/json",
-                "Cache-Control": "public, max-age=3600",  # Cache for 1 hour
-                "Access-Control-Allow-Origin": "*",
-            },
+            content=metadata.body,
+            headers={"Content-Type": "application/json", **headers},
         )
 
     return oauth_protected_resource_handler
@@ -132,42 +144,86 @@ async def openid_configuration_handler(request: Request) -> JSONResponse:
     )
 
 
+def merge_authorization_server_metadata(box_metadata: dict, metadata: dict) -> dict:
+    """
+    Extend Box's authorization server metadata for MCP clients.
+
+    Args:
+        box_metadata: Box's OAuth authorization server metadata
+        metadata: OAuth protected resource metadata of this server
+
+    Returns:
+        dict: A copy of box_metadata with registration_endpoint and
+        scopes_supported added when missing
+    """
+    merged = dict(box_metadata)
+
+    # Add registration_endpoint if missing
+    if "registration_endpoint" not in merged:
+        merged["registration_endpoint"] = (
+            f"{metadata.get('resource', '').rstrip('/mcp').rstrip('/sse').rstrip('/')}/oauth/register"
+        )
+
+    # Add scopes_supported from protected resource metadata if not included in the box_metadata
+    if "scopes_supported" not in merged and "scopes_supported" in metadata:
+        merged["scopes_supported"] = metadata["scopes_supported"]
+
+    return merged
+
+
 def create_oauth_authorization_server_handler(app_config: AppConfig):
     """Create handler with app_config closure."""
-    async def oauth_authorization_server_handler(request: Request) -> JSONResponse:
+    metadata_cache = AuthorizationServerMetadataCache(
+        url=app_config.mcp_auth.oauth_authorization_server_metadata_url,
+        ttl=app_config.cache.oauth_metadata_ttl,
+        max_stale=app_config.cache.oauth_metadata_max_stale,
+    )
+    register_metrics("oauth_metadata", metadata_cache.stats)
+
+    # Serialized response of the last merge, keyed by its inputs
+    merged_response: dict = {"key": None, "body": b""}
+
+    async def oauth_authorization_server_handler(request: Request) -> Response:
         """
         This end point provides works around the Box API not having dynamic client registration
         It first gets the Box's metadata from https://account.box.com/.well-known/oauth-authorization-server
         and if the returned json it does not contain the "registration_endpoint" field, it adds it to the response.
         This "registration_endpoint" field is required for dynamic client registration, and will point to another endpoint
         in this server that will handle client registration.
+
+        Box's metadata is cached in memory and the merged response is only
+        serialized again when Box's metadata or the protected resource
+        metadata changes.
         """
         # Get Box's OAuth Authorization Server metadata
-
-        async with AsyncClient() as client:
-            box_response = await client.get(
-                "https://account.box.com/.well-known/oauth-authorization-server"
+        try:
+            box_metadata = await metadata_cache.get()
+        except Exception as e:
+            logger.error(f"Box OAuth Authorization Server metadata unavailable: {e}")
+            return JSONResponse(
+                status_code=502,
+                content={
+                    "error": "server_error",
+                    "error_description": "OAuth Authorization Server metadata unavailable",
+                },
+                headers={
+                    "Access-Control-Allow-Origin": "*",
+                },
             )
-        box_metadata = box_response.json()
-        metadata = load_protected_resource_metadata(
+
+        metadata = get_protected_resource_metadata(
             app_config.mcp_auth.oauth_protected_resources_config_file
         )
 
-        # logger.debug(f"Box OAuth Authorization Server metadata: {request}")
-
-        # Add registration_endpoint if missing
-        if "registration_endpoint" not in box_metadata:
-            box_metadata["registration_endpoint"] = (
-                f"{metadata.get('resource', '').rstrip('/mcp').rstrip('/sse').rstrip('/')}/oauth/register"
-            )
-
-        # Add scopes_supported from protected resource metadata if not included in the box_metadata
-        if "scopes_supported" not in box_metadata and "scopes_supported" in metadata:
-            box_metadata["scopes_supported"] = metadata["scopes_supported"]
+        key = (metadata_cache.generation, metadata.etag)
+        if merged_response["key"] != key:
+            merged = merge_authorization_server_metadata(box_metadata, metadata.data)
+            merged_response["body"] = JSONResponse(content=merged).body
+            merged_response["key"] = key
 
-        return JSONResponse(
+        return Response(
             status_code=200,
-            content=box_metadata,
+            content=merged_response["body"],
             headers={
                 "Content-Type": "application/json",
                 "Cache-Control": "public, max-age=3600",  # Cache for 1 hour
@@ -5,13 +5,25 @@ from pathlib import Path
 import tomli
 from mcp.server.fastmcp import FastMCP
 
+from cache.content_index import configure_content_index
+from cache.folder_mirror import configure_folder_mirror
+from cache.group_index import configure_group_index
+from cache.metadata_instances import configure_metadata_instance_cache
+from cache.metadata_templates import configure_metadata_template_cache
+from cache.path_resolver import configure_path_resolver
+from cache.response_cache import configure_response_cache
+from cache.user_directory import configure_user_directory
 from config import AppConfig, ServerConfig, TransportType
+from executor import configure_executor
+from http_pool import configure_http_pool
+from metrics import collect_metrics
 from middleware import add_auth_middleware
 from server_context import (
     box_lifespan_ccg,
     box_lifespan_jwt,
     box_lifespan_mcp_oauth,
     box_lifespan_oauth,
+    configure_client_cache,
 )
 from tool_registry import register_all_tools
 from tool_registry.ai_tools import register_ai_tools
@@ -53,16 +65,33 @@ def create_mcp_server(
         FastMCP: Configured MCP server instance
     """
 
+    # Size the worker pool, connection pool and caches shared by all sessions
+    configure_executor(app_config.executor)
+    configure_http_pool(app_config.http)
+    configure_client_cache(app_config.cache)
+    configure_response_cache(app_config.cache)
+    configure_metadata_template_cache(app_config.cache)
+    configure_metadata_instance_cache(app_config.cache)
+    configure_user_directory(app_config.cache)
+    configure_group_index(app_config.cache)
+    configure_folder_mirror(app_config.cache)
+    configure_path_resolver(app_config.cache)
+    configure_content_index(app_config.cache)
+
     # Select appropriate lifespan based on auth type
     if app_config.server.box_auth == "oauth":
         def lifespan(server):
             return box_lifespan_oauth(server, app_config.box_api)
     elif app_config.server.box_auth == "ccg":
         def lifespan(server):
-            return box_lifespan_ccg(server, app_config.box_api)
+            return box_lifespan_ccg(
+                server, app_config.box_api, app_config.token_refresh
+            )
     elif app_config.server.box_auth == "jwt":
         def lifespan(server):
-            return box_lifespan_jwt(server, app_config.box_api)
+            return box_lifespan_jwt(
+                server, app_config.box_api, app_config.token_refresh
+            )
     elif app_config.server.box_auth == "mcp_client":
         lifespan = box_lifespan_mcp_oauth
     else:
@@ -85,6 +114,22 @@ def create_mcp_server(
     return mcp
 
 
+def build_mcp_server(app_config: AppConfig) -> FastMCP:
+    """
+    Create the MCP server with all tools registered.
+
+    Args:
+        app_config: Complete application configuration
+
+    Returns:
+        FastMCP: MCP server ready to run
+    """
+    mcp = create_mcp_server(app_config=app_config)
+    register_tools(mcp)
+    create_server_info_tool(mcp, config=app_config.server)
+    return mcp
+
+
 def register_tools(mcp: FastMCP) -> None:
     """Register all tools with the MCP server."""
     register_all_tools(
@@ -127,5 +172,8 @@ def create_server_info_tool(
         if config.transport != TransportType.STDIO.value:
             info["host"] = config.host
             info["port"] = str(config.port)
+            info["workers"] = config.workers
+
+        info["metrics"] = collect_metrics()
 
         return info
@@ -1,37 +1,144 @@
+import hashlib
 import logging
+import threading
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import AsyncIterator
+from typing import AsyncIterator, Callable, Dict
 
 from box_sdk_gen import BoxClient, BoxDeveloperTokenAuth
 from mcp.server.fastmcp import FastMCP
 from starlette.requests import Request
 
-from config import BoxApiConfig
+from cache.content_index import get_content_index
+from cache.folder_mirror import get_folder_mirror
+from cache.ttl_cache import TTLCache
+from cache.user_directory import get_user_directory
+from config import BoxApiConfig, CacheConfig, TokenRefreshConfig
+from http_pool import get_network_session
 
 # from box_ai_agents_toolkit import BoxClient, get_ccg_client,get_oauth_client, get_jwt_client
 from mcp_auth.auth_box_api import get_ccg_client, get_jwt_client, get_oauth_client
+from mcp_auth.token_refresh import start_token_refresher
+from metrics import register_metrics
 
 logger = logging.getLogger(__name__)
 
+# Box clients created from MCP client bearer tokens, keyed by token hash.
+# Lifespan contexts may be created per request, so the cache is process wide.
+_client_cache: TTLCache[str, BoxClient] = TTLCache(
+    max_size=CacheConfig.client_cache_max_size, ttl=CacheConfig.client_cache_ttl
+)
+register_metrics("client_cache", lambda: _client_cache.stats())
+
+# Enterprise key of each MCP client bearer token, keyed by token hash
+_enterprise_cache: TTLCache[str, str] = TTLCache(
+    max_size=CacheConfig.client_cache_max_size, ttl=CacheConfig.client_cache_ttl
+)
+
+
+def configure_client_cache(config: CacheConfig) -> None:
+    """
+    Replace the per-token Box client and enterprise caches.
+
+    Args:
+        config: CacheConfig with the client cache size and time to live
+    """
+    global _client_cache, _enterprise_cache
+    _client_cache = TTLCache(
+        max_size=config.client_cache_max_size, ttl=config.client_cache_ttl
+    )
+    _enterprise_cache = TTLCache(
+        max_size=config.client_cache_max_size, ttl=config.client_cache_ttl
+    )
+
+
+def get_client_cache() -> TTLCache[str, BoxClient]:
+    """Return the per-token Box client cache."""
+    return _client_cache
+
+
+def get_enterprise_cache() -> TTLCache[str, str]:
+    """Return the enterprise key of each token hash, see get_caller_enterprise."""
+    return _enterprise_cache
+
+
+# CCG and JWT clients, keyed by auth type and subject, created once per process
+_service_clients: Dict[str, BoxClient] = {}
+_service_clients_lock = threading.Lock()
+
+
+def get_service_client(
+    key: str,
+    factory: Callable[[], BoxClient],
+    refresh_config: TokenRefreshConfig | None = None,
+    token_fetched: bool = False,
+) -> BoxClient:
+    """
+    Get the process wide client of a service account, creating it on first use.
+
+    Args:
+        key: Auth type and subject, e.g. "ccg.enterprise.12345"
+        factory: Creates the client
+        refresh_config: Starts a background token refresher when enabled
+        token_fetched: Whether the factory fetches a token itself
+
+    Returns:
+        BoxClient: The shared client
+    """
+    with _service_clients_lock:
+        client = _service_clients.get(key)
+        if client is None:
+            client = factory()
+            _service_clients[key] = client
+            if refresh_config is not None and refresh_config.enabled:
+                start_token_refresher(
+                    key, client.auth, refresh_config, token_fetched=token_fetched
+                )
+        return client
+
+
+def clear_service_clients() -> None:
+    """Forget the process wide service account clients."""
+    with _service_clients_lock:
+        _service_clients.clear()
+
+
+def hash_token(token: str) -> str:
+    """Return a stable hash of a bearer token, suitable as a cache key."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
 
 @dataclass
 class BoxContext:
     client: BoxClient | None = None
-    request: Request | None = None
 
     def get_client_from_token(self, token: str) -> BoxClient:
-        """Create a Box client using the provided OAuth token."""
-        logger.info("Creating Box client with OAuth token")
-        auth = BoxDeveloperTokenAuth(token=token)
-        return BoxClient(auth=auth)
+        """Get a Box client for the provided OAuth token.
 
-    def get_active_client(self) -> BoxClient:
+        Clients are cached per token, so repeated calls from the same MCP
+        client reuse one client and its HTTP connections.
+        """
+        key = hash_token(token)
+        client = _client_cache.get(key)
+        if client is None:
+            logger.info("Creating Box client with OAuth token")
+            auth = BoxDeveloperTokenAuth(token=token)
+            client = BoxClient(auth=auth, network_session=get_network_session())
+            _client_cache.set(key, client)
+        return client
+
+    def get_active_client(self, request: Request | None = None) -> BoxClient:
         """Get the active Box client.
 
-        For OAuth mode: extracts the token from the request and creates a client.
+        For OAuth mode: extracts the token from the given request and creates a client.
         For CCG mode: returns the pre-created client.
 
+        The lifespan context is shared by every request of a session, so the
+        request is passed in per call instead of being stored on the context.
+
+        Args:
+            request: The HTTP request of the current tool call, if any.
+
         Raises:
             ValueError: If no client is available or no OAuth token found.
         """
@@ -41,11 +148,11 @@ class BoxContext:
             return self.client
 
         # OAuth mode: extract token from request scope
-        if self.request is None:
+        if request is None:
             raise ValueError("No request context available")
 
         # Get the OAuth token from the request scope (set by middleware)
-        token = self.request.scope.get("oauth_token")
+        token = request.scope.get("oauth_token")
         if not token:
             raise ValueError("No OAuth token found in request scope")
 
@@ -59,7 +166,7 @@ async def box_lifespan_mcp_oauth(server: FastMCP) -> AsyncIterator[BoxContext]:
 
     In OAuth mode, the client is created per-request using the Bearer token
     from the Authorization header. The middleware stores the token in the
-    request scope, and tools should use context.get_client_with_token() to
+    request scope, and tools should use context.get_active_client(request) to
     create the client dynamically.
     """
     try:
@@ -94,19 +201,35 @@ async def box_lifespan_oauth(server: FastMCP, config: "BoxApiConfig") -> AsyncIt
 
 
 @asynccontextmanager
-async def box_lifespan_ccg(server: FastMCP, config: "BoxApiConfig") -> AsyncIterator[BoxContext]:
+async def box_lifespan_ccg(
+    server: FastMCP,
+    config: "BoxApiConfig",
+    refresh_config: TokenRefreshConfig | None = None,
+) -> AsyncIterator[BoxContext]:
     """
     Manage Box client lifecycle with CCG handling.
 
+    The client is created once per process and its token is refreshed in the
+    background before it expires. The user directory, the folder mirror and
+    the content index, if enabled, start loading in the background.
+
     Args:
         server: FastMCP server instance
         config: BoxApiConfig containing CCG credentials
+        refresh_config: TokenRefreshConfig for the background token refresh
 
     Yields:
         BoxContext with initialized CCG client
     """
     try:
-        client = get_ccg_client(config)
+        client = get_service_client(
+            f"ccg.{config.subject_type}.{config.subject_id}",
+            lambda: get_ccg_client(config),
+            refresh_config,
+        )
+        get_user_directory().preload(client)
+        get_folder_mirror().start(client)
+        get_content_index().start(client)
         yield BoxContext(client=client)
     finally:
         # Cleanup (if needed)
@@ -114,19 +237,37 @@ async def box_lifespan_ccg(server: FastMCP, config: "BoxApiConfig") -> AsyncIter
 
 
 @asynccontextmanager
-async def box_lifespan_jwt(server: FastMCP, config: "BoxApiConfig") -> AsyncIterator[BoxContext]:
+async def box_lifespan_jwt(
+    server: FastMCP,
+    config: "BoxApiConfig",
+    refresh_config: TokenRefreshConfig | None = None,
+) -> AsyncIterator[BoxContext]:
     """
     Manage Box client lifecycle with JWT handling.
 
+    The client is created once per process and its token is refreshed in the
+    background before it expires. The user directory, the folder mirror and
+    the content index, if enabled, start loading in the background.
+
     Args:
         server: FastMCP server instance
         config: BoxApiConfig containing JWT credentials
+        refresh_config: TokenRefreshConfig for the background token refresh
 
     Yields:
         BoxContext with initialized JWT client
     """
     try:
-        client = get_jwt_client(config)
+        # get_jwt_client fetches a token while creating the client
+        client = get_service_client(
+            f"jwt.{config.subject_type}.{config.subject_id}",
+            lambda: get_jwt_client(config),
+            refresh_config,
+            token_fetched=True,
+        )
+        get_user_directory().preload(client)
+        get_folder_mirror().start(client)
+        get_content_index().start(client)
         yield BoxContext(client=client)
     finally:
         # Cleanup (if needed)
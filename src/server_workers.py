@@ -0,0 +1,84 @@
+"""Serve the streamable HTTP transport from several worker processes."""
+
+import json
+import logging
+import os
+from dataclasses import asdict
+
+import uvicorn
+from starlette.applications import Starlette
+
+from config import (
+    AppConfig,
+    BoxAuthType,
+    McpAuthType,
+    ServerConfig,
+    TransportType,
+    setup_logging,
+)
+from server import build_mcp_server
+
+logger = logging.getLogger(__name__)
+
+# Server settings of the parent process (command line arguments included)
+SERVER_CONFIG_ENV = "BOX_MCP_SERVER_CONFIG"
+
+
+def export_server_config(config: ServerConfig) -> None:
+    """Pass the server settings to the worker processes."""
+    os.environ[SERVER_CONFIG_ENV] = json.dumps(asdict(config))
+
+
+def load_server_config(config: ServerConfig) -> None:
+    """Apply the server settings exported by the parent process, if any."""
+    exported = os.environ.get(SERVER_CONFIG_ENV)
+    if not exported:
+        return
+    values = json.loads(exported)
+    config.transport = TransportType(values["transport"])
+    config.host = values["host"]
+    config.port = values["port"]
+    config.box_auth = BoxAuthType(values["box_auth"])
+    config.mcp_auth_type = McpAuthType(values["mcp_auth_type"])
+    config.server_name = values["server_name"]
+    config.workers = values["workers"]
+
+
+def create_app() -> Starlette:
+    """
+    Create the ASGI app of one worker process.
+
+    Used as uvicorn application factory, every worker builds its own MCP
+    server with the auth middleware and OAuth endpoints.
+    """
+    app_config = AppConfig.from_env()
+    load_server_config(app_config.server)
+    setup_logging(app_config.logging.log_level)
+
+    mcp = build_mcp_server(app_config)
+    app = mcp.streamable_http_app()
+    logger.info(f"Worker {os.getpid()} ready")
+    return app
+
+
+def run_workers(app_config: AppConfig) -> None:
+    """
+    Serve the streamable HTTP transport from app_config.server.workers processes.
+
+    The transport is stateless, so any worker can answer any request and the
+    processes share the listening socket without session affinity.
+
+    Args:
+        app_config: Complete application configuration
+    """
+    server_config = app_config.server
+    export_server_config(server_config)
+    logger.info(f"Starting {server_config.workers} worker processes")
+    uvicorn.run(
+        "server_workers:create_app",
+        factory=True,
+        host=server_config.host,
+        port=server_config.port,
+        workers=server_config.workers,
+        log_level=logging.getLevelName(app_config.logging.log_level).lower(),
+    )
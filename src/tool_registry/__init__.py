@@ -1,12 +1,35 @@
-# src/tool_registry/__init__.py
+import inspect
 from typing import Callable, List
 
 from mcp.server.fastmcp import FastMCP
 
+from cache.response_cache import cache_responses
+from executor import limit_concurrency
+
 ToolRegistrar = Callable[[FastMCP], None]
 
 
 def register_all_tools(mcp: FastMCP, registrars: List[ToolRegistrar]):
-    """Register all tools from provided registrars"""
-    for registrar in registrars:
-        registrar(mcp)
+    """Register all tools from provided registrars
+
+    Async tools are wrapped with the per-tool concurrency cap of the shared
+    executor and with the response cache while they are being registered.
+    """
+    original_tool = mcp.tool
+
+    def tool_with_concurrency_limit(*args, **kwargs):
+        decorator = original_tool(*args, **kwargs)
+
+        def register(fn):
+            if inspect.iscoroutinefunction(fn):
+                fn = cache_responses(limit_concurrency(fn))
+            return decorator(fn)
+
+        return register
+
+    mcp.tool = tool_with_concurrency_limit
+    try:
+        for registrar in registrars:
+            registrar(mcp)
+    finally:
+        mcp.tool = original_tool
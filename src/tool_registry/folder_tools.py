@@ -17,6 +17,7 @@ from tools.box_tools_folders import (
     box_folder_set_upload_email_tool,
     box_folder_tag_add_tool,
     box_folder_tag_remove_tool,
+    box_resolve_path_tool,
 )
 
 
@@ -31,6 +32,7 @@ def register_folder_tools(mcp: FastMCP):
     mcp.tool()(box_folder_list_tags_tool)
     mcp.tool()(box_folder_move_tool)
     mcp.tool()(box_folder_rename_tool)
+    mcp.tool()(box_resolve_path_tool)
     mcp.tool()(box_folder_set_collaboration_tool)
     mcp.tool()(box_folder_set_description_tool)
     mcp.tool()(box_folder_set_sync_tool)
@@ -1,6 +1,7 @@
 from mcp.server.fastmcp import FastMCP
 
 from tools.box_tools_search import (
+    box_local_search_tool,
     box_search_folder_by_name_tool,
     box_search_tool,
 )
@@ -9,3 +10,4 @@ from tools.box_tools_search import (
 def register_search_tools(mcp: FastMCP):
     mcp.tool()(box_search_tool)
     mcp.tool()(box_search_folder_by_name_tool)
+    mcp.tool()(box_local_search_tool)
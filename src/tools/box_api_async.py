@@ -0,0 +1,1107 @@
+"""
+Native asyncio implementations of the most frequent Box read calls.
+
+The box_ai_agents_toolkit functions are synchronous and need a worker thread
+per call. The functions below talk to the Box API through the shared httpx
+client instead, so a fan-out of hundreds of requests costs coroutines rather
+than threads. Responses are deserialized into the Box SDK models and turned
+back into dicts, so the output has the same shape as the toolkit functions.
+"""
+
+import asyncio
+import base64
+import binascii
+import json as jsonlib
+import logging
+import random
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type
+
+import httpx
+from box_sdk_gen import (
+    BoxClient,
+    FolderFull,
+    GroupMemberships,
+    Groups,
+    Items,
+    MetadataFull,
+    SearchForContentContentTypes,
+    SearchResults,
+    Users,
+    deserialize,
+)
+
+from executor import run_blocking
+from http_pool import get_async_client, get_http_config
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRIES = 3
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+USER_FIELDS = ["id", "type", "name", "login", "role"]
+GROUP_FIELDS = ["id", "type", "name", "group_type", "description"]
+SEARCH_FIELDS = ["id", "name", "type", "size", "description"]
+
+# Largest page the search API returns, and the highest offset it accepts
+SEARCH_PAGE_SIZE = 200
+SEARCH_MAX_OFFSET = 10000
+
+# File extensions searched by one shard of a sharded search
+SEARCH_EXTENSIONS_PER_SHARD = 5
+
+
+# Monotonic time until which Box asked this process to back off (Retry-After
+# of the last 429), shared by every request so parallel crawls slow down too
+_rate_limited_until = 0.0
+
+# Monotonic time at which the next search call may start, spacing the search
+# calls of the process to the configured search_rate
+_next_search_at = 0.0
+
+
+class BoxAsyncAPIError(Exception):
+    """Error response from the Box API."""
+
+    def __init__(self, status_code: int, message: str, headers=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+        self.headers = headers or {}
+
+
+async def _authorization_header(client: BoxClient) -> str:
+    """Return the Authorization header of the client without blocking."""
+    token = client.auth.token_storage.get()
+    if token is not None and token.access_token:
+        return f"Bearer {token.access_token}"
+    # No token yet, fetching one is a blocking SDK call
+    return await run_blocking(
+        client.auth.retrieve_authorization_header,
+        network_session=client.network_session,
+    )
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    retry_after = response.headers.get("retry-after")
+    if retry_after is not None:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return 0.5 * 2**attempt + random.random() * 0.1
+
+
+def _error_message(response: httpx.Response) -> str:
+    # Same format as the Box SDK so tool errors look alike on both paths
+    try:
+        body = response.json()
+    except ValueError:
+        body = {}
+    if not isinstance(body, dict):
+        body = {}
+    return (
+        f"{response.status_code} {body.get('message', '')}; "
+        f"Request ID: {body.get('request_id', '')}"
+    )
+
+
+async def box_api_request(
+    client: BoxClient,
+    method: str,
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    json: Any = None,
+) -> httpx.Response:
+    """
+    Send a request to the Box API on the shared asyncio client.
+
+    Rate limited and transient server errors are retried, honouring the
+    Retry-After header. A 429 holds back every request of the process until
+    its Retry-After has passed. An expired token is refreshed once.
+
+    Args:
+        client: Authenticated Box client providing the token and base URL
+        method: HTTP method
+        path: API path, e.g. "/folders/0"
+        params: Query parameters, None values are dropped
+        headers: Extra request headers
+        json: JSON request body
+
+    Returns:
+        httpx.Response: The successful (or 304 Not Modified) response
+
+    Raises:
+        BoxAsyncAPIError: If the API returns an error status
+    """
+    global _rate_limited_until
+    url = f"{client.network_session.base_urls.base_url}/2.0{path}"
+    query = {key: value for key, value in (params or {}).items() if value is not None}
+    request_headers = {**client.network_session.additional_headers, **(headers or {})}
+    token_refreshed = False
+    attempt = 0
+
+    while True:
+        backoff = _rate_limited_until - time.monotonic()
+        if backoff > 0:
+            await asyncio.sleep(backoff)
+        request_headers["Authorization"] = await _authorization_header(client)
+        response = await get_async_client().request(
+            method, url, params=query, headers=request_headers, json=json
+        )
+
+        if response.status_code < 400:
+            return response
+
+        if response.status_code == 401 and not token_refreshed:
+            token_refreshed = True
+            try:
+                await run_blocking(
+                    client.auth.refresh_token, network_session=client.network_session
+                )
+                continue
+            except Exception as e:
+                logger.debug(f"Token refresh failed: {e}")
+
+        if response.status_code in RETRYABLE_STATUS_CODES and attempt < MAX_RETRIES:
+            delay = _retry_delay(response, attempt)
+            attempt += 1
+            if response.status_code == 429:
+                _rate_limited_until = max(_rate_limited_until, time.monotonic() + delay)
+            logger.debug(
+                f"Box API returned {response.status_code}, retrying in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+            continue
+
+        raise BoxAsyncAPIError(
+            response.status_code, _error_message(response), response.headers
+        )
+
+
+async def box_api_get(
+    client: BoxClient,
+    path: str,
+    model: Type,
+    params: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """GET a Box API resource and deserialize it into a Box SDK model."""
+    response = await box_api_request(client, "GET", path, params=params)
+    return deserialize(response.json(), model)
+
+
+def _join(values: Optional[List[str]]) -> Optional[str]:
+    return ",".join(values) if values else None
+
+
+async def box_folder_info_async(client: BoxClient, folder_id: str) -> Dict[str, Any]:
+    """Async counterpart of box_ai_agents_toolkit.box_folder_info."""
+    try:
+        folder = await box_api_get(client, f"/folders/{folder_id}", FolderFull)
+        return {"folder": folder.to_dict()}
+    except BoxAsyncAPIError as e:
+        logger.error(f"Box API Error: {e.status_code} {e.message}")
+        return {"error": e.message}
+
+
+async def _folder_page_items(
+    client: BoxClient,
+    folder_id: str,
+    limit: Optional[int],
+    fields: Optional[List[str]],
+) -> List[Any]:
+    """Return the items of one folder, following the markers of every page."""
+    result: List[Any] = []
+    marker: Optional[str] = None
+    while True:
+        folder_items = await box_api_get(
+            client,
+            f"/folders/{folder_id}/items",
+            Items,
+            params={
+                "usemarker": "true",
+                "limit": limit,
+                "marker": marker,
+                "fields": _join(fields),
+            },
+        )
+        if not folder_items.entries:
+            break
+        result.extend(folder_items.entries)
+        if folder_items.next_marker is None:
+            break
+        marker = folder_items.next_marker
+    return result
+
+
+async def crawl_folder_async(
+    client: BoxClient,
+    folder_id: str,
+    is_recursive: bool = True,
+    limit: Optional[int] = 1000,
+    fields: Optional[List[str]] = None,
+    concurrency: Optional[int] = None,
+    skipped: Optional[List[str]] = None,
+) -> List[dict]:
+    """
+    List a folder, crawling its subfolders concurrently.
+
+    Up to concurrency folders are listed at the same time (the configured
+    folder_concurrency by default). Subfolder items are nested under the
+    'items' key of their folder, as box_ai_agents_toolkit.box_folder_items_list
+    does, and a subfolder that fails to list is left without 'items'. Every
+    folder is listed once, even if it is reached twice.
+
+    Args:
+        client: Authenticated Box client
+        folder_id: ID of the folder to list
+        is_recursive: Whether to list the subfolders as well
+        limit: Items per page, at most 1000
+        fields: Fields to request for each item, the Box defaults if None
+        concurrency: Maximum number of folders listed at the same time
+        skipped: List the IDs of the subfolders that failed to list are added to
+
+    Raises:
+        BoxAsyncAPIError: If the folder itself cannot be listed
+    """
+    workers = max(1, concurrency or get_http_config().folder_concurrency)
+    queue: asyncio.Queue = asyncio.Queue()
+    visited = {folder_id}
+    root: List[dict] = []
+    failures: List[BaseException] = []
+    failed = asyncio.Event()
+
+    async def work() -> None:
+        while True:
+            current_id, parent = await queue.get()
+            try:
+                entries = await _folder_page_items(client, current_id, limit, fields)
+                items = []
+                for item in entries:
+                    item_dict = item.to_dict()
+                    if (
+                        is_recursive
+                        and item.type == "folder"
+                        and item.id not in visited
+                    ):
+                        visited.add(item.id)
+                        queue.put_nowait((item.id, item_dict))
+                    items.append(item_dict)
+                if parent is None:
+                    root.extend(items)
+                elif items:
+                    # Nest subfolder items under the 'items' attribute
+                    parent["items"] = items
+            except BoxAsyncAPIError as e:
+                if parent is None:
+                    failures.append(e)
+                    failed.set()
+                else:
+                    logger.error(f"Box API Error: {e.status_code} {e.message}")
+                    if skipped is not None:
+                        skipped.append(current_id)
+            except Exception as e:
+                failures.append(e)
+                failed.set()
+            finally:
+                queue.task_done()
+
+    queue.put_nowait((folder_id, None))
+    tasks = [asyncio.create_task(work()) for _ in range(workers)]
+    # Stop early if a folder failed in a way the toolkit would not absorb
+    waiters = {asyncio.create_task(queue.join()), asyncio.create_task(failed.wait())}
+    try:
+        await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in [*tasks, *waiters]:
+            task.cancel()
+        await asyncio.gather(*tasks, *waiters, return_exceptions=True)
+    if failures:
+        raise failures[0]
+    return root
+
+
+async def box_folder_items_list_async(
+    client: BoxClient,
+    folder_id: str,
+    is_recursive: bool = False,
+    limit: Optional[int] = 1000,
+) -> Dict[str, Any]:
+    """Async counterpart of box_ai_agents_toolkit.box_folder_items_list."""
+    try:
+        result = await crawl_folder_async(client, folder_id, is_recursive, limit)
+    except BoxAsyncAPIError as e:
+        logger.error(f"Box API Error: {e.status_code} {e.message}")
+        return {"error": e.message}
+    return (
+        {"folder_items": result} if result else {"message": "No items found in folder."}
+    )
+
+
+async def list_folder_items_by_name_async(
+    client: BoxClient,
+    folder_id: str,
+    offset: int = 0,
+    limit: int = 1000,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Return one page of a folder's items sorted by name.
+
+    Box sorts the items by type first, folders before files before web
+    links, and by name within each type.
+
+    Args:
+        client: Authenticated Box client
+        folder_id: ID of the folder to list
+        offset: Position of the first item of the page
+        limit: Items per page, at most 1000
+        fields: Fields to request for each item, the Box defaults if None
+
+    Returns:
+        dict: The Box items page, with entries and total_count
+
+    Raises:
+        BoxAsyncAPIError: If the API returns an error status
+    """
+    response = await box_api_request(
+        client,
+        "GET",
+        f"/folders/{folder_id}/items",
+        params={
+            "sort": "name",
+            "direction": "ASC",
+            "offset": offset,
+            "limit": limit,
+            "fields": _join(fields),
+        },
+    )
+    return response.json()
+
+
+async def box_events_async(
+    client: BoxClient, stream_position: str, limit: int = 500
+) -> Dict[str, Any]:
+    """
+    Return the change events of the user's event stream after stream_position.
+
+    Args:
+        client: Authenticated Box client
+        stream_position: Position returned by the previous call, or "now"
+        limit: Maximum number of events
+
+    Returns:
+        dict: The Box events page, with entries and next_stream_position
+
+    Raises:
+        BoxAsyncAPIError: If the API returns an error status
+    """
+    response = await box_api_request(
+        client,
+        "GET",
+        "/events",
+        params={
+            "stream_position": stream_position,
+            "stream_type": "changes",
+            "limit": limit,
+        },
+    )
+    return response.json()
+
+
+async def box_events_long_poll_async(
+    client: BoxClient, stream_position: str, timeout: float
+) -> bool:
+    """
+    Wait on the Box real-time server for new events after stream_position.
+
+    Args:
+        client: Authenticated Box client
+        stream_position: Position of the last events read
+        timeout: Seconds to wait before giving up
+
+    Returns:
+        bool: True if Box announced new events, False on a timeout or a
+            request to reconnect
+
+    Raises:
+        BoxAsyncAPIError: If the real-time server cannot be looked up
+    """
+    response = await box_api_request(client, "OPTIONS", "/events")
+    servers = response.json().get("entries") or []
+    if not servers:
+        return False
+    try:
+        message = await get_async_client().get(
+            servers[0]["url"],
+            params={"stream_position": stream_position},
+            timeout=timeout,
+        )
+    except httpx.TimeoutException:
+        return False
+    if message.status_code >= 400:
+        raise BoxAsyncAPIError(message.status_code, _error_message(message))
+    return message.json().get("message") == "new_change"
+
+
+class InvalidCursorError(ValueError):
+    """A folder listing cursor is malformed or belongs to another listing."""
+
+
+def _encode_cursor(state: Dict[str, Any]) -> str:
+    data = jsonlib.dumps(state, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        state = jsonlib.loads(data)
+    except (binascii.Error, ValueError):
+        raise InvalidCursorError("Invalid cursor") from None
+    if not isinstance(state, dict) or not isinstance(state.get("s"), list):
+        raise InvalidCursorError("Invalid cursor")
+    for frame in state["s"]:
+        if not (
+            isinstance(frame, list)
+            and len(frame) == 3
+            and isinstance(frame[0], str)
+            and (frame[1] is None or isinstance(frame[1], str))
+            and isinstance(frame[2], int)
+            and frame[2] >= 0
+        ):
+            raise InvalidCursorError("Invalid cursor")
+    return state
+
+
+async def box_folder_items_page_async(
+    client: BoxClient,
+    folder_id: str,
+    is_recursive: bool = False,
+    limit: Optional[int] = 1000,
+    max_items: int = 1000,
+    cursor: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Return up to max_items items of a folder listing, resuming at cursor.
+
+    The listing is depth first: the contents of a subfolder follow the
+    subfolder itself, and in a recursive listing every item carries its
+    parent folder. The traversal state is kept in the returned next_cursor,
+    one (folder, marker, offset) frame per level of depth, so the server
+    keeps nothing between calls and the cursor stays small however large
+    the tree is.
+
+    Args:
+        client: Authenticated Box client
+        folder_id: ID of the folder to list
+        is_recursive: Whether to list the subfolders as well
+        limit: Items per Box API page
+        max_items: Maximum number of items to return
+        cursor: next_cursor of the previous page, None for the first page
+
+    Returns:
+        dict: folder_items and, unless the listing is complete, next_cursor
+
+    Raises:
+        InvalidCursorError: If the cursor does not belong to this listing
+    """
+    if cursor is None:
+        stack: List[List[Any]] = [[folder_id, None, 0]]
+    else:
+        state = _decode_cursor(cursor)
+        if state.get("f") != folder_id or bool(state.get("r")) != is_recursive:
+            raise InvalidCursorError("Cursor belongs to another folder listing")
+        stack = state["s"]
+
+    # Pages fetched during this call, a parent page is read again after each
+    # subfolder it contains
+    pages: Dict[tuple, Items] = {}
+    result: List[dict] = []
+    while stack and len(result) < max_items:
+        current_id, marker, offset = stack[-1]
+        page = pages.get((current_id, marker))
+        if page is None:
+            try:
+                page = await box_api_get(
+                    client,
+                    f"/folders/{current_id}/items",
+                    Items,
+                    params={"usemarker": "true", "limit": limit, "marker": marker},
+                )
+            except BoxAsyncAPIError as e:
+                logger.error(f"Box API Error: {e.status_code} {e.message}")
+                if len(stack) == 1 and current_id == folder_id:
+                    return {"error": e.message}
+                # A subfolder that cannot be listed is skipped, as in a crawl
+                stack.pop()
+                continue
+            pages[(current_id, marker)] = page
+        entries = page.entries or []
+        position = offset
+        descend = None
+        while position < len(entries) and len(result) < max_items:
+            item = entries[position]
+            position += 1
+            item_dict = item.to_dict()
+            if is_recursive:
+                item_dict["parent"] = {"type": "folder", "id": current_id}
+                if item.type == "folder":
+                    descend = item.id
+            result.append(item_dict)
+            if descend is not None:
+                break
+        if position < len(entries):
+            stack[-1] = [current_id, marker, position]
+        elif page.next_marker:
+            stack[-1] = [current_id, page.next_marker, 0]
+        else:
+            stack.pop()
+        if descend is not None:
+            stack.append([descend, None, 0])
+
+    response: Dict[str, Any] = {"folder_items": result}
+    if stack:
+        response["next_cursor"] = _encode_cursor(
+            {"f": folder_id, "r": is_recursive, "s": stack}
+        )
+    elif not result and cursor is None:
+        return {"message": "No items found in folder."}
+    return response
+
+
+async def box_search_async(
+    client: BoxClient,
+    query: str,
+    file_extensions: Optional[List[str]] = None,
+    content_types: Optional[List[SearchForContentContentTypes]] = None,
+    ancestor_folder_ids: Optional[List[str]] = None,
+) -> List[dict]:
+    """
+    Async counterpart of box_ai_agents_toolkit.box_search.
+
+    Returns the entries as dicts, like box_search_tool does with the toolkit
+    result. Errors are raised as BoxAsyncAPIError, as the toolkit raises them.
+    """
+    search_results = await box_api_get(
+        client,
+        "/search",
+        SearchResults,
+        params={
+            "query": query,
+            "file_extensions": _join(file_extensions),
+            "ancestor_folder_ids": _join(ancestor_folder_ids),
+            "content_types": _join([c.value for c in content_types or []]),
+            "type": "file",
+            "fields": _join(SEARCH_FIELDS),
+        },
+    )
+    return [entry.to_dict() for entry in search_results.entries or []]
+
+
+async def _wait_for_search_slot() -> None:
+    global _next_search_at
+    rate = get_http_config().search_rate
+    if rate <= 0:
+        return
+    now = time.monotonic()
+    start = max(now, _next_search_at)
+    _next_search_at = start + 1 / rate
+    if start > now:
+        await asyncio.sleep(start - now)
+
+
+def project_fields(entry: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Keep the type, ID and requested fields of an API entry, as sent by Box."""
+    projected = {"type": entry.get("type"), "id": entry.get("id")}
+    for field in fields:
+        if field in entry:
+            projected[field] = entry[field]
+    return projected
+
+
+async def iter_search_pages_async(
+    client: BoxClient,
+    query: str,
+    file_extensions: Optional[List[str]] = None,
+    content_types: Optional[List[SearchForContentContentTypes]] = None,
+    ancestor_folder_ids: Optional[List[str]] = None,
+    fields: Optional[List[str]] = None,
+    offset: int = 0,
+    limit: int = 30,
+) -> AsyncIterator[Tuple[List[Dict[str, Any]], int]]:
+    """
+    Search for files, yielding the results one API page at a time.
+
+    Entries are projected on the requested fields straight from the JSON
+    response, without building Box SDK models, so a page costs little more
+    than its bytes. Search calls are spaced to the configured search_rate.
+
+    Args:
+        client: Authenticated Box client
+        query: The query to search for
+        file_extensions: File extensions to limit the search to
+        content_types: Where to look for the query
+        ancestor_folder_ids: Folders to limit the search to
+        fields: Fields of each result, SEARCH_FIELDS if None
+        offset: Position of the first result
+        limit: Maximum number of results over all pages
+
+    Yields:
+        Tuple[List[dict], int]: The results of a page and the total count
+
+    Raises:
+        BoxAsyncAPIError: If the API returns an error status
+    """
+    fields = fields or SEARCH_FIELDS
+    remaining = limit
+    while remaining > 0:
+        await _wait_for_search_slot()
+        response = await box_api_request(
+            client,
+            "GET",
+            "/search",
+            params={
+                "query": query,
+                "file_extensions": _join(file_extensions),
+                "ancestor_folder_ids": _join(ancestor_folder_ids),
+                "content_types": _join([c.value for c in content_types or []]),
+                "type": "file",
+                "fields": _join(fields),
+                "offset": offset,
+                "limit": min(remaining, SEARCH_PAGE_SIZE),
+            },
+        )
+        page = response.json()
+        entries = page.get("entries") or []
+        total_count = page.get("total_count", 0)
+        yield [project_fields(entry, fields) for entry in entries], total_count
+        offset += len(entries)
+        remaining -= len(entries)
+        if not entries or offset >= min(total_count, SEARCH_MAX_OFFSET):
+            return
+
+
+def search_shards(
+    ancestor_folder_ids: Optional[List[str]],
+    file_extensions: Optional[List[str]],
+    extensions_per_shard: int = SEARCH_EXTENSIONS_PER_SHARD,
+) -> List[Tuple[Optional[List[str]], Optional[List[str]]]]:
+    """Split a search into (ancestor folders, file extensions) shards, one per folder and extension group."""
+    roots: List[Optional[List[str]]] = (
+        [[folder_id] for folder_id in ancestor_folder_ids]
+        if ancestor_folder_ids
+        else [None]
+    )
+    groups: List[Optional[List[str]]] = (
+        [
+            file_extensions[i : i + extensions_per_shard]
+            for i in range(0, len(file_extensions), extensions_per_shard)
+        ]
+        if file_extensions
+        else [None]
+    )
+    return [(root, group) for root in roots for group in groups]
+
+
+def merge_ranked(shard_results: List[List[Dict[str, Any]]], limit: int) -> List[dict]:
+    """
+    Merge the results of several shards, each in relevance order.
+
+    The best result of every shard comes first, then the second ones, and
+    so on, in shard order. An item found by several shards is kept at its
+    best rank.
+    """
+    merged: List[dict] = []
+    seen = set()
+    depth = max((len(results) for results in shard_results), default=0)
+    for rank in range(depth):
+        for results in shard_results:
+            if rank >= len(results):
+                continue
+            item = results[rank]
+            key = (item.get("type"), item.get("id"))
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(item)
+            if len(merged) >= limit:
+                return merged
+    return merged
+
+
+async def box_search_sharded_async(
+    client: BoxClient,
+    query: str,
+    file_extensions: Optional[List[str]] = None,
+    content_types: Optional[List[SearchForContentContentTypes]] = None,
+    ancestor_folder_ids: Optional[List[str]] = None,
+    fields: Optional[List[str]] = None,
+    limit: int = 30,
+    deadline: Optional[float] = None,
+    concurrency: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Search every ancestor folder and extension group concurrently.
+
+    Up to concurrency shards run at the same time (the configured
+    search_concurrency by default), each fetching up to limit results. The
+    shards are merged with merge_ranked. Shards still running after
+    deadline seconds (the configured search_deadline by default) are
+    cancelled and contribute the pages they already fetched, and the result
+    is then marked partial, as it is when some shards fail.
+
+    Returns:
+        dict: results, total_count, the number of shards and of
+            completed_shards, and partial if some shards did not complete.
+            total_count adds up the totals of the shards, so a file found
+            by two shards is counted twice; it is None if a shard returned
+            no page.
+
+    Raises:
+        BoxAsyncAPIError: If every shard failed
+    """
+    config = get_http_config()
+    shards = search_shards(ancestor_folder_ids, file_extensions)
+    semaphore = asyncio.Semaphore(max(1, concurrency or config.search_concurrency))
+    found: List[List[Dict[str, Any]]] = [[] for _ in shards]
+    totals: List[Optional[int]] = [None for _ in shards]
+
+    async def run(
+        index: int, roots: Optional[List[str]], extensions: Optional[List[str]]
+    ) -> None:
+        async with semaphore:
+            async for page, total_count in iter_search_pages_async(
+                client,
+                query,
+                extensions,
+                content_types,
+                roots,
+                fields=fields,
+                limit=limit,
+            ):
+                found[index].extend(page)
+                totals[index] = total_count
+
+    tasks = [
+        asyncio.create_task(run(index, roots, extensions))
+        for index, (roots, extensions) in enumerate(shards)
+    ]
+    done, pending = await asyncio.wait(
+        tasks, timeout=config.search_deadline if deadline is None else deadline
+    )
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+    failed = [task.exception() for task in done if task.exception() is not None]
+    for error in failed:
+        logger.error(f"Search shard failed: {error}")
+    if failed and len(failed) == len(tasks):
+        raise failed[0]
+
+    response: Dict[str, Any] = {
+        "results": merge_ranked(found, limit),
+        "total_count": (
+            None if None in totals else sum(total or 0 for total in totals)
+        ),
+        "shards": len(shards),
+        "completed_shards": len(done) - len(failed),
+    }
+    if pending or failed:
+        response["partial"] = True
+    return response
+
+
+async def box_metadata_get_instance_on_file_async(
+    client: BoxClient,
+    file_id: str,
+    template_key: str,
+) -> Dict[str, Any]:
+    """Async counterpart of box_ai_agents_toolkit.box_metadata_get_instance_on_file."""
+    try:
+        instance = await box_api_get(
+            client,
+            f"/files/{file_id}/metadata/enterprise/{template_key}",
+            MetadataFull,
+        )
+        return {"metadata_instance": instance.to_dict()}
+    except BoxAsyncAPIError as e:
+        return {"error": e.message}
+
+
+def metadata_instance_fields(instance: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the template field values of a metadata instance dict."""
+    if "extra_data" in instance:
+        return dict(instance["extra_data"] or {})
+    return {key: value for key, value in instance.items() if not key.startswith("$")}
+
+
+def metadata_patch_operations(
+    current: Dict[str, Any],
+    metadata: Dict[str, Any],
+    remove_non_included_data: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Return the JSON Patch operations turning current into metadata.
+
+    Only changed fields get an operation, a None value removes a field.
+    Every replace and remove is preceded by a test of the value it was
+    computed from, so Box rejects the patch if the instance changed since.
+    """
+    operations: List[Dict[str, Any]] = []
+
+    def remove(key: str) -> None:
+        operations.append({"op": "test", "path": f"/{key}", "value": current[key]})
+        operations.append({"op": "remove", "path": f"/{key}"})
+
+    for key, value in metadata.items():
+        if value is None:
+            if key in current:
+                remove(key)
+        elif key not in current:
+            operations.append({"op": "add", "path": f"/{key}", "value": value})
+        elif current[key] != value:
+            operations.append({"op": "test", "path": f"/{key}", "value": current[key]})
+            operations.append({"op": "replace", "path": f"/{key}", "value": value})
+    if remove_non_included_data:
+        for key in current:
+            if key not in metadata:
+                remove(key)
+    return operations
+
+
+async def box_metadata_update_instance_on_file_async(
+    client: BoxClient,
+    file_id: str,
+    template_key: str,
+    metadata: Dict[str, Any],
+    remove_non_included_data: bool = False,
+    current: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Async counterpart of box_ai_agents_toolkit.box_metadata_update_instance_on_file.
+
+    Sends only the operations that change the instance and skips the update
+    when there are none. When the instance changed since it was read, the
+    patch fails its test operations; it is then read again and the update
+    retried once.
+
+    Args:
+        current: Field values of the instance if known, read from Box if None
+    """
+    path = f"/files/{file_id}/metadata/enterprise/{template_key}"
+    for attempt in range(2):
+        try:
+            if current is None:
+                response = await box_api_request(client, "GET", path)
+                current = metadata_instance_fields(response.json())
+            operations = metadata_patch_operations(
+                current, metadata, remove_non_included_data
+            )
+            if not operations:
+                return {"message": "No changes to update"}
+            response = await box_api_request(
+                client,
+                "PUT",
+                path,
+                headers={"Content-Type": "application/json-patch+json"},
+                json=operations,
+            )
+        except BoxAsyncAPIError as e:
+            if e.status_code in (409, 412) and attempt == 0:
+                logger.debug(f"Metadata of file {file_id} changed, reading it again")
+                current = None
+                continue
+            return {"error": e.message}
+        instance = deserialize(response.json(), MetadataFull)
+        return {"metadata_instance": instance.to_dict()}
+    return {"error": "Metadata instance changed during the update"}
+
+
+async def box_user_enterprise_id_async(client: BoxClient) -> Optional[str]:
+    """Return the enterprise ID of the authenticated user, None if it has none."""
+    response = await box_api_request(
+        client, "GET", "/users/me", params={"fields": "enterprise"}
+    )
+    return (response.json().get("enterprise") or {}).get("id")
+
+
+async def list_users_async(client: BoxClient, limit: int = 1000) -> List[dict]:
+    """Return every user of the enterprise, raising BoxAsyncAPIError on errors."""
+    result: List[dict] = []
+    marker: Optional[str] = None
+    while True:
+        users = await box_api_get(
+            client,
+            "/users",
+            Users,
+            params={
+                "user_type": "all",
+                "fields": _join(USER_FIELDS),
+                "limit": limit,
+                "usemarker": "true",
+                "marker": marker,
+            },
+        )
+        result.extend(user.to_dict() for user in users.entries or [])
+        if not users.next_marker:
+            return result
+        marker = users.next_marker
+
+
+async def _users_search(
+    client: BoxClient, filter_term: str, limit: int = 1000
+) -> List[dict]:
+    result: List[dict] = []
+    offset = 0
+    while True:
+        users = await box_api_get(
+            client,
+            "/users",
+            Users,
+            params={
+                "filter_term": filter_term,
+                "user_type": "all",
+                "fields": _join(USER_FIELDS),
+                "limit": limit,
+                "offset": offset,
+            },
+        )
+        result.extend(user.to_dict() for user in users.entries or [])
+        if users.total_count is None or users.total_count <= offset + limit:
+            return result
+        offset += limit
+
+
+async def box_users_list_async(client: BoxClient) -> Dict[str, Any]:
+    """Async counterpart of box_ai_agents_toolkit.box_users_list."""
+    try:
+        return {"users": await list_users_async(client)}
+    except BoxAsyncAPIError as e:
+        logger.error(f"Error listing users: {e.message}")
+        return {"error": e.message}
+
+
+async def box_users_locate_by_email_async(
+    client: BoxClient, email: str
+) -> Dict[str, Any]:
+    """Async counterpart of box_ai_agents_toolkit.box_users_locate_by_email."""
+    try:
+        users = await _users_search(client, filter_term=email)
+    except BoxAsyncAPIError as e:
+        logger.error(f"Error locating user by email: {e.message}")
+        return {"error": e.message}
+    matches = [user for user in users if user.get("login") == email]
+    return {"user": matches[0]} if matches else {"message": "No user found"}
+
+
+async def box_users_locate_by_name_async(
+    client: BoxClient, name: str
+) -> Dict[str, Any]:
+    """Async counterpart of box_ai_agents_toolkit.box_users_locate_by_name."""
+    try:
+        users = await _users_search(client, filter_term=name)
+    except BoxAsyncAPIError as e:
+        logger.error(f"Error locating user by name: {e.message}")
+        return {"error": e.message}
+    matches = [user for user in users if user.get("name", "") == name]
+    return {"user": matches[0]} if matches else {"message": "No user found"}
+
+
+async def box_users_search_by_name_or_email_async(
+    client: BoxClient, query: str
+) -> Dict[str, Any]:
+    """Async counterpart of box_ai_agents_toolkit.box_users_search_by_name_or_email."""
+    try:
+        return {"users": await _users_search(client, filter_term=query)}
+    except BoxAsyncAPIError as e:
+        logger.error(f"Error searching users: {e.message}")
+        return {"error": e.message}
+
+
+async def _offset_paged(
+    client: BoxClient,
+    path: str,
+    model: Type,
+    params: Dict[str, Any],
+    limit: int = 1000,
+) -> List[dict]:
+    result: List[dict] = []
+    offset = 0
+    while True:
+        page = await box_api_get(
+            client, path, model, params={**params, "limit": limit, "offset": offset}
+        )
+        result.extend(entry.to_dict() for entry in page.entries or [])
+        if not page.total_count or len(result) >= page.total_count:
+            return result
+        if not page.entries:
+            return result
+        offset += limit
+
+
+async def list_groups_async(
+    client: BoxClient, filter_term: Optional[str] = None
+) -> List[dict]:
+    """Return the groups whose name starts with filter_term, or every group."""
+    return await _offset_paged(
+        client,
+        "/groups",
+        Groups,
+        {"filter_term": filter_term, "fields": _join(GROUP_FIELDS)},
+    )
+
+
+async def list_group_memberships_async(client: BoxClient, group_id: str) -> List[dict]:
+    """Return the memberships of a group, raising BoxAsyncAPIError on errors."""
+    return await _offset_paged(
+        client, f"/groups/{group_id}/memberships", GroupMemberships, {}
+    )
+
+
+async def list_user_memberships_async(client: BoxClient, user_id: str) -> List[dict]:
+    """Return the group memberships of a user, raising BoxAsyncAPIError on errors."""
+    return await _offset_paged(
+        client, f"/users/{user_id}/memberships", GroupMemberships, {}
+    )
+
+
+async def box_groups_search_async(
+    client: BoxClient, filter_term: Optional[str] = None
+) -> Dict[str, Any]:
+    """Async counterpart of box_ai_agents_toolkit.box_groups_search."""
+    try:
+        result = await list_groups_async(client, filter_term)
+    except BoxAsyncAPIError as e:
+        logger.error(f"Box API Error: {e.status_code} {e.message}")
+        return {"error": e.message}
+    return {"groups": result} if result else {"message": "No groups found."}
+
+
+async def box_groups_list_members_async(
+    client: BoxClient, group_id: str
+) -> Dict[str, Any]:
+    """Async counterpart of box_ai_agents_toolkit.box_groups_list_members."""
+    try:
+        result = await list_group_memberships_async(client, group_id)
+    except BoxAsyncAPIError as e:
+        logger.error(f"Box API Error: {e.status_code} {e.message}")
+        return {"error": e.message}
+    if not result:
+        return {"message": "No members found for the group."}
+    return {"memberships": result}
+
+
+async def box_groups_list_by_user_async(
+    client: BoxClient, user_id: str
+) -> Dict[str, Any]:
+    """Async counterpart of box_ai_agents_toolkit.box_groups_list_by_user."""
+    try:
+        result = await list_user_memberships_async(client, user_id)
+    except BoxAsyncAPIError as e:
+        logger.error(f"Box API Error: {e.status_code} {e.message}")
+        return {"error": e.message}
+    if not result:
+        return {"message": "No groups found for the user."}
+    return {"memberships": result}
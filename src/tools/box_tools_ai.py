@@ -12,6 +12,7 @@ from box_ai_agents_toolkit import (
 )
 from mcp.server.fastmcp import Context
 
+from executor import run_blocking
 from tools.box_tools_generic import get_box_client
 
 
@@ -31,8 +32,12 @@ async def box_ai_ask_file_single_tool(
     """
 
     box_client = get_box_client(ctx)
-    response = box_ai_ask_file_single(
-        box_client, file_id, prompt=prompt, ai_agent_id=ai_agent_id
+    response = await run_blocking(
+        box_ai_ask_file_single,
+        box_client,
+        file_id,
+        prompt=prompt,
+        ai_agent_id=ai_agent_id,
     )
     return response
 
@@ -52,8 +57,12 @@ async def box_ai_ask_file_multi_tool(
         ai_agent_id (Optional[str]): The ID of the AI agent to use for processing.
     """
     box_client = get_box_client(ctx)
-    response = box_ai_ask_file_multi(
-        box_client, file_ids, prompt=prompt, ai_agent_id=ai_agent_id
+    response = await run_blocking(
+        box_ai_ask_file_multi,
+        box_client,
+        file_ids,
+        prompt=prompt,
+        ai_agent_id=ai_agent_id,
     )
     return response
 
@@ -77,8 +86,8 @@ async def box_ai_ask_hub_tool(
         hubs_id = str(hubs_id)
 
     box_client = get_box_client(ctx)
-    response = box_ai_ask_hub(
-        box_client, hubs_id, prompt=prompt, ai_agent_id=ai_agent_id
+    response = await run_blocking(
+        box_ai_ask_hub, box_client, hubs_id, prompt=prompt, ai_agent_id=ai_agent_id
     )
     return response
 
@@ -119,8 +128,12 @@ async def box_ai_extract_freeform_tool(
     """
     box_client = get_box_client(ctx)
 
-    response = box_ai_extract_freeform(
-        box_client, file_ids, prompt=prompt, ai_agent_id=ai_agent_id
+    response = await run_blocking(
+        box_ai_extract_freeform,
+        box_client,
+        file_ids,
+        prompt=prompt,
+        ai_agent_id=ai_agent_id,
     )
     return response
 
@@ -210,8 +223,12 @@ async def box_ai_extract_structured_using_fields_tool(
     """
     box_client = get_box_client(ctx)
 
-    response = box_ai_extract_structured_using_fields(
-        box_client, file_ids, fields, ai_agent_id=ai_agent_id
+    response = await run_blocking(
+        box_ai_extract_structured_using_fields,
+        box_client,
+        file_ids,
+        fields,
+        ai_agent_id=ai_agent_id,
     )
     return response
 
@@ -247,8 +264,12 @@ async def box_ai_extract_structured_using_template_tool(
     """
     box_client = get_box_client(ctx)
 
-    response = box_ai_extract_structured_using_template(
-        box_client, file_ids, template_key, ai_agent_id=ai_agent_id
+    response = await run_blocking(
+        box_ai_extract_structured_using_template,
+        box_client,
+        file_ids,
+        template_key,
+        ai_agent_id=ai_agent_id,
     )
     return response
 
@@ -293,7 +314,8 @@ async def box_ai_extract_structured_enhanced_using_fields_tool(
     """
     box_client = get_box_client(ctx)
 
-    response = box_ai_extract_structured_enhanced_using_fields(
+    response = await run_blocking(
+        box_ai_extract_structured_enhanced_using_fields,
         box_client,
         file_ids,
         fields,
@@ -335,7 +357,10 @@ async def box_ai_extract_structured_enhanced_using_template_tool(
     """
     box_client = get_box_client(ctx)
 
-    response = box_ai_extract_structured_enhanced_using_template(
-        box_client, file_ids, template_key
+    response = await run_blocking(
+        box_ai_extract_structured_enhanced_using_template,
+        box_client,
+        file_ids,
+        template_key,
     )
     return response
@@ -11,6 +11,7 @@ from box_ai_agents_toolkit import (
 )
 from mcp.server.fastmcp import Context
 
+from executor import run_blocking
 from tools.box_tools_generic import get_box_client
 
 
@@ -28,7 +29,7 @@ async def box_read_tool(ctx: Context, file_id: str) -> dict[str, Any]:
         file_id = str(file_id)
 
     box_client = get_box_client(ctx)
-    response = box_file_text_extract(box_client, file_id)
+    response = await run_blocking(box_file_text_extract, box_client, file_id)
     return response
 
 
@@ -81,7 +82,9 @@ async def box_upload_file_from_path_tool(
             with open(file_path_expanded, "r", encoding="utf-8") as f:
                 content = f.read()
         # Upload using toolkit (supports str or bytes)
-        result = box_upload_file(box_client, content, actual_file_name, folder_id)
+        result = await run_blocking(
+            box_upload_file, box_client, content, actual_file_name, folder_id
+        )
         return f"File uploaded successfully. File ID: {result['id']}, Name: {result['name']}"
     except Exception as e:
         return f"Error uploading file: {str(e)}"
@@ -111,7 +114,9 @@ async def box_upload_file_from_content_tool(
             content = base64.b64decode(content)
 
         # Upload using toolkit
-        result = box_upload_file(box_client, content, file_name, folder_id)
+        result = await run_blocking(
+            box_upload_file, box_client, content, file_name, folder_id
+        )
         return f"File uploaded successfully. File ID: {result['id']}, Name: {result['name']}"
     except Exception as e:
         return f"Error uploading file: {str(e)}"
@@ -146,12 +151,16 @@ async def box_download_file_tool(
 
     try:
         # Use the box_api function for downloading
-        saved_path, file_content, mime_type = box_file_download(
-            client=box_client, file_id=file_id, save_file=save_file, save_path=save_path
+        saved_path, file_content, mime_type = await run_blocking(
+            box_file_download,
+            client=box_client,
+            file_id=file_id,
+            save_file=save_file,
+            save_path=save_path,
         )
 
         # Get file info to include name in response
-        file_info = box_client.files.get_file_by_id(file_id)
+        file_info = await run_blocking(box_client.files.get_file_by_id, file_id)
         file_name = file_info.name
         file_extension = file_name.split(".")[-1].lower() if "." in file_name else ""
 
@@ -20,7 +20,21 @@ from box_ai_agents_toolkit import (
 )
 from mcp.server.fastmcp import Context
 
-from tools.box_tools_generic import get_box_client
+from cache.folder_mirror import get_folder_mirror
+from cache.path_resolver import get_path_resolver
+from executor import run_blocking
+from http_pool import async_reads_enabled
+from tools.box_api_async import (
+    BoxAsyncAPIError,
+    InvalidCursorError,
+    box_folder_info_async,
+    box_folder_items_list_async,
+    box_folder_items_page_async,
+)
+from tools.box_tools_generic import get_box_client, get_caller_identity
+
+# Items per page of a paged folder listing that only passes a cursor
+DEFAULT_PAGE_ITEMS = 1000
 
 
 async def box_folder_copy_tool(
@@ -41,7 +55,8 @@ async def box_folder_copy_tool(
         dict[str, Any]: Dictionary containing the copied folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_copy(
+    return await run_blocking(
+        box_folder_copy,
         client=client,
         folder_id=folder_id,
         destination_parent_folder_id=destination_parent_folder_id,
@@ -64,7 +79,8 @@ async def box_folder_create_tool(
         dict[str, Any]: Dictionary containing the created folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_create(
+    return await run_blocking(
+        box_folder_create,
         client=client,
         name=name,
         parent_folder_id=parent_folder_id,
@@ -87,11 +103,15 @@ async def box_folder_delete_tool(
         dict[str, Any]: Dictionary containing success message or error message
     """
     client = get_box_client(ctx)
-    return box_folder_delete(
+    result = await run_blocking(
+        box_folder_delete,
         client=client,
         folder_id=folder_id,
         recursive=recursive,
     )
+    if "error" not in result:
+        get_path_resolver().invalidate(folder_id)
+    return result
 
 
 async def box_folder_favorites_add_tool(
@@ -109,7 +129,8 @@ async def box_folder_favorites_add_tool(
         dict[str, Any]: Dictionary containing the updated folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_favorites_add(
+    return await run_blocking(
+        box_folder_favorites_add,
         client=client,
         folder_id=folder_id,
     )
@@ -129,7 +150,8 @@ async def box_folder_favorites_remove_tool(
         dict[str, Any]: Dictionary containing the updated folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_favorites_remove(
+    return await run_blocking(
+        box_folder_favorites_remove,
         client=client,
         folder_id=folder_id,
     )
@@ -149,7 +171,10 @@ async def box_folder_info_tool(
         dict[str, Any]: Dictionary containing folder information or error message.
     """
     client = get_box_client(ctx)
-    return box_folder_info(
+    if async_reads_enabled():
+        return await box_folder_info_async(client, folder_id)
+    return await run_blocking(
+        box_folder_info,
         client=client,
         folder_id=folder_id,
     )
@@ -160,21 +185,60 @@ async def box_folder_items_list_tool(
     folder_id: str,
     is_recursive: bool = False,
     limit: Optional[int] = 1000,
+    max_items: Optional[int] = None,
+    cursor: Optional[str] = None,
 ) -> dict:
     """
     List items in a Box folder with optional recursive traversal.
 
+    Large folders and trees can be listed page by page: pass max_items to get
+    at most that many items and a next_cursor, then pass the cursor back to
+    get the next page. Paged recursive listings are flat, each item names its
+    parent folder and is followed by its own contents if it is a folder.
+
+    Folders of the local folder mirror are listed from the mirror, sorted by
+    type and name, while it is in sync.
+
     Args:
         ctx: Context: The context containing Box client information.
         folder_id (str): ID of the folder to list items from.
         is_recursive (bool, optional): Whether to recursively list subfolder contents. Defaults to False.
         limit (Optional[int], optional): Maximum items per API call. Defaults to 1000.
+        max_items (Optional[int], optional): Maximum items to return, enables paging. Defaults to no limit.
+        cursor (Optional[str], optional): next_cursor of the previous page, with the same folder_id and is_recursive.
 
     Returns:
-        dict[str, Any]: Dictionary containing folder items list or error message.
+        dict[str, Any]: Dictionary containing folder items list, the next_cursor if more items remain, or error message.
     """
     client = get_box_client(ctx)
-    return box_folder_items_list(
+    if max_items is not None and max_items <= 0:
+        return {"error": "max_items must be positive"}
+    if max_items is not None or cursor is not None:
+        try:
+            return await box_folder_items_page_async(
+                client,
+                folder_id,
+                is_recursive,
+                limit,
+                max_items=max_items or DEFAULT_PAGE_ITEMS,
+                cursor=cursor,
+            )
+        except InvalidCursorError as e:
+            return {"error": str(e)}
+    mirrored = await get_folder_mirror().list_items(
+        folder_id, is_recursive, get_caller_identity(ctx)
+    )
+    if mirrored is not None:
+        return (
+            {"folder_items": mirrored}
+            if mirrored
+            else {"message": "No items found in folder."}
+        )
+    # Recursive listings crawl subfolders concurrently on the asyncio client
+    if async_reads_enabled():
+        return await box_folder_items_list_async(client, folder_id, is_recursive, limit)
+    return await run_blocking(
+        box_folder_items_list,
         client=client,
         folder_id=folder_id,
         is_recursive=is_recursive,
@@ -197,7 +261,8 @@ async def box_folder_list_tags_tool(
         dict[str, Any]: Dictionary containing the list of tags or error message
     """
     client = get_box_client(ctx)
-    return box_folder_list_tags(
+    return await run_blocking(
+        box_folder_list_tags,
         client=client,
         folder_id=folder_id,
     )
@@ -219,11 +284,15 @@ async def box_folder_move_tool(
         dict[str, Any]: Dictionary containing the moved folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_move(
+    result = await run_blocking(
+        box_folder_move,
         client=client,
         folder_id=folder_id,
         destination_parent_folder_id=destination_parent_folder_id,
     )
+    if "error" not in result:
+        get_path_resolver().invalidate(folder_id)
+    return result
 
 
 async def box_folder_rename_tool(
@@ -242,11 +311,45 @@ async def box_folder_rename_tool(
         dict[str, Any]: Dictionary containing the renamed folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_rename(
+    result = await run_blocking(
+        box_folder_rename,
         client=client,
         folder_id=folder_id,
         new_name=new_name,
     )
+    if "error" not in result:
+        get_path_resolver().invalidate(folder_id)
+    return result
+
+
+async def box_resolve_path_tool(
+    ctx: Context,
+    path: str,
+    base_folder_id: str = "0",
+) -> dict:
+    """
+    Resolve a folder or file path such as /Finance/2025/Q3 to its ID.
+
+    Names are matched ignoring case. Use this instead of searching for each
+    folder of the path, resolved paths are cached.
+
+    Args:
+        ctx: Context: The context containing Box client information.
+        path (str): Slash separated folder names, optionally ending with a file name.
+        base_folder_id (str, optional): ID of the folder the path starts at. Defaults to the root folder "0".
+    Returns:
+        dict[str, Any]: Dictionary containing the item's type, id, name and path, or error message
+    """
+    client = get_box_client(ctx)
+    try:
+        item = await get_path_resolver().resolve(
+            client, path, base_folder_id, get_caller_identity(ctx)
+        )
+    except BoxAsyncAPIError as e:
+        return {"error": e.message}
+    if item is None:
+        return {"error": f"Path not found: {path}"}
+    return {"item": item}
 
 
 async def box_folder_set_collaboration_tool(
@@ -268,7 +371,8 @@ async def box_folder_set_collaboration_tool(
         dict[str, Any]: Dictionary containing the updated folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_set_collaboration(
+    return await run_blocking(
+        box_folder_set_collaboration,
         client=client,
         folder_id=folder_id,
         can_non_owners_invite=can_non_owners_invite,
@@ -293,7 +397,8 @@ async def box_folder_set_description_tool(
         dict[str, Any]: Dictionary containing the updated folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_set_description(
+    return await run_blocking(
+        box_folder_set_description,
         client=client,
         folder_id=folder_id,
         description=description,
@@ -317,7 +422,8 @@ async def box_folder_set_sync_tool(
         dict[str, Any]: Dictionary containing the updated folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_set_sync(
+    return await run_blocking(
+        box_folder_set_sync,
         client=client,
         folder_id=folder_id,
         sync_state=sync_state,
@@ -343,7 +449,8 @@ async def box_folder_set_upload_email_tool(
         dict[str, Any]: Dictionary containing the updated folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_set_upload_email(
+    return await run_blocking(
+        box_folder_set_upload_email,
         client=client,
         folder_id=folder_id,
         folder_upload_email_access=folder_upload_email_access,
@@ -367,7 +474,8 @@ async def box_folder_tag_add_tool(
         dict[str, Any]: Dictionary containing the updated folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_tag_add(
+    return await run_blocking(
+        box_folder_tag_add,
         client=client,
         folder_id=folder_id,
         tag=tag,
@@ -389,7 +497,8 @@ async def box_folder_tag_remove_tool(
         dict[str, Any]: Dictionary containing the updated folder object or error message
     """
     client = get_box_client(ctx)
-    return box_folder_tag_remove(
+    return await run_blocking(
+        box_folder_tag_remove,
         client=client,
         folder_id=folder_id,
         tag=tag,
@@ -3,7 +3,9 @@ from typing import cast
 from box_ai_agents_toolkit import BoxClient, authorize_app
 from mcp.server.fastmcp import Context
 
-from server_context import BoxContext
+from executor import run_blocking
+from server_context import BoxContext, get_enterprise_cache, hash_token
+from tools.box_api_async import box_user_enterprise_id_async
 
 
 def get_box_client(ctx: Context) -> BoxClient:
@@ -15,14 +17,47 @@ def get_box_client(ctx: Context) -> BoxClient:
     """
     box_context = cast(BoxContext, ctx.request_context.lifespan_context)
 
-    # For OAuth mode, we need the request to extract the token
-    if box_context.client is None:
-        # Store the request in the context if not already there
-        if box_context.request is None and ctx.request_context.request is not None:
-            box_context.request = ctx.request_context.request
+    # For OAuth mode, the token comes from this call's own request. The
+    # lifespan context is shared, so the request is never stored on it.
+    return box_context.get_active_client(ctx.request_context.request)
 
-    # Use the new get_active_client() method which handles both modes
-    return box_context.get_active_client()
+
+def get_caller_identity(ctx: Context) -> str:
+    """Return a key identifying the caller for per-user caches.
+
+    This is the hash of the MCP client's bearer token in OAuth and mcp_client
+    mode, and an empty string when every call uses the server's own account.
+    """
+    try:
+        request = ctx.request_context.request
+    except (AttributeError, ValueError):
+        return ""
+    token = request.scope.get("oauth_token") if request is not None else None
+    return hash_token(token) if isinstance(token, str) and token else ""
+
+
+async def get_caller_enterprise(ctx: Context, client: BoxClient) -> str:
+    """Return a key identifying the caller's enterprise for per-enterprise caches.
+
+    Callers of one enterprise share the key "enterprise.<id>", read once per
+    token from users/me. Users outside any enterprise, or whose enterprise
+    cannot be read, are keyed by get_caller_identity, and calls with the
+    server's own account by an empty string.
+    """
+    identity = get_caller_identity(ctx)
+    if not identity:
+        return ""
+    cache = get_enterprise_cache()
+    key = cache.get(identity)
+    if key is None:
+        try:
+            enterprise_id = await box_user_enterprise_id_async(client)
+        except Exception:
+            # Not cached, the next call asks again
+            return identity
+        key = f"enterprise.{enterprise_id}" if enterprise_id else identity
+        cache.set(identity, key)
+    return key
 
 
 async def box_who_am_i(ctx: Context) -> dict:
@@ -34,7 +69,8 @@ async def box_who_am_i(ctx: Context) -> dict:
         dict: The current user's information.
     """
     box_client = get_box_client(ctx)
-    return box_client.users.get_user_me().to_dict()
+    current_user = await run_blocking(box_client.users.get_user_me)
+    return current_user.to_dict()
     # return f"Authenticated as: {current_user.name}"
 
 
@@ -46,7 +82,7 @@ async def box_authorize_app_tool() -> str:
     return:
         str: Message
     """
-    result = authorize_app()
+    result = await run_blocking(authorize_app)
     if result:
         return "Box application authorized successfully"
     else:
@@ -5,7 +5,16 @@ from box_ai_agents_toolkit import (
 )
 from mcp.server.fastmcp import Context
 
-from tools.box_tools_generic import get_box_client
+from cache.group_index import get_group_index
+from executor import run_blocking
+from http_pool import async_reads_enabled
+from tools.box_api_async import (
+    BoxAsyncAPIError,
+    box_groups_list_by_user_async,
+    box_groups_list_members_async,
+    box_groups_search_async,
+)
+from tools.box_tools_generic import get_box_client, get_caller_identity
 
 
 async def box_groups_search_tool(ctx: Context, query: str) -> dict:
@@ -16,7 +25,16 @@ async def box_groups_search_tool(ctx: Context, query: str) -> dict:
     Returns:
         dict: A dictionary containing the list of matching groups."""
     client = get_box_client(ctx)
-    return box_groups_search(client, query)
+    index = get_group_index()
+    if index.enabled:
+        try:
+            groups = await index.search(client, query, get_caller_identity(ctx))
+        except BoxAsyncAPIError as e:
+            return {"error": e.message}
+        return {"groups": groups} if groups else {"message": "No groups found."}
+    if async_reads_enabled():
+        return await box_groups_search_async(client, query)
+    return await run_blocking(box_groups_search, client, query)
 
 
 async def box_groups_list_members_tool(ctx: Context, group_id: str) -> dict:
@@ -27,7 +45,20 @@ async def box_groups_list_members_tool(ctx: Context, group_id: str) -> dict:
     Returns:
         dict: A dictionary containing the list of group members."""
     client = get_box_client(ctx)
-    return box_groups_list_members(client, group_id)
+    index = get_group_index()
+    if index.enabled:
+        try:
+            memberships = await index.list_members(
+                client, group_id, get_caller_identity(ctx)
+            )
+        except BoxAsyncAPIError as e:
+            return {"error": e.message}
+        if not memberships:
+            return {"message": "No members found for the group."}
+        return {"memberships": memberships}
+    if async_reads_enabled():
+        return await box_groups_list_members_async(client, group_id)
+    return await run_blocking(box_groups_list_members, client, group_id)
 
 
 async def box_groups_list_by_user_tool(ctx: Context, user_id: str) -> dict:
@@ -38,4 +69,17 @@ async def box_groups_list_by_user_tool(ctx: Context, user_id: str) -> dict:
     Returns:
         dict: A dictionary containing the list of groups the user belongs to."""
     client = get_box_client(ctx)
-    return box_groups_list_by_user(client, user_id)
+    index = get_group_index()
+    if index.enabled:
+        try:
+            memberships = await index.list_by_user(
+                client, user_id, get_caller_identity(ctx)
+            )
+        except BoxAsyncAPIError as e:
+            return {"error": e.message}
+        if not memberships:
+            return {"message": "No groups found for the user."}
+        return {"memberships": memberships}
+    if async_reads_enabled():
+        return await box_groups_list_by_user_async(client, user_id)
+    return await run_blocking(box_groups_list_by_user, client, user_id)
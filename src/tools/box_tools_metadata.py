@@ -1,6 +1,7 @@
 from typing import Any, Dict, List, Optional
 
 from box_ai_agents_toolkit import (
+    BoxClient,
     box_metadata_delete_instance_on_file,
     box_metadata_get_instance_on_file,
     box_metadata_set_instance_on_file,
@@ -8,11 +9,64 @@ from box_ai_agents_toolkit import (
     box_metadata_template_get_by_key,
     box_metadata_template_get_by_name,
     box_metadata_template_list,
-    box_metadata_update_instance_on_file,
 )
 from mcp.server.fastmcp import Context
 
-from tools.box_tools_generic import get_box_client
+from cache.metadata_instances import get_metadata_instance_cache
+from cache.metadata_templates import (
+    MetadataTemplateError,
+    get_metadata_template_cache,
+)
+from executor import run_blocking
+from http_pool import async_reads_enabled
+from metadata_validation import MetadataValidationError
+from tools.box_api_async import (
+    box_metadata_get_instance_on_file_async,
+    box_metadata_update_instance_on_file_async,
+    metadata_instance_fields,
+)
+from tools.box_tools_generic import (
+    get_box_client,
+    get_caller_enterprise,
+    get_caller_identity,
+)
+
+
+async def _validate_metadata(
+    ctx: Context, box_client: BoxClient, template_key: str, metadata: dict
+) -> dict:
+    """
+    Check metadata against the cached template before it is sent to Box.
+
+    Returns the metadata with coerced values, or unchanged when the template
+    is not in the cache.
+
+    Raises:
+        MetadataValidationError: If the metadata does not match the template
+    """
+    cache = get_metadata_template_cache()
+    if not cache.enabled:
+        return metadata
+    try:
+        validator = await cache.get_validator(
+            box_client, template_key, await get_caller_enterprise(ctx, box_client)
+        )
+    except MetadataTemplateError:
+        return metadata
+    if validator is None:
+        return metadata
+    return validator.validate(metadata)
+
+
+def _remember_instance(
+    ctx: Context, file_id: str, template_key: str, result: dict
+) -> None:
+    """Keep the field values of an instance returned by Box for later diffs."""
+    if "metadata_instance" in result:
+        get_metadata_instance_cache().set(
+            (get_caller_identity(ctx), file_id, template_key),
+            metadata_instance_fields(result["metadata_instance"]),
+        )
 
 
 async def box_metadata_template_create_tool(
@@ -73,9 +127,18 @@ async def box_metadata_template_create_tool(
         dict: The created metadata template.
     """
     box_client = get_box_client(ctx)
-    return box_metadata_template_create(
-        box_client, display_name, fields, template_key=template_key
+    result = await run_blocking(
+        box_metadata_template_create,
+        box_client,
+        display_name,
+        fields,
+        template_key=template_key,
     )
+    if "error" not in result:
+        get_metadata_template_cache().invalidate(
+            await get_caller_enterprise(ctx, box_client)
+        )
+    return result
 
 
 async def box_metadata_template_list_tool(ctx: Context) -> dict:
@@ -89,7 +152,16 @@ async def box_metadata_template_list_tool(ctx: Context) -> dict:
         dict: A list of all metadata templates.
     """
     box_client = get_box_client(ctx)
-    return box_metadata_template_list(box_client)
+    cache = get_metadata_template_cache()
+    if not cache.enabled:
+        return await run_blocking(box_metadata_template_list, box_client)
+    try:
+        index = await cache.get_index(
+            box_client, await get_caller_enterprise(ctx, box_client)
+        )
+    except MetadataTemplateError as e:
+        return {"error": str(e)}
+    return {"metadata_templates": index.templates}
 
 
 async def box_metadata_template_get_by_key_tool(
@@ -106,7 +178,20 @@ async def box_metadata_template_get_by_key_tool(
         dict: The metadata template associated with the provided key.
     """
     box_client = get_box_client(ctx)
-    return box_metadata_template_get_by_key(box_client, template_key)
+    cache = get_metadata_template_cache()
+    if cache.enabled:
+        try:
+            template = await cache.get_template(
+                box_client, template_key, await get_caller_enterprise(ctx, box_client)
+            )
+            if template is not None:
+                return {"metadata_template": template}
+        except MetadataTemplateError:
+            pass
+    # Not in the enterprise list, Box reports why
+    return await run_blocking(
+        box_metadata_template_get_by_key, box_client, template_key
+    )
 
 
 async def box_metadata_template_get_by_name_tool(
@@ -123,7 +208,20 @@ async def box_metadata_template_get_by_name_tool(
         dict: The metadata template associated with the provided name.
     """
     box_client = get_box_client(ctx)
-    return box_metadata_template_get_by_name(box_client, template_name)
+    cache = get_metadata_template_cache()
+    if not cache.enabled:
+        return await run_blocking(
+            box_metadata_template_get_by_name, box_client, template_name
+        )
+    try:
+        template = await cache.find_template_by_name(
+            box_client, template_name, await get_caller_enterprise(ctx, box_client)
+        )
+    except MetadataTemplateError:
+        return {"message": "No templates found"}
+    if template is None:
+        return {"message": "Template not found"}
+    return {"metadata_template": template}
 
 
 async def box_metadata_set_instance_on_file_tool(
@@ -147,9 +245,15 @@ async def box_metadata_set_instance_on_file_tool(
         dict: The response from the Box API after setting the metadata.
     """
     box_client = get_box_client(ctx)
-    return box_metadata_set_instance_on_file(
-        box_client, template_key, file_id, metadata
+    try:
+        metadata = await _validate_metadata(ctx, box_client, template_key, metadata)
+    except MetadataValidationError as e:
+        return {"error": str(e)}
+    result = await run_blocking(
+        box_metadata_set_instance_on_file, box_client, template_key, file_id, metadata
     )
+    _remember_instance(ctx, file_id, template_key, result)
+    return result
 
 
 async def box_metadata_get_instance_on_file_tool(
@@ -169,7 +273,16 @@ async def box_metadata_get_instance_on_file_tool(
         dict: The metadata instance associated with the file.
     """
     box_client = get_box_client(ctx)
-    return box_metadata_get_instance_on_file(box_client, file_id, template_key)
+    if async_reads_enabled():
+        result = await box_metadata_get_instance_on_file_async(
+            box_client, file_id, template_key
+        )
+    else:
+        result = await run_blocking(
+            box_metadata_get_instance_on_file, box_client, file_id, template_key
+        )
+    _remember_instance(ctx, file_id, template_key, result)
+    return result
 
 
 async def box_metadata_update_instance_on_file_tool(
@@ -186,20 +299,30 @@ async def box_metadata_update_instance_on_file_tool(
         ctx (Context): The context object containing the request and lifespan context.
         file_id (str): The ID of the file to update the metadata on.
         template_key (str): The key of the metadata template.
-        metadata (dict): The metadata to update.
+        metadata (dict): The metadata to update, a None value removes the field.
         remove_non_included_data (bool): If True, remove data from fields not included in the metadata.
 
     Returns:
         dict: The response from the Box API after updating the metadata.
     """
     box_client = get_box_client(ctx)
-    return box_metadata_update_instance_on_file(
+    try:
+        metadata = await _validate_metadata(ctx, box_client, template_key, metadata)
+    except MetadataValidationError as e:
+        return {"error": str(e)}
+    key = (get_caller_identity(ctx), file_id, template_key)
+    result = await box_metadata_update_instance_on_file_async(
         box_client,
         file_id,
         template_key,
         metadata,
         remove_non_included_data=remove_non_included_data,
+        current=get_metadata_instance_cache().get(key),
     )
+    if "error" in result:
+        get_metadata_instance_cache().pop(key)
+    _remember_instance(ctx, file_id, template_key, result)
+    return result
 
 
 async def box_metadata_delete_instance_on_file_tool(
@@ -219,4 +342,7 @@ async def box_metadata_delete_instance_on_file_tool(
         dict: The response from the Box API after deleting the metadata.
     """
     box_client = get_box_client(ctx)
-    return box_metadata_delete_instance_on_file(box_client, file_id, template_key)
+    get_metadata_instance_cache().pop((get_caller_identity(ctx), file_id, template_key))
+    return await run_blocking(
+        box_metadata_delete_instance_on_file, box_client, file_id, template_key
+    )
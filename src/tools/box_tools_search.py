@@ -1,13 +1,29 @@
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from box_ai_agents_toolkit import (
     SearchForContentContentTypes,
     box_locate_folder_by_name,
     box_search,
 )
+from box_sdk_gen import BoxClient
 from mcp.server.fastmcp import Context
 
-from tools.box_tools_generic import get_box_client
+from cache.content_index import get_content_index
+from cache.folder_mirror import get_folder_mirror
+from executor import run_blocking
+from http_pool import async_reads_enabled
+from tools.box_api_async import (
+    SEARCH_MAX_OFFSET,
+    BoxAsyncAPIError,
+    box_search_async,
+    box_search_sharded_async,
+    iter_search_pages_async,
+    search_shards,
+)
+from tools.box_tools_generic import get_box_client, get_caller_identity
+
+# Results of a search page when only offset or fields is given, as in Box
+DEFAULT_SEARCH_LIMIT = 30
 
 
 async def box_search_tool(
@@ -16,10 +32,23 @@ async def box_search_tool(
     file_extensions: List[str] | None = None,
     where_to_look_for_query: List[str] | None = None,
     ancestor_folder_ids: List[str] | None = None,
-) -> List[dict]:
+    limit: Optional[int] = None,
+    offset: int = 0,
+    fields: List[str] | None = None,
+) -> List[dict] | Dict[str, Any]:
     """
     Search for files in Box with the given query.
 
+    Pass limit, offset or fields to get one page of results: a dictionary
+    with the results, the total_count and, while more results remain, the
+    next_offset to pass back for the next page. Only the requested fields
+    are returned for each result.
+
+    A first page over several ancestor folders, or over more than five file
+    extensions, is searched in concurrent shards and merged. Such a page has
+    no next_offset, its total_count adds up the totals of the shards, and it
+    is marked partial if some shards did not finish in time.
+
     Args:
         query (str): The query to search for.
         file_extensions (List[str]): The file extensions to search for, for example *.pdf
@@ -30,8 +59,11 @@ async def box_search_tool(
             COMMENTS,
             TAG,
         ancestor_folder_ids (List[str]): The ancestor folder IDs to search in.
+        limit (int, optional): Maximum number of results of the page. Defaults to 30.
+        offset (int, optional): Position of the first result, the next_offset of the previous page.
+        fields (List[str], optional): Fields of each result, e.g. ["name", "size", "modified_at"]. Defaults to id, name, type, size and description.
     return:
-        List[dict]: The search results.
+        List[dict] | dict: The search results, or a page of results if limit, offset or fields is given.
     """
     box_client = get_box_client(ctx)
 
@@ -41,23 +73,144 @@ async def box_search_tool(
         for content_type in where_to_look_for_query:
             content_types.append(SearchForContentContentTypes[content_type])
 
+    if limit is not None or offset or fields:
+        return await _search_page(
+            ctx,
+            box_client,
+            query,
+            file_extensions,
+            content_types,
+            ancestor_folder_ids,
+            limit or DEFAULT_SEARCH_LIMIT,
+            offset,
+            fields,
+        )
+
     # Search for files with the query
-    search_results = box_search(
-        box_client, query, file_extensions, content_types, ancestor_folder_ids
+    if async_reads_enabled():
+        return await box_search_async(
+            box_client, query, file_extensions, content_types, ancestor_folder_ids
+        )
+    search_results = await run_blocking(
+        box_search,
+        box_client,
+        query,
+        file_extensions,
+        content_types,
+        ancestor_folder_ids,
     )
 
     return [search_result.to_dict() for search_result in search_results]
 
 
+async def _search_page(
+    ctx: Context,
+    box_client: BoxClient,
+    query: str,
+    file_extensions: List[str] | None,
+    content_types: List[SearchForContentContentTypes],
+    ancestor_folder_ids: List[str] | None,
+    limit: int,
+    offset: int,
+    fields: List[str] | None,
+) -> Dict[str, Any]:
+    """Collect one page of search results, reporting progress per API page."""
+    if offset == 0 and len(search_shards(ancestor_folder_ids, file_extensions)) > 1:
+        try:
+            return await box_search_sharded_async(
+                box_client,
+                query,
+                file_extensions,
+                content_types,
+                ancestor_folder_ids,
+                fields=fields,
+                limit=limit,
+            )
+        except BoxAsyncAPIError as e:
+            return {"error": e.message}
+
+    results: List[dict] = []
+    total_count = 0
+    try:
+        async for page, total_count in iter_search_pages_async(
+            box_client,
+            query,
+            file_extensions,
+            content_types,
+            ancestor_folder_ids,
+            fields=fields,
+            offset=offset,
+            limit=limit,
+        ):
+            results.extend(page)
+            await ctx.report_progress(len(results), min(limit, total_count - offset))
+    except BoxAsyncAPIError as e:
+        return {"error": e.message}
+
+    response: Dict[str, Any] = {"results": results, "total_count": total_count}
+    next_offset = offset + len(results)
+    if results and next_offset < min(total_count, SEARCH_MAX_OFFSET):
+        response["next_offset"] = next_offset
+    return response
+
+
+async def box_local_search_tool(
+    ctx: Context,
+    query: str,
+    limit: int = 10,
+    ancestor_folder_ids: List[str] | None = None,
+) -> Dict[str, Any]:
+    """
+    Search the text of the files in the locally indexed folders.
+
+    Answers in milliseconds from the local full-text index, ranked by
+    relevance, with a snippet of each file around the query words. If the
+    index is out of date, disabled, or does not cover ancestor_folder_ids,
+    the indexed folders are searched with box_search_tool instead. The
+    source of the response tells which one answered.
+
+    Args:
+        query (str): The words to search for.
+        limit (int, optional): Maximum number of results. Defaults to 10.
+        ancestor_folder_ids (List[str], optional): Only return files below these folders.
+    return:
+        dict: The source, the results and the total_count of matching files.
+    """
+    index = get_content_index()
+    found = await index.search(
+        query, limit, ancestor_folder_ids, get_caller_identity(ctx)
+    )
+    if found is not None:
+        return {"source": "local_index", **found}
+    page = await box_search_tool(
+        ctx,
+        query,
+        ancestor_folder_ids=ancestor_folder_ids or index.roots or None,
+        limit=limit,
+    )
+    return {"source": "box_search", **page}
+
+
 async def box_search_folder_by_name_tool(ctx: Context, folder_name: str) -> List[dict]:
     """
     Locate a folder in Box by its name.
 
+    When the folder mirror holds the whole account, the mirrored folders
+    whose name contains folder_name are returned without a search.
+    Otherwise Box is searched.
+
     Args:
         folder_name (str): The name of the folder to locate.
     return:
         List[dict]: The folder ID.
     """
+    mirrored = await get_folder_mirror().find_folders(
+        folder_name, get_caller_identity(ctx)
+    )
+    if mirrored is not None:
+        return mirrored
     box_client = get_box_client(ctx)
-    search_results = box_locate_folder_by_name(box_client, folder_name)
+    search_results = await run_blocking(
+        box_locate_folder_by_name, box_client, folder_name
+    )
     return [search_result.to_dict() for search_result in search_results]
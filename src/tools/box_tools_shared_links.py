@@ -16,6 +16,7 @@ from box_ai_agents_toolkit import (
 )
 from mcp.server.fastmcp import Context
 
+from executor import run_blocking
 from tools.box_tools_generic import get_box_client
 
 
@@ -31,7 +32,7 @@ async def box_shared_link_file_get_tool(ctx: Context, file_id: str) -> dict:
         dict: The response from the Box API containing the shared link details.
     """
     box_client = get_box_client(ctx)
-    return box_shared_link_file_get(box_client, file_id=file_id)
+    return await run_blocking(box_shared_link_file_get, box_client, file_id=file_id)
 
 
 async def box_shared_link_file_create_or_update_tool(
@@ -60,7 +61,8 @@ async def box_shared_link_file_create_or_update_tool(
         dict: The response from the Box API after creating or updating the shared link.
     """
     box_client = get_box_client(ctx)
-    return box_shared_link_file_create_or_update(
+    return await run_blocking(
+        box_shared_link_file_create_or_update,
         box_client,
         file_id=file_id,
         access=access,
@@ -85,7 +87,7 @@ async def box_shared_link_file_remove_tool(ctx: Context, file_id: str) -> dict:
         dict: The response from the Box API after removing the shared link.
     """
     box_client = get_box_client(ctx)
-    return box_shared_link_file_remove(box_client, file_id=file_id)
+    return await run_blocking(box_shared_link_file_remove, box_client, file_id=file_id)
 
 
 async def box_shared_link_file_find_by_shared_link_url_tool(
@@ -103,8 +105,11 @@ async def box_shared_link_file_find_by_shared_link_url_tool(
         dict: The response from the Box API containing the file details.
     """
     box_client = get_box_client(ctx)
-    return box_shared_link_file_find_by_shared_link_url(
-        box_client, shared_link_url=shared_link_url, password=password
+    return await run_blocking(
+        box_shared_link_file_find_by_shared_link_url,
+        box_client,
+        shared_link_url=shared_link_url,
+        password=password,
     )
 
 
@@ -119,7 +124,9 @@ async def box_shared_link_folder_get_tool(ctx: Context, folder_id: str) -> dict:
         dict: The response from the Box API containing the shared link details.
     """
     box_client = get_box_client(ctx)
-    return box_shared_link_folder_get(box_client, folder_id=folder_id)
+    return await run_blocking(
+        box_shared_link_folder_get, box_client, folder_id=folder_id
+    )
 
 
 async def box_shared_link_folder_create_or_update_tool(
@@ -148,7 +155,8 @@ async def box_shared_link_folder_create_or_update_tool(
         dict: The response from the Box API after creating or updating the shared link.
     """
     box_client = get_box_client(ctx)
-    return box_shared_link_folder_create_or_update(
+    return await run_blocking(
+        box_shared_link_folder_create_or_update,
         box_client,
         folder_id=folder_id,
         access=access,
@@ -173,7 +181,9 @@ async def box_shared_link_folder_remove_tool(ctx: Context, folder_id: str) -> di
         dict: The response from the Box API after removing the shared link.
     """
     box_client = get_box_client(ctx)
-    return box_shared_link_folder_remove(box_client, folder_id=folder_id)
+    return await run_blocking(
+        box_shared_link_folder_remove, box_client, folder_id=folder_id
+    )
 
 
 async def box_shared_link_folder_find_by_shared_link_url_tool(
@@ -191,8 +201,11 @@ async def box_shared_link_folder_find_by_shared_link_url_tool(
         dict: The response from the Box API containing the folder details.
     """
     box_client = get_box_client(ctx)
-    return box_shared_link_folder_find_by_shared_link_url(
-        box_client, shared_link_url=shared_link_url, password=password
+    return await run_blocking(
+        box_shared_link_folder_find_by_shared_link_url,
+        box_client,
+        shared_link_url=shared_link_url,
+        password=password,
     )
 
 
@@ -219,7 +232,8 @@ async def box_shared_link_web_link_create_or_update_tool(
         dict: The response from the Box API after creating or updating the shared link.
     """
     box_client = get_box_client(ctx)
-    return box_shared_link_web_link_create_or_update(
+    return await run_blocking(
+        box_shared_link_web_link_create_or_update,
         box_client,
         web_link_id=web_link_id,
         access=access,
@@ -239,7 +253,9 @@ async def box_shared_link_web_link_get_tool(ctx: Context, web_link_id: str) -> d
         dict: The response from the Box API containing the shared link details.
     """
     box_client = get_box_client(ctx)
-    return box_shared_link_web_link_get(box_client, web_link_id=web_link_id)
+    return await run_blocking(
+        box_shared_link_web_link_get, box_client, web_link_id=web_link_id
+    )
 
 
 async def box_shared_link_web_link_remove_tool(ctx: Context, web_link_id: str) -> dict:
@@ -254,7 +270,9 @@ async def box_shared_link_web_link_remove_tool(ctx: Context, web_link_id: str) -
         dict: The response from the Box API after removing the shared link.
     """
     box_client = get_box_client(ctx)
-    return box_shared_link_web_link_remove(box_client, web_link_id=web_link_id)
+    return await run_blocking(
+        box_shared_link_web_link_remove, box_client, web_link_id=web_link_id
+    )
 
 
 async def box_shared_link_web_link_find_by_shared_link_url_tool(
@@ -272,6 +290,9 @@ async def box_shared_link_web_link_find_by_shared_link_url_tool(
         dict: The response from the Box API containing the web link details.
     """
     box_client = get_box_client(ctx)
-    return box_shared_link_web_link_find_by_shared_link_url(
-        box_client, shared_link_url=shared_link_url, password=password
+    return await run_blocking(
+        box_shared_link_web_link_find_by_shared_link_url,
+        box_client,
+        shared_link_url=shared_link_url,
+        password=password,
     )
@@ -16,6 +16,7 @@ from box_ai_agents_toolkit import (
 )
 from mcp.server.fastmcp import Context
 
+from executor import run_blocking
 from tools.box_tools_generic import get_box_client
 
 
@@ -30,7 +31,7 @@ async def box_task_assign_by_email_tool(ctx: Context, task_id: str, email: str)
         dict: The response from the Box API after assigning the task.
     """
     box_client = get_box_client(ctx)
-    response = box_task_assign_by_email(box_client, task_id, email)
+    response = await run_blocking(box_task_assign_by_email, box_client, task_id, email)
     return response
 
 
@@ -47,7 +48,9 @@ async def box_task_assign_by_user_id_tool(
         dict: The response from the Box API after assigning the task.
     """
     box_client = get_box_client(ctx)
-    response = box_task_assign_by_user_id(box_client, task_id, user_id)
+    response = await run_blocking(
+        box_task_assign_by_user_id, box_client, task_id, user_id
+    )
     return response
 
 
@@ -61,7 +64,9 @@ async def box_task_assignment_details_tool(ctx: Context, assignment_id: str) ->
         dict: The response from the Box API with the task assignment details.
     """
     box_client = get_box_client(ctx)
-    response = box_task_assignment_details(box_client, assignment_id)
+    response = await run_blocking(
+        box_task_assignment_details, box_client, assignment_id
+    )
     return response
 
 
@@ -75,7 +80,7 @@ async def box_task_assignment_remove_tool(ctx: Context, assignment_id: str) -> d
         dict: The response from the Box API after removing the task assignment.
     """
     box_client = get_box_client(ctx)
-    response = box_task_assignment_remove(box_client, assignment_id)
+    response = await run_blocking(box_task_assignment_remove, box_client, assignment_id)
     return response
 
 
@@ -96,8 +101,12 @@ async def box_task_assignment_update_tool(
         dict: The response from the Box API after updating the task assignment.
     """
     box_client = get_box_client(ctx)
-    response = box_task_assignment_update(
-        box_client, assignment_id, is_positive_outcome, message
+    response = await run_blocking(
+        box_task_assignment_update,
+        box_client,
+        assignment_id,
+        is_positive_outcome,
+        message,
     )
     return response
 
@@ -112,7 +121,7 @@ async def box_task_assignments_list_tool(ctx: Context, task_id: str) -> dict:
         dict: The response from the Box API with the list of task assignments.
     """
     box_client = get_box_client(ctx)
-    response = box_task_assignments_list(box_client, task_id)
+    response = await run_blocking(box_task_assignments_list, box_client, task_id)
     return response
 
 
@@ -135,8 +144,13 @@ async def box_task_complete_create_tool(
         dict: The response from the Box API after creating the completion task.
     """
     box_client = get_box_client(ctx)
-    response = box_task_complete_create(
-        box_client, file_id, due_at, message, requires_all_assignees_to_complete
+    response = await run_blocking(
+        box_task_complete_create,
+        box_client,
+        file_id,
+        due_at,
+        message,
+        requires_all_assignees_to_complete,
     )
     return response
 
@@ -151,7 +165,7 @@ async def box_task_details_tool(ctx: Context, task_id: str) -> dict:
         dict: The response from the Box API with the task details.
     """
     box_client = get_box_client(ctx)
-    response = box_task_details(box_client, task_id)
+    response = await run_blocking(box_task_details, box_client, task_id)
     return response
 
 
@@ -165,7 +179,7 @@ async def box_task_file_list_tool(ctx: Context, file_id: str) -> dict:
         dict: The response from the Box API with the list of tasks.
     """
     box_client = get_box_client(ctx)
-    response = box_task_file_list(box_client, file_id)
+    response = await run_blocking(box_task_file_list, box_client, file_id)
     return response
 
 
@@ -179,7 +193,7 @@ async def box_task_remove_tool(ctx: Context, task_id: str) -> dict:
         dict: The response from the Box API after removing the task.
     """
     box_client = get_box_client(ctx)
-    response = box_task_remove(box_client, task_id)
+    response = await run_blocking(box_task_remove, box_client, task_id)
     return response
 
 
@@ -202,8 +216,13 @@ async def box_task_review_create_tool(
         dict: The response from the Box API after creating the review task.
     """
     box_client = get_box_client(ctx)
-    response = box_task_review_create(
-        box_client, file_id, due_at, message, requires_all_assignees_to_complete
+    response = await run_blocking(
+        box_task_review_create,
+        box_client,
+        file_id,
+        due_at,
+        message,
+        requires_all_assignees_to_complete,
     )
     return response
 
@@ -227,7 +246,12 @@ async def box_task_update_tool(
         dict: The response from the Box API after updating the task.
     """
     box_client = get_box_client(ctx)
-    response = box_task_update(
-        box_client, task_id, due_at, message, requires_all_assignees_to_complete
+    response = await run_blocking(
+        box_task_update,
+        box_client,
+        task_id,
+        due_at,
+        message,
+        requires_all_assignees_to_complete,
     )
     return response
@@ -1,4 +1,7 @@
+from typing import Optional
+
 from box_ai_agents_toolkit import (
+    BoxClient,
     box_users_list,
     box_users_locate_by_email,
     box_users_locate_by_name,
@@ -6,7 +9,28 @@ from box_ai_agents_toolkit import (
 )
 from mcp.server.fastmcp import Context
 
-from tools.box_tools_generic import get_box_client
+from cache.user_directory import UserDirectory, get_user_directory
+from executor import run_blocking
+from http_pool import async_reads_enabled
+from tools.box_api_async import (
+    box_users_list_async,
+    box_users_locate_by_email_async,
+    box_users_locate_by_name_async,
+    box_users_search_by_name_or_email_async,
+)
+from tools.box_tools_generic import get_box_client, get_caller_enterprise
+
+
+async def _user_directory(ctx: Context, client: BoxClient) -> Optional[UserDirectory]:
+    """Return the directory of the caller's enterprise, None if disabled or failing."""
+    directory = get_user_directory()
+    if not directory.enabled:
+        return None
+    try:
+        return await directory.get(client, await get_caller_enterprise(ctx, client))
+    except Exception:
+        # Already logged by the cache, the tool asks Box directly
+        return None
 
 
 async def box_users_list_tool(ctx: Context) -> dict:
@@ -16,7 +40,12 @@ async def box_users_list_tool(ctx: Context) -> dict:
     Returns:
         dict: A dictionary containing the list of users."""
     client = get_box_client(ctx)
-    return box_users_list(client)
+    directory = await _user_directory(ctx, client)
+    if directory is not None:
+        return {"users": directory.users()}
+    if async_reads_enabled():
+        return await box_users_list_async(client)
+    return await run_blocking(box_users_list, client)
 
 
 async def box_users_locate_by_name_tool(ctx: Context, name: str) -> dict:
@@ -27,7 +56,15 @@ async def box_users_locate_by_name_tool(ctx: Context, name: str) -> dict:
     Returns:
         dict: A dictionary containing the user information if found, otherwise a message with no user found."""
     client = get_box_client(ctx)
-    return box_users_locate_by_name(client, name)
+    directory = await _user_directory(ctx, client)
+    if directory is not None:
+        user = directory.locate_by_name(name)
+        # Users created since the directory was loaded are looked up in Box
+        if user is not None:
+            return {"user": user}
+    if async_reads_enabled():
+        return await box_users_locate_by_name_async(client, name)
+    return await run_blocking(box_users_locate_by_name, client, name)
 
 
 async def box_users_locate_by_email_tool(ctx: Context, email: str) -> dict:
@@ -38,7 +75,14 @@ async def box_users_locate_by_email_tool(ctx: Context, email: str) -> dict:
     Returns:
         dict: A dictionary containing the user information if found, otherwise a message with no user found."""
     client = get_box_client(ctx)
-    return box_users_locate_by_email(client, email)
+    directory = await _user_directory(ctx, client)
+    if directory is not None:
+        user = directory.locate_by_email(email)
+        if user is not None:
+            return {"user": user}
+    if async_reads_enabled():
+        return await box_users_locate_by_email_async(client, email)
+    return await run_blocking(box_users_locate_by_email, client, email)
 
 
 async def box_users_search_by_name_or_email_tool(ctx: Context, query: str) -> dict:
@@ -49,4 +93,9 @@ async def box_users_search_by_name_or_email_tool(ctx: Context, query: str) -> di
     Returns:
         dict: A dictionary containing the list of matching users."""
     client = get_box_client(ctx)
-    return box_users_search_by_name_or_email(client, query)
+    directory = await _user_directory(ctx, client)
+    if directory is not None:
+        return {"users": directory.search(query)}
+    if async_reads_enabled():
+        return await box_users_search_by_name_or_email_async(client, query)
+    return await run_blocking(box_users_search_by_name_or_email, client, query)
@@ -6,6 +6,7 @@ from box_ai_agents_toolkit import (
 )
 from mcp.server.fastmcp import Context
 
+from executor import run_blocking
 from tools.box_tools_generic import get_box_client
 
 
@@ -30,7 +31,8 @@ async def box_web_link_create_tool(
         dict: The response from the Box API after creating the web link.
     """
     box_client = get_box_client(ctx)
-    return box_web_link_create(
+    return await run_blocking(
+        box_web_link_create,
         box_client,
         url=url,
         parent_folder_id=parent_folder_id,
@@ -51,7 +53,9 @@ async def box_web_link_get_by_id_tool(ctx: Context, web_link_id: str) -> dict:
         dict: The response from the Box API containing the web link details.
     """
     box_client = get_box_client(ctx)
-    return box_web_link_get_by_id(box_client, web_link_id=web_link_id)
+    return await run_blocking(
+        box_web_link_get_by_id, box_client, web_link_id=web_link_id
+    )
 
 
 async def box_web_link_update_by_id_tool(
@@ -76,7 +80,8 @@ async def box_web_link_update_by_id_tool(
         dict: The response from the Box API after updating the web link.
     """
     box_client = get_box_client(ctx)
-    return box_web_link_update_by_id(
+    return await run_blocking(
+        box_web_link_update_by_id,
         box_client,
         web_link_id=web_link_id,
         url=url,
@@ -98,4 +103,6 @@ async def box_web_link_delete_by_id_tool(ctx: Context, web_link_id: str) -> dict
         dict: The response from the Box API after deleting the web link.
     """
     box_client = get_box_client(ctx)
-    return box_web_link_delete_by_id(box_client, web_link_id=web_link_id)
+    return await run_blocking(
+        box_web_link_delete_by_id, box_client, web_link_id=web_link_id
+    )
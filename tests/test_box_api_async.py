@@ -0,0 +1,562 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from urllib.parse import urlparse
+
+import pytest
+from box_ai_agents_toolkit import (
+    box_folder_info,
+    box_folder_items_list,
+    box_groups_list_members,
+    box_metadata_get_instance_on_file,
+    box_search,
+    box_users_locate_by_email,
+)
+from box_sdk_gen import (
+    BaseUrls,
+    BoxClient,
+    BoxDeveloperTokenAuth,
+    FolderMini,
+    NetworkSession,
+)
+
+from config import HttpConfig
+from http_pool import configure_http_pool
+from tools.box_api_async import (
+    BoxAsyncAPIError,
+    InvalidCursorError,
+    box_api_request,
+    box_folder_info_async,
+    box_folder_items_list_async,
+    box_folder_items_page_async,
+    box_groups_list_members_async,
+    box_metadata_get_instance_on_file_async,
+    box_metadata_update_instance_on_file_async,
+    box_search_async,
+    box_search_sharded_async,
+    box_user_enterprise_id_async,
+    box_users_locate_by_email_async,
+    crawl_folder_async,
+    iter_search_pages_async,
+    merge_ranked,
+    metadata_patch_operations,
+    search_shards,
+)
+from tools.box_tools_folders import box_folder_info_tool
+
+FOLDER = {
+    "type": "folder",
+    "id": "1",
+    "name": "Reports",
+    "etag": "1",
+    "created_at": "2024-01-01T10:00:00-08:00",
+    "path_collection": {"total_count": 0, "entries": []},
+    "item_status": "active",
+}
+ROUTES = {
+    "/2.0/folders/1": FOLDER,
+    "/2.0/folders/1/items": {
+        "entries": [
+            {"type": "folder", "id": "2", "name": "Q1", "etag": "0"},
+            {"type": "file", "id": "10", "name": "summary.pdf", "etag": "0"},
+        ],
+        "limit": 1000,
+    },
+    "/2.0/folders/2/items": {
+        "entries": [{"type": "file", "id": "11", "name": "jan.pdf", "etag": "0"}],
+        "limit": 1000,
+    },
+    "/2.0/search": {
+        "type": "search_results_items",
+        "entries": [{"type": "file", "id": "10", "name": "summary.pdf", "size": 12}],
+        "total_count": 1,
+        "limit": 30,
+        "offset": 0,
+    },
+    "/2.0/files/10/metadata/enterprise/invoice": {
+        "$parent": "file_10",
+        "$template": "invoice",
+        "$scope": "enterprise_1",
+        "$version": 0,
+        "amount": 100,
+    },
+    "/2.0/users": {
+        "entries": [
+            {"type": "user", "id": "5", "name": "Ann", "login": "ann@example.com"},
+            {"type": "user", "id": "6", "name": "Annie", "login": "annie@example.com"},
+        ],
+        "total_count": 2,
+        "limit": 1000,
+        "offset": 0,
+    },
+    "/2.0/users/me": {
+        "type": "user",
+        "id": "5",
+        "enterprise": {"type": "enterprise", "id": "42", "name": "Acme"},
+    },
+    "/2.0/groups/7/memberships": {
+        "entries": [
+            {
+                "type": "group_membership",
+                "id": "70",
+                "user": {"type": "user", "id": "5", "name": "Ann"},
+                "group": {"type": "group", "id": "7", "name": "Finance"},
+                "role": "member",
+            }
+        ],
+        "total_count": 1,
+        "limit": 1000,
+        "offset": 0,
+    },
+}
+
+
+class BoxApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Responses queued ahead of the routes, as (status, headers, body)
+    queued = []
+    requests = []
+    # JSON bodies of PUT requests
+    bodies = []
+
+    def do_PUT(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.bodies.append(json.loads(self.rfile.read(length)))
+        self.do_GET()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self.requests.append((url.path, dict(self.headers)))
+        if self.queued:
+            status, headers, body = self.queued.pop(0)
+        elif url.path in ROUTES:
+            status, headers, body = 200, {}, ROUTES[url.path]
+        else:
+            status, headers, body = 404, {}, {"type": "error", "message": "Not Found"}
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def box_api():
+    BoxApiHandler.queued = []
+    BoxApiHandler.requests = []
+    BoxApiHandler.bodies = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), BoxApiHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(box_api):
+    configure_http_pool(HttpConfig())
+    yield BoxClient(
+        auth=BoxDeveloperTokenAuth(token="token"),
+        network_session=NetworkSession(base_urls=BaseUrls(base_url=box_api)),
+    )
+    configure_http_pool(HttpConfig())
+
+
+@pytest.mark.asyncio
+async def test_folder_info_matches_toolkit(client):
+    assert await box_folder_info_async(client, "1") == box_folder_info(client, "1")
+
+
+@pytest.mark.asyncio
+async def test_folder_items_list_matches_toolkit(client):
+    expected = box_folder_items_list(client, "1", is_recursive=True)
+    result = await box_folder_items_list_async(client, "1", is_recursive=True)
+    assert result == expected
+    assert result["folder_items"][0]["items"][0]["name"] == "jan.pdf"
+
+
+@pytest.mark.asyncio
+async def test_search_matches_toolkit(client):
+    expected = [entry.to_dict() for entry in box_search(client, "summary")]
+    assert await box_search_async(client, "summary") == expected
+
+
+@pytest.mark.asyncio
+async def test_search_pages_are_projected_on_fields(client):
+    def entry(file_id):
+        return {
+            "type": "file",
+            "id": file_id,
+            "name": f"{file_id}.pdf",
+            "etag": "0",
+            "path_collection": {"total_count": 0, "entries": []},
+        }
+
+    BoxApiHandler.queued = [
+        (200, {}, {"entries": [entry("1"), entry("2")], "total_count": 5}),
+        (200, {}, {"entries": [entry("3")], "total_count": 5}),
+    ]
+    with patch("tools.box_api_async.SEARCH_PAGE_SIZE", 2):
+        pages = [
+            page
+            async for page in iter_search_pages_async(
+                client, "pdf", fields=["name"], limit=3
+            )
+        ]
+    assert pages == [
+        (
+            [
+                {"type": "file", "id": "1", "name": "1.pdf"},
+                {"type": "file", "id": "2", "name": "2.pdf"},
+            ],
+            5,
+        ),
+        ([{"type": "file", "id": "3", "name": "3.pdf"}], 5),
+    ]
+    assert len(BoxApiHandler.requests) == 2
+
+
+def test_search_shards_split_folders_and_extension_groups():
+    extensions = ["pdf", "docx", "xlsx", "pptx", "txt", "md"]
+    assert search_shards(["1", "2"], extensions) == [
+        (["1"], ["pdf", "docx", "xlsx", "pptx", "txt"]),
+        (["1"], ["md"]),
+        (["2"], ["pdf", "docx", "xlsx", "pptx", "txt"]),
+        (["2"], ["md"]),
+    ]
+    assert search_shards(None, ["pdf"]) == [(None, ["pdf"])]
+
+
+def test_merge_ranked_interleaves_and_dedupes():
+    def files(*ids):
+        return [{"type": "file", "id": file_id} for file_id in ids]
+
+    merged = merge_ranked([files("a", "b", "c"), files("b", "d"), files()], limit=10)
+    assert [item["id"] for item in merged] == ["a", "b", "d", "c"]
+    assert len(merge_ranked([files("a", "b"), files("c", "d")], limit=3)) == 3
+
+
+@pytest.mark.asyncio
+async def test_sharded_search_returns_partial_results_at_deadline():
+    running = {"now": 0, "max": 0}
+
+    async def search_pages(client, query, extensions, content_types, roots, **kwargs):
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        try:
+            await asyncio.sleep(0.01)
+            folder_id = roots[0]
+            yield (
+                [
+                    {"type": "file", "id": f"{folder_id}-1"},
+                    {"type": "file", "id": "shared"},
+                ],
+                4,
+            )
+            if folder_id == "slow":
+                await asyncio.sleep(10)
+            if folder_id == "broken":
+                raise BoxAsyncAPIError(500, "500 ; Request ID: ")
+            yield [{"type": "file", "id": f"{folder_id}-2"}], 4
+        finally:
+            running["now"] -= 1
+
+    with patch("tools.box_api_async.iter_search_pages_async", search_pages):
+        result = await box_search_sharded_async(
+            None,
+            "contract",
+            ancestor_folder_ids=["1", "slow", "broken", "2"],
+            limit=10,
+            deadline=0.1,
+            concurrency=3,
+        )
+    assert [item["id"] for item in result["results"]] == [
+        "1-1",
+        "slow-1",
+        "broken-1",
+        "2-1",
+        "shared",
+        "1-2",
+        "2-2",
+    ]
+    assert result["total_count"] == 16
+    assert result["shards"] == 4
+    assert result["completed_shards"] == 2
+    assert result["partial"] is True
+    assert running["max"] == 3
+
+    async def failing_pages(*args, **kwargs):
+        raise BoxAsyncAPIError(403, "403 Forbidden; Request ID: ")
+        yield
+
+    with patch("tools.box_api_async.iter_search_pages_async", failing_pages):
+        with pytest.raises(BoxAsyncAPIError):
+            await box_search_sharded_async(None, "x", ancestor_folder_ids=["1", "2"])
+
+
+@pytest.mark.asyncio
+async def test_metadata_instance_matches_toolkit(client):
+    expected = box_metadata_get_instance_on_file(client, "10", "invoice")
+    assert (
+        await box_metadata_get_instance_on_file_async(client, "10", "invoice")
+        == expected
+    )
+
+
+def test_metadata_patch_operations_are_minimal():
+    current = {"amount": 100, "status": "open", "note": "x"}
+    assert metadata_patch_operations(current, {"amount": 100, "status": "open"}) == []
+    assert metadata_patch_operations(
+        current, {"amount": 120, "vendor": "Acme", "note": None}
+    ) == [
+        {"op": "test", "path": "/amount", "value": 100},
+        {"op": "replace", "path": "/amount", "value": 120},
+        {"op": "add", "path": "/vendor", "value": "Acme"},
+        {"op": "test", "path": "/note", "value": "x"},
+        {"op": "remove", "path": "/note"},
+    ]
+    assert metadata_patch_operations(
+        current, {"amount": 100}, remove_non_included_data=True
+    ) == [
+        {"op": "test", "path": "/status", "value": "open"},
+        {"op": "remove", "path": "/status"},
+        {"op": "test", "path": "/note", "value": "x"},
+        {"op": "remove", "path": "/note"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_metadata_update_sends_only_changes(client):
+    result = await box_metadata_update_instance_on_file_async(
+        client, "10", "invoice", {"amount": 100}
+    )
+    assert result == {"message": "No changes to update"}
+    assert BoxApiHandler.bodies == []
+
+    result = await box_metadata_update_instance_on_file_async(
+        client, "10", "invoice", {"amount": 120}, current={"amount": 100}
+    )
+    assert result["metadata_instance"]["$template"] == "invoice"
+    assert BoxApiHandler.bodies == [
+        [
+            {"op": "test", "path": "/amount", "value": 100},
+            {"op": "replace", "path": "/amount", "value": 120},
+        ]
+    ]
+    path, headers = BoxApiHandler.requests[-1]
+    assert headers["Content-Type"] == "application/json-patch+json"
+
+
+@pytest.mark.asyncio
+async def test_metadata_update_reads_again_on_conflict(client):
+    BoxApiHandler.queued = [(409, {}, {"message": "Conflict"})]
+    await box_metadata_update_instance_on_file_async(
+        client, "10", "invoice", {"amount": 120}, current={"amount": 90}
+    )
+    # The failed patch, a fresh read and the patch against the fresh value
+    assert len(BoxApiHandler.requests) == 3
+    assert BoxApiHandler.bodies[-1][0] == {
+        "op": "test",
+        "path": "/amount",
+        "value": 100,
+    }
+
+
+@pytest.mark.asyncio
+async def test_users_locate_by_email_matches_toolkit(client):
+    expected = box_users_locate_by_email(client, "annie@example.com")
+    result = await box_users_locate_by_email_async(client, "annie@example.com")
+    assert result == expected
+    assert result["user"]["id"] == "6"
+
+
+@pytest.mark.asyncio
+async def test_user_enterprise_id(client):
+    assert await box_user_enterprise_id_async(client) == "42"
+    BoxApiHandler.queued = [(200, {}, {"type": "user", "id": "5", "enterprise": None})]
+    assert await box_user_enterprise_id_async(client) is None
+
+
+@pytest.mark.asyncio
+async def test_groups_list_members_matches_toolkit(client):
+    assert await box_groups_list_members_async(client, "7") == box_groups_list_members(
+        client, "7"
+    )
+
+
+@pytest.mark.asyncio
+async def test_errors_match_toolkit(client):
+    assert await box_folder_info_async(client, "404") == box_folder_info(client, "404")
+
+
+@pytest.mark.asyncio
+async def test_request_sends_bearer_token(client):
+    await box_folder_info_async(client, "1")
+    path, headers = BoxApiHandler.requests[-1]
+    assert path == "/2.0/folders/1"
+    assert headers["Authorization"] == "Bearer token"
+
+
+@pytest.mark.asyncio
+async def test_request_retries_rate_limited_calls(client):
+    BoxApiHandler.queued = [(429, {"Retry-After": "0"}, {"message": "slow down"})]
+    result = await box_folder_info_async(client, "1")
+    assert result["folder"]["id"] == "1"
+    assert len(BoxApiHandler.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_request_refreshes_token_once_on_401(box_api):
+    configure_http_pool(HttpConfig())
+    tokens = iter(["expired", "fresh"])
+    current = SimpleNamespace(access_token=next(tokens))
+    auth = MagicMock()
+    auth.token_storage.get.side_effect = lambda: current
+
+    def refresh_token(network_session=None):
+        current.access_token = next(tokens)
+
+    auth.refresh_token.side_effect = refresh_token
+    client = SimpleNamespace(
+        auth=auth,
+        network_session=NetworkSession(base_urls=BaseUrls(base_url=box_api)),
+    )
+    BoxApiHandler.queued = [(401, {}, {"message": "Unauthorized"})]
+
+    response = await box_api_request(client, "GET", "/folders/1")
+
+    assert response.status_code == 200
+    auth.refresh_token.assert_called_once()
+    assert [h["Authorization"] for _, h in BoxApiHandler.requests] == [
+        "Bearer expired",
+        "Bearer fresh",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_request_raises_api_errors(client):
+    with pytest.raises(BoxAsyncAPIError) as exc_info:
+        await box_api_request(client, "GET", "/folders/404")
+    assert exc_info.value.status_code == 404
+    assert exc_info.value.message == "404 Not Found; Request ID: "
+
+
+@pytest.mark.asyncio
+async def test_tool_uses_async_path_when_enabled(client):
+    configure_http_pool(HttpConfig(async_reads=True))
+    ctx = SimpleNamespace(
+        request_context=SimpleNamespace(
+            lifespan_context=SimpleNamespace(get_active_client=lambda request: client),
+            request=None,
+        )
+    )
+    result = await box_folder_info_tool(ctx, "1")
+    assert result["folder"]["name"] == "Reports"
+    # The request was sent by httpx rather than the requests session
+    assert "python-httpx" in BoxApiHandler.requests[-1][1]["User-Agent"]
+
+
+def fake_tree(depth, width):
+    """Folder ID -> child folder IDs of a complete tree below folder "0"."""
+    tree = {}
+    level = ["0"]
+    for _ in range(depth):
+        next_level = []
+        for folder_id in level:
+            tree[folder_id] = [f"{folder_id}.{i}" for i in range(width)]
+            next_level.extend(tree[folder_id])
+        level = next_level
+    return tree
+
+
+@pytest.mark.asyncio
+async def test_crawl_lists_subfolders_concurrently():
+    tree = fake_tree(depth=3, width=3)
+    running = {"now": 0, "max": 0}
+
+    async def folder_page_items(client, folder_id, limit, fields):
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        if folder_id == "0.2":
+            raise BoxAsyncAPIError(404, "404 Not Found; Request ID: ")
+        children = tree.get(folder_id, [])
+        # A folder listed twice is only crawled once
+        if folder_id == "0.1":
+            children = children + ["0.0"]
+        return [FolderMini(id=child) for child in children]
+
+    skipped = []
+    with patch("tools.box_api_async._folder_page_items", folder_page_items):
+        result = await crawl_folder_async(None, "0", concurrency=4, skipped=skipped)
+
+    assert [item["id"] for item in result] == ["0.0", "0.1", "0.2"]
+    assert [item["id"] for item in result[0]["items"]] == ["0.0.0", "0.0.1", "0.0.2"]
+    assert "items" in result[0]["items"][0] and "items" not in result[2]
+    assert skipped == ["0.2"]
+    assert running["max"] == 4
+
+
+@pytest.mark.asyncio
+async def test_crawl_raises_root_errors(client):
+    with pytest.raises(BoxAsyncAPIError):
+        await crawl_folder_async(client, "404")
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_holds_back_other_requests(client):
+    BoxApiHandler.queued = [(429, {"Retry-After": "0.2"}, {"message": "slow down"})]
+    start = time.monotonic()
+    await asyncio.gather(
+        box_folder_info_async(client, "1"), box_folder_info_async(client, "1")
+    )
+    # The request sent after the 429 waited as well
+    assert time.monotonic() - start >= 0.2
+    assert len(BoxApiHandler.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_folder_items_pages_resume_at_cursor(client):
+    pages = []
+    cursor = None
+    while True:
+        page = await box_folder_items_page_async(
+            client, "1", is_recursive=True, max_items=1, cursor=cursor
+        )
+        pages.append(
+            [(item["id"], item["parent"]["id"]) for item in page["folder_items"]]
+        )
+        cursor = page.get("next_cursor")
+        if cursor is None:
+            break
+    # Depth first: the contents of folder 2 follow folder 2
+    assert [entry for page in pages for entry in page] == [
+        ("2", "1"),
+        ("11", "2"),
+        ("10", "1"),
+    ]
+    assert all(len(page) <= 1 for page in pages)
+
+
+@pytest.mark.asyncio
+async def test_folder_items_page_rejects_foreign_cursor(client):
+    page = await box_folder_items_page_async(client, "1", max_items=1)
+    assert [item["id"] for item in page["folder_items"]] == ["2"]
+    with pytest.raises(InvalidCursorError):
+        await box_folder_items_page_async(
+            client, "2", max_items=1, cursor=page["next_cursor"]
+        )
+    with pytest.raises(InvalidCursorError):
+        await box_folder_items_page_async(client, "1", cursor="not a cursor")
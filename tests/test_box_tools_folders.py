@@ -214,6 +214,7 @@ async def test_box_folder_items_list_tool_recursive():
     folder_id = "12345"
     with (
         patch("tools.box_tools_folders.box_folder_items_list") as mock_list,
+        patch("tools.box_tools_folders.box_folder_items_list_async") as mock_async,
         patch("tools.box_tools_folders.get_box_client") as mock_get_client,
     ):
         mock_get_client.return_value = "client"
@@ -223,11 +224,32 @@ async def test_box_folder_items_list_tool_recursive():
         )
         assert isinstance(result, dict)
         mock_list.assert_called_once_with(
-            client="client",
-            folder_id=folder_id,
-            is_recursive=True,
-            limit=500,
+            client="client", folder_id=folder_id, is_recursive=True, limit=500
         )
+        mock_async.assert_not_called()
+
+        # The concurrent crawl is opt-in with the async client
+        with patch(
+            "tools.box_tools_folders.async_reads_enabled", return_value=True
+        ):
+            mock_async.return_value = {"entries": []}
+            await box_folder_items_list_tool(
+                ctx, folder_id, is_recursive=True, limit=500
+            )
+        mock_async.assert_called_once_with("client", folder_id, True, 500)
+
+
+@pytest.mark.asyncio
+async def test_box_folder_items_list_tool_rejects_empty_pages():
+    ctx = MagicMock(spec=Context)
+    with (
+        patch("tools.box_tools_folders.box_folder_items_page_async") as mock_page,
+        patch("tools.box_tools_folders.get_box_client"),
+    ):
+        for max_items in (0, -5):
+            result = await box_folder_items_list_tool(ctx, "1", max_items=max_items)
+            assert result == {"error": "max_items must be positive"}
+        mock_page.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -1,12 +1,15 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from server_context import BoxContext
+from cache.ttl_cache import TTLCache
+from server_context import BoxContext, hash_token
+from tools.box_api_async import BoxAsyncAPIError
 from tools.box_tools_generic import (
     box_authorize_app_tool,
     box_who_am_i,
     get_box_client,
+    get_caller_enterprise,
 )
 
 
@@ -18,15 +21,14 @@ def mock_ctx():
     mock_lifespan_context = MagicMock(spec=BoxContext)
 
     # Set up get_active_client to return the client attribute by default
-    def get_active_client_side_effect():
+    def get_active_client_side_effect(request=None):
         if mock_lifespan_context.client is not None:
             return mock_lifespan_context.client
-        if mock_lifespan_context.request is None:
+        if request is None:
             raise ValueError("No request context available")
         raise ValueError("No OAuth token found in request scope")
 
     mock_lifespan_context.get_active_client.side_effect = get_active_client_side_effect
-    mock_lifespan_context.request = None
     mock_request_context.lifespan_context = mock_lifespan_context
     mock_request_context.request = None
     ctx.request_context = mock_request_context
@@ -205,3 +207,36 @@ async def test_box_who_am_i_custom_user_data(mock_ctx, mock_box_client):
     assert result["id"] == "98765"
     assert result["name"] == "Jane Smith"
     assert result["enterprise"]["name"] == "Test Enterprise"
+
+
+@pytest.mark.asyncio
+async def test_get_caller_enterprise():
+    def ctx_with(token):
+        ctx = MagicMock()
+        ctx.request_context.request.scope = {"oauth_token": token} if token else {}
+        return ctx
+
+    with (
+        patch(
+            "tools.box_tools_generic.get_enterprise_cache",
+            return_value=TTLCache(max_size=10, ttl=60),
+        ),
+        patch(
+            "tools.box_tools_generic.box_user_enterprise_id_async", new=AsyncMock()
+        ) as enterprise_id,
+    ):
+        enterprise_id.return_value = "42"
+        # Tokens of one enterprise share a key, read once per token
+        assert await get_caller_enterprise(ctx_with("a"), None) == "enterprise.42"
+        assert await get_caller_enterprise(ctx_with("a"), None) == "enterprise.42"
+        assert await get_caller_enterprise(ctx_with("b"), None) == "enterprise.42"
+        assert enterprise_id.await_count == 2
+        # The server's own account
+        assert await get_caller_enterprise(ctx_with(None), None) == ""
+
+        enterprise_id.return_value = None
+        assert await get_caller_enterprise(ctx_with("c"), None) == hash_token("c")
+        enterprise_id.side_effect = BoxAsyncAPIError(500, "500")
+        assert await get_caller_enterprise(ctx_with("d"), None) == hash_token("d")
+        assert await get_caller_enterprise(ctx_with("d"), None) == hash_token("d")
+        assert enterprise_id.await_count == 5
@@ -2,6 +2,8 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from cache.metadata_templates import MetadataTemplateCache
+from cache.ttl_cache import TTLCache
 from tools.box_tools_metadata import (
     box_metadata_delete_instance_on_file_tool,
     box_metadata_get_instance_on_file_tool,
@@ -14,6 +16,22 @@ from tools.box_tools_metadata import (
 )
 
 
+@pytest.fixture(autouse=True)
+def disable_template_cache():
+    """Call the toolkit directly, the template and instance caches have own tests"""
+    with (
+        patch(
+            "tools.box_tools_metadata.get_metadata_template_cache",
+            return_value=MetadataTemplateCache(ttl=0),
+        ),
+        patch(
+            "tools.box_tools_metadata.get_metadata_instance_cache",
+            return_value=TTLCache(max_size=16, ttl=30),
+        ),
+    ):
+        yield
+
+
 @pytest.fixture
 def mock_ctx():
     """Mock context fixture"""
@@ -244,7 +262,7 @@ async def test_box_metadata_get_instance_on_file_tool(
 
 @pytest.mark.asyncio
 @patch("tools.box_tools_metadata.get_box_client")
-@patch("tools.box_tools_metadata.box_metadata_update_instance_on_file")
+@patch("tools.box_tools_metadata.box_metadata_update_instance_on_file_async")
 async def test_box_metadata_update_instance_on_file_tool(
     mock_update_instance,
     mock_get_client,
@@ -272,13 +290,14 @@ async def test_box_metadata_update_instance_on_file_tool(
         "customer_template",
         sample_metadata,
         remove_non_included_data=True,
+        current=None,
     )
     assert result == sample_metadata_instance_response
 
 
 @pytest.mark.asyncio
 @patch("tools.box_tools_metadata.get_box_client")
-@patch("tools.box_tools_metadata.box_metadata_update_instance_on_file")
+@patch("tools.box_tools_metadata.box_metadata_update_instance_on_file_async")
 async def test_box_metadata_update_instance_on_file_tool_default_remove(
     mock_update_instance,
     mock_get_client,
@@ -304,6 +323,7 @@ async def test_box_metadata_update_instance_on_file_tool_default_remove(
         "customer_template",
         sample_metadata,
         remove_non_included_data=False,
+        current=None,
     )
     assert result == sample_metadata_instance_response
 
@@ -506,3 +526,34 @@ async def test_box_metadata_template_list_tool(
     mock_get_client.assert_called_once_with(mock_ctx)
     mock_list.assert_called_once_with(mock_box_client)
     assert result == [sample_template_response]
+
+
+@pytest.mark.asyncio
+@patch("tools.box_tools_metadata.get_box_client")
+@patch("tools.box_tools_metadata.box_metadata_update_instance_on_file_async")
+@patch("tools.box_tools_metadata.box_metadata_get_instance_on_file")
+async def test_box_metadata_update_diffs_against_last_read_instance(
+    mock_get_instance,
+    mock_update_instance,
+    mock_get_client,
+    mock_ctx,
+    mock_box_client,
+):
+    """Test that updates reuse the instance read by the get tool"""
+    mock_get_client.return_value = mock_box_client
+    mock_get_instance.return_value = {
+        "metadata_instance": {"$version": 1, "extra_data": {"name": "Acme"}}
+    }
+    mock_update_instance.return_value = {"message": "No changes to update"}
+
+    await box_metadata_get_instance_on_file_tool(
+        ctx=mock_ctx, file_id="123456", template_key="customer_template"
+    )
+    await box_metadata_update_instance_on_file_tool(
+        ctx=mock_ctx,
+        file_id="123456",
+        template_key="customer_template",
+        metadata={"name": "Acme"},
+    )
+
+    assert mock_update_instance.call_args.kwargs["current"] == {"name": "Acme"}
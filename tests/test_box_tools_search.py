@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
@@ -354,3 +354,79 @@ async def test_box_search_folder_by_name_tool_special_characters(
 
     mock_locate_folder.assert_called_once_with(mock_box_client, special_folder_name)
     assert len(result) == 2
+
+
+@pytest.mark.asyncio
+@patch("tools.box_tools_search.get_box_client")
+async def test_box_search_tool_returns_pages(mock_get_client, mock_box_client):
+    """Test box_search_tool paging with limit, offset and fields"""
+    ctx = MagicMock()
+    ctx.report_progress = AsyncMock()
+    mock_get_client.return_value = mock_box_client
+    pages = [
+        ([{"type": "file", "id": "1", "name": "a.pdf"}], 4),
+        ([{"type": "file", "id": "2", "name": "b.pdf"}], 4),
+    ]
+
+    async def iter_pages(*args, **kwargs):
+        for page in pages:
+            yield page
+
+    with patch(
+        "tools.box_tools_search.iter_search_pages_async", side_effect=iter_pages
+    ) as mock_pages:
+        result = await box_search_tool(
+            ctx=ctx, query="test", limit=2, offset=1, fields=["name"]
+        )
+
+    assert mock_pages.call_args.kwargs == {"fields": ["name"], "offset": 1, "limit": 2}
+    assert result == {
+        "results": [
+            {"type": "file", "id": "1", "name": "a.pdf"},
+            {"type": "file", "id": "2", "name": "b.pdf"},
+        ],
+        "total_count": 4,
+        "next_offset": 3,
+    }
+    # Progress is reported after every page
+    assert ctx.report_progress.await_args_list[-1].args == (2, 2)
+
+
+@pytest.mark.asyncio
+@patch("tools.box_tools_search.get_box_client")
+async def test_box_search_tool_last_page(mock_get_client, mock_box_client):
+    """Test that the last page of a search has no next_offset"""
+    ctx = MagicMock()
+    ctx.report_progress = AsyncMock()
+
+    async def iter_pages(*args, **kwargs):
+        yield [{"type": "file", "id": "9", "name": "z.pdf"}], 31
+
+    with patch(
+        "tools.box_tools_search.iter_search_pages_async", side_effect=iter_pages
+    ):
+        result = await box_search_tool(ctx=ctx, query="test", offset=30)
+
+    assert result["total_count"] == 31
+    assert "next_offset" not in result
+
+
+@pytest.mark.asyncio
+@patch("tools.box_tools_search.get_box_client")
+async def test_box_search_tool_shards_several_folders(mock_get_client, mock_box_client):
+    """Test that a first page over several folders is searched in shards"""
+    ctx = MagicMock()
+    mock_get_client.return_value = mock_box_client
+    sharded = {"results": [], "shards": 2, "completed_shards": 2}
+
+    with patch(
+        "tools.box_tools_search.box_search_sharded_async",
+        new=AsyncMock(return_value=sharded),
+    ) as mock_sharded:
+        result = await box_search_tool(
+            ctx=ctx, query="test", ancestor_folder_ids=["1", "2"], limit=10
+        )
+
+    assert result == sharded
+    assert mock_sharded.await_args.args[4] == ["1", "2"]
+    assert mock_sharded.await_args.kwargs == {"fields": None, "limit": 10}
@@ -0,0 +1,236 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from mcp.server.fastmcp import Context
+
+from cache.content_index import ContentIndex, make_snippet, tokenize
+from tools.box_tools_search import box_local_search_tool
+
+pytest.importorskip("numpy")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def file(file_id, name, version="1"):
+    return {
+        "type": "file",
+        "id": file_id,
+        "name": name,
+        "file_version": {"type": "file_version", "id": version},
+    }
+
+
+def folder(folder_id, name, items):
+    return {"type": "folder", "id": folder_id, "name": name, "items": items}
+
+
+TEXTS = {
+    "10": "Master services agreement. The supplier shall indemnify the customer.",
+    "11": "Non-disclosure agreement between the parties, valid for two years.",
+    "12": "Lunch menu for the team offsite.",
+    "13": "Termination: either party may terminate this agreement for breach. "
+    + "Unrelated filler text. " * 40
+    + "Indemnify and hold harmless against any claim.",
+}
+
+
+def tree():
+    return [
+        file("10", "msa.pdf"),
+        folder("2", "Legal", [file("11", "nda.docx"), file("13", "terms.pdf")]),
+        file("12", "menu.txt"),
+    ]
+
+
+@pytest.fixture
+def box():
+    with (
+        patch("cache.content_index.crawl_folder_async", new=AsyncMock()) as crawl,
+        patch("cache.content_index.box_file_text_extract") as extract,
+    ):
+        crawl.side_effect = lambda client, root, *args, **kwargs: tree()
+        extract.side_effect = lambda client, file_id: {"content": TEXTS[file_id]}
+        yield crawl, extract
+
+
+@pytest.fixture
+def index(tmp_path, box):
+    return ContentIndex(["1"], str(tmp_path / "index.sqlite3"), clock=FakeClock())
+
+
+def ids(found):
+    return [result["id"] for result in found["results"]]
+
+
+def test_tokenize_and_snippet():
+    assert tokenize("Straße, CO2-limits!") == ["strasse", "co2", "limits"]
+    text = "Intro. " * 50 + "The supplier shall indemnify the customer. " + "x " * 200
+    snippet = make_snippet(text, {"indemnify", "customer"}, width=60)
+    assert "indemnify the customer" in snippet
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert make_snippet("Short text.", {"missing"}) == "Short text."
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_files_with_snippets(index, box):
+    await index.open()
+    assert await index.sync(MagicMock()) == 4
+
+    found = await index.search("indemnify")
+    assert ids(found) == ["10", "13"]
+    assert found["total_count"] == 2
+    assert found["results"][0]["name"] == "msa.pdf"
+    assert "indemnify the customer" in found["results"][0]["snippet"]
+    assert "Indemnify and hold harmless" in found["results"][1]["snippet"]
+
+    # Any word matches, files matching more words rank higher, then shorter ones
+    found = await index.search("agreement terminate breach", limit=2)
+    assert ids(found) == ["13", "10"] and found["total_count"] == 3
+    # File names are indexed as well
+    assert ids(await index.search("MENU")) == ["12"]
+    assert ids(await index.search("indemnify", ancestor_folder_ids=["2"])) == ["13"]
+    assert (await index.search("nothing matches"))["results"] == []
+
+
+@pytest.mark.asyncio
+async def test_sync_only_reads_changed_versions(index, box):
+    crawl, extract = box
+    await index.open()
+    await index.sync(MagicMock())
+    extract.reset_mock()
+
+    changed = tree()
+    changed[0] = file("10", "msa-v2.pdf", version="2")
+    changed[1]["items"] = [file("13", "terms.pdf")]
+    changed.append(folder("3", "Archive", [file("12", "catering.txt")]))
+    del changed[2]
+    crawl.side_effect = lambda client, root, *args, **kwargs: changed
+    texts = {**TEXTS, "10": "Amended agreement, liability is capped."}
+    extract.side_effect = lambda client, file_id: {"content": texts[file_id]}
+
+    assert await index.sync(MagicMock()) == 1
+    assert [call.args[1] for call in extract.call_args_list] == ["10"]
+    assert ids(await index.search("indemnify")) == ["13"]
+    assert ids(await index.search("liability")) == ["10"]
+    assert await index.search("disclosure") == {"results": [], "total_count": 0}
+    # Moved and renamed without a new version
+    found = await index.search("catering", ancestor_folder_ids=["3"])
+    assert found["results"][0]["name"] == "catering.txt"
+
+
+@pytest.mark.asyncio
+async def test_sync_keeps_files_of_unlisted_folders(index, box):
+    crawl, extract = box
+    await index.open()
+    await index.sync(MagicMock())
+    index._clock.now += 3000
+
+    # Folder 2 cannot be listed, and file 12 was removed
+    def crawl_skipping(client, root, is_recursive, skipped):
+        skipped.append("2")
+        return [file("10", "msa.pdf"), folder("2", "Legal", [])]
+
+    crawl.side_effect = crawl_skipping
+    assert await index.sync(MagicMock()) == 0
+    assert index.fresh()
+    assert ids(await index.search("disclosure")) == ["11"]
+    assert await index.search("menu") == {"results": [], "total_count": 0}
+
+
+@pytest.mark.asyncio
+async def test_pending_text_is_read_again(index, box):
+    _, extract = box
+    extract.side_effect = lambda client, file_id: (
+        {"status": "pending", "message": "still being generated"}
+        if file_id == "11"
+        else {"error": "impossible", "status": "impossible"}
+        if file_id == "12"
+        else {"content": TEXTS[file_id]}
+    )
+    await index.open()
+    assert await index.sync(MagicMock()) == 3
+    assert await index.search("disclosure") == {"results": [], "total_count": 0}
+    # A file without text is found by name, and not read again
+    assert (await index.search("menu"))["results"][0]["snippet"] == ""
+
+    extract.reset_mock()
+    extract.side_effect = lambda client, file_id: {"content": TEXTS[file_id]}
+    assert await index.sync(MagicMock()) == 1
+    assert [call.args[1] for call in extract.call_args_list] == ["11"]
+    assert ids(await index.search("disclosure")) == ["11"]
+
+
+@pytest.mark.asyncio
+async def test_stale_index_is_not_served(index, box, tmp_path):
+    await index.open()
+    assert await index.search("indemnify") is None
+    await index.sync(MagicMock())
+    # Callers with their own token are not served from the service account's index
+    assert await index.search("indemnify", identity="token-hash") is None
+    # Folders outside the index
+    assert await index.search("indemnify", ancestor_folder_ids=["99"]) is None
+
+    index._clock.now += 3601
+    assert await index.search("indemnify") is None
+    assert index.fallbacks == 4
+
+    # A restart serves the stored index while it is recent enough
+    clock = FakeClock()
+    restarted = ContentIndex(["1"], index.path, clock=clock)
+    await restarted.open()
+    assert ids(await restarted.search("indemnify")) == ["10", "13"]
+    # Other roots start over
+    other = ContentIndex(["5"], index.path, clock=clock)
+    await other.open()
+    assert await other.search("indemnify") is None
+    assert other.store.files() == {}
+
+
+@pytest.mark.asyncio
+async def test_local_search_tool_falls_back_to_box_search(index):
+    ctx = MagicMock(spec=Context)
+    with (
+        patch("tools.box_tools_search.get_content_index", return_value=index),
+        patch("tools.box_tools_search.box_search_tool", new=AsyncMock()) as search,
+    ):
+        search.return_value = {"results": [{"id": "10"}], "total_count": 1}
+        assert await box_local_search_tool(ctx, "indemnify", limit=5) == {
+            "source": "box_search",
+            "results": [{"id": "10"}],
+            "total_count": 1,
+        }
+        search.assert_awaited_once_with(
+            ctx, "indemnify", ancestor_folder_ids=["1"], limit=5
+        )
+
+        await index.open()
+        await index.sync(MagicMock())
+        result = await box_local_search_tool(ctx, "indemnify", limit=1)
+        assert result["source"] == "local_index"
+        assert ids(result) == ["10"] and result["total_count"] == 2
+        search.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_fallback_over_several_roots_has_a_total(tmp_path):
+    index = ContentIndex(["1", "5"], str(tmp_path / "index.sqlite3"))
+
+    async def search_pages(client, query, extensions, content_types, roots, **kwargs):
+        yield [{"type": "file", "id": f"{roots[0]}-1"}], 3
+
+    ctx = MagicMock(spec=Context)
+    with (
+        patch("tools.box_tools_search.get_content_index", return_value=index),
+        patch("tools.box_tools_search.get_box_client"),
+        patch("tools.box_api_async.iter_search_pages_async", search_pages),
+    ):
+        result = await box_local_search_tool(ctx, "indemnify", limit=5)
+    assert result["source"] == "box_search"
+    assert ids(result) == ["1-1", "5-1"]
+    assert result["total_count"] == 6
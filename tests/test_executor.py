@@ -0,0 +1,142 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+from mcp.server.fastmcp import Context, FastMCP
+
+from config import ExecutorConfig, parse_tool_limits
+from executor import (
+    ToolExecutor,
+    configure_executor,
+    get_executor,
+    limit_concurrency,
+    run_blocking,
+)
+from tool_registry import register_all_tools
+
+
+@pytest.fixture(autouse=True)
+def reset_executor():
+    """Restore the default executor after each test"""
+    yield
+    configure_executor(ExecutorConfig())
+
+
+def test_parse_tool_limits():
+    assert parse_tool_limits("") == {}
+    assert parse_tool_limits("a_tool=2, b_tool=5") == {"a_tool": 2, "b_tool": 5}
+
+
+def test_parse_tool_limits_invalid():
+    with pytest.raises(ValueError):
+        parse_tool_limits("a_tool")
+
+
+def test_tool_limit_defaults_and_overrides():
+    executor = ToolExecutor(
+        ExecutorConfig(default_tool_concurrency=3, tool_concurrency={"slow_tool": 1})
+    )
+    assert executor.tool_limit("slow_tool") == 1
+    assert executor.tool_limit("other_tool") == 3
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_uses_worker_thread():
+    loop_thread = threading.get_ident()
+    worker_thread = await run_blocking(threading.get_ident)
+    assert worker_thread != loop_thread
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_passes_arguments_and_context():
+    request_id = contextvars.ContextVar("request_id")
+    request_id.set("abc")
+
+    def work(a, b=0):
+        return a + b, request_id.get()
+
+    assert await run_blocking(work, 1, b=2) == (3, "abc")
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_propagates_exceptions():
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        await run_blocking(fail)
+
+
+@pytest.mark.asyncio
+async def test_run_blocking_does_not_block_event_loop():
+    configure_executor(ExecutorConfig(max_workers=10))
+
+    start = time.perf_counter()
+    await asyncio.gather(*[run_blocking(time.sleep, 0.1) for _ in range(10)])
+    elapsed = time.perf_counter() - start
+
+    # Ten 100ms calls would take a second if they ran one after the other
+    assert elapsed < 0.5
+
+
+@pytest.mark.asyncio
+async def test_limit_concurrency_caps_tool():
+    configure_executor(
+        ExecutorConfig(max_workers=10, tool_concurrency={"capped_tool": 2})
+    )
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def work():
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+
+    @limit_concurrency
+    async def capped_tool():
+        await run_blocking(work)
+
+    await asyncio.gather(*[capped_tool() for _ in range(8)])
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_register_all_tools_wraps_async_tools():
+    async def sample_tool(ctx: Context, folder_id: str, limit: int = 10) -> dict:
+        """Sample tool"""
+        return {"folder_id": folder_id, "limit": limit}
+
+    def sync_tool() -> str:
+        """Sync tool"""
+        return "ok"
+
+    def registrar(mcp: FastMCP):
+        mcp.tool()(sample_tool)
+        mcp.tool()(sync_tool)
+
+    mcp = FastMCP(name="test")
+    original_tool = mcp.tool
+    register_all_tools(mcp, [registrar])
+
+    # The original decorator is restored after registration
+    assert mcp.tool == original_tool
+
+    tools = {tool.name: tool for tool in await mcp.list_tools()}
+    assert set(tools["sample_tool"].inputSchema["properties"]) == {
+        "folder_id",
+        "limit",
+    }
+    assert "sync_tool" in tools
+
+
+def test_configure_executor_replaces_instance():
+    executor = configure_executor(ExecutorConfig(max_workers=4))
+    assert get_executor() is executor
+    assert executor.pool._max_workers == 4
@@ -0,0 +1,256 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from mcp.server.fastmcp import Context
+
+from cache.folder_mirror import FolderMirror
+from tools.box_api_async import BoxAsyncAPIError
+from tools.box_tools_folders import box_folder_items_list_tool
+from tools.box_tools_search import box_search_folder_by_name_tool
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeEventSource:
+    """Serves queued batches of events, as the Box events stream would."""
+
+    def __init__(self, position="100"):
+        self.position = position
+        self.batches = []
+        self.polled_from = []
+
+    async def current_position(self, client):
+        return self.position
+
+    async def next_events(self, client, stream_position):
+        self.polled_from.append(stream_position)
+        events = self.batches.pop(0) if self.batches else []
+        self.position = str(int(self.position) + len(events))
+        return events, self.position
+
+
+def folder(folder_id, name, items=None, sequence_id="0"):
+    result = {"type": "folder", "id": folder_id, "name": name, "etag": "0"}
+    result["sequence_id"] = sequence_id
+    if items:
+        result["items"] = items
+    return result
+
+
+def file(file_id, name):
+    return {"type": "file", "id": file_id, "name": name, "etag": "0"}
+
+
+def event(event_type, source, parent_id, sequence_id="1", status="active"):
+    source = {key: value for key, value in source.items() if key != "items"} | {
+        "sequence_id": sequence_id,
+        "parent": {"type": "folder", "id": parent_id},
+        "item_status": status,
+        "created_at": "2024-01-01T10:00:00-08:00",
+    }
+    return {"type": "event", "event_type": event_type, "source": source}
+
+
+def names(items):
+    return [item["name"] for item in items]
+
+
+TREE = [
+    file("10", "summary.pdf"),
+    folder("2", "Q1", [file("11", "jan.pdf")]),
+    folder("3", "Archive"),
+]
+
+
+@pytest.fixture
+def crawl():
+    with patch("cache.folder_mirror.crawl_folder_async", new=AsyncMock()) as crawl:
+        crawl.return_value = TREE
+        yield crawl
+
+
+@pytest.fixture
+def mirror(tmp_path, crawl):
+    clock = FakeClock()
+    return FolderMirror(
+        ["1"],
+        str(tmp_path / "mirror.sqlite3"),
+        max_lag=60,
+        events=FakeEventSource(),
+        clock=clock,
+    )
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_lists_folders_from_the_mirror(mirror, crawl):
+    await mirror.open(MagicMock())
+    assert crawl.await_args.kwargs["skipped"] == []
+
+    # Folders first, then files, by name
+    assert names(await mirror.list_items("1")) == ["Archive", "Q1", "summary.pdf"]
+    tree = await mirror.list_items("1", is_recursive=True)
+    assert names(tree[1]["items"]) == ["jan.pdf"]
+    assert "items" not in tree[0]
+    assert await mirror.list_items("2") == [
+        {"type": "file", "id": "11", "name": "jan.pdf", "etag": "0"}
+    ]
+    # Outside the mirror
+    assert await mirror.list_items("99") is None
+
+
+@pytest.mark.asyncio
+async def test_events_keep_the_mirror_current(mirror, crawl):
+    client = MagicMock()
+    await mirror.open(client)
+    crawl.reset_mock()
+    crawl.return_value = [file("21", "notes.txt")]
+    mirror.events.batches.append(
+        [
+            event("ITEM_UPLOAD", file("12", "feb.pdf"), "2"),
+            event("ITEM_RENAME", folder("3", "Old"), "1"),
+            # Moved out of the mirrored tree
+            event("ITEM_MOVE", file("10", "summary.pdf"), "999"),
+            # Moved in, with contents that have to be listed
+            event("ITEM_MOVE", folder("20", "Imported"), "3"),
+        ]
+    )
+    assert await mirror.poll(client) == 4
+
+    assert names(await mirror.list_items("1")) == ["Old", "Q1"]
+    assert names(await mirror.list_items("2")) == ["feb.pdf", "jan.pdf"]
+    assert names(await mirror.list_items("20")) == ["notes.txt"]
+    crawl.assert_awaited_once_with(client, "20", True, skipped=[])
+
+    # Trashing a folder removes its whole subtree
+    mirror.events.batches.append(
+        [event("ITEM_TRASH", folder("3", "Old"), "1", "2", status="trashed")]
+    )
+    await mirror.poll(client)
+    assert names(await mirror.list_items("1")) == ["Q1"]
+    assert await mirror.list_items("20") is None
+    assert mirror.events.polled_from == ["100", "104"]
+
+
+@pytest.mark.asyncio
+async def test_older_events_are_ignored(mirror):
+    client = MagicMock()
+    await mirror.open(client)
+    mirror.events.batches.append(
+        [
+            event("ITEM_RENAME", folder("2", "Q1 2025"), "1", "5"),
+            event("ITEM_RENAME", folder("2", "Q1 draft"), "1", "4"),
+        ]
+    )
+    await mirror.poll(client)
+    assert names(await mirror.list_items("1")) == ["Archive", "Q1 2025", "summary.pdf"]
+
+
+@pytest.mark.asyncio
+async def test_stale_mirror_is_not_served(mirror):
+    await mirror.open(MagicMock())
+    mirror._clock.now = 61
+    assert await mirror.list_items("1") is None
+    await mirror.poll(MagicMock())
+    assert await mirror.list_items("1") is not None
+    # Callers with their own token are not served from the service account's mirror
+    assert await mirror.list_items("1", identity="token-hash") is None
+
+
+@pytest.mark.asyncio
+async def test_restart_resumes_from_the_stored_position(mirror, crawl, tmp_path):
+    await mirror.open(MagicMock())
+    mirror.events.batches.append([event("ITEM_UPLOAD", file("12", "feb.pdf"), "2")])
+    await mirror.poll(MagicMock())
+
+    events = FakeEventSource(position="500")
+    restarted = FolderMirror(
+        ["1"], mirror.path, max_lag=60, events=events, clock=FakeClock()
+    )
+    await restarted.open(MagicMock())
+    await restarted.poll(MagicMock())
+    assert crawl.await_count == 1
+    assert events.polled_from == ["101"]
+    assert names(await restarted.list_items("2")) == ["feb.pdf", "jan.pdf"]
+
+    # Other roots are crawled again
+    other = FolderMirror(["1", "5"], mirror.path, events=FakeEventSource())
+    await other.open(MagicMock())
+    assert crawl.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_invalid_stream_position_crawls_again(mirror, crawl):
+    await mirror.open(MagicMock())
+    mirror.events.next_events = AsyncMock(
+        side_effect=BoxAsyncAPIError(400, "invalid stream position")
+    )
+    mirror.retry_delay = 0
+    with patch("cache.folder_mirror.asyncio.sleep", new=AsyncMock()) as sleep:
+        sleep.side_effect = [None, KeyboardInterrupt]
+        with pytest.raises(KeyboardInterrupt):
+            await mirror.run(MagicMock())
+    assert crawl.await_count == 2
+    assert mirror.errors == 2
+
+
+@pytest.mark.asyncio
+async def test_folder_tools_answer_from_the_mirror(mirror):
+    await mirror.open(MagicMock())
+    ctx = MagicMock(spec=Context)
+    with (
+        patch("tools.box_tools_folders.get_folder_mirror", return_value=mirror),
+        patch("tools.box_tools_search.get_folder_mirror", return_value=mirror),
+        patch("tools.box_tools_folders.get_box_client"),
+        patch("tools.box_tools_search.get_box_client"),
+        patch("tools.box_tools_search.box_locate_folder_by_name") as locate,
+    ):
+        result = await box_folder_items_list_tool(ctx, "1", is_recursive=True)
+        assert names(result["folder_items"]) == ["Archive", "Q1", "summary.pdf"]
+        result = await box_folder_items_list_tool(ctx, "3")
+        assert result == {"message": "No items found in folder."}
+
+        # Folders outside the mirrored roots can match as well
+        locate.return_value = []
+        assert await box_search_folder_by_name_tool(ctx, "arch") == []
+        locate.assert_called_once()
+
+        # Unless the whole account is mirrored
+        mirror.roots = ["0"]
+        await mirror.bootstrap(MagicMock())
+        assert await box_search_folder_by_name_tool(ctx, "arch") == [
+            {"id": "3", "type": "folder", "name": "Archive"}
+        ]
+        assert await box_search_folder_by_name_tool(ctx, "Invoices") == []
+        locate.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_subfolders_keep_their_contents(mirror, crawl):
+    await mirror.open(MagicMock())
+
+    def crawl_skipping(client, root, is_recursive, skipped):
+        skipped.extend(["2", "3"])
+        return [file("10", "summary.pdf"), folder("2", "Q1"), folder("3", "Archive")]
+
+    crawl.side_effect = crawl_skipping
+    await mirror.bootstrap(MagicMock())
+    # Listed before, the stored contents stay
+    assert names(await mirror.list_items("2")) == ["jan.pdf"]
+    assert names(await mirror.list_items("1")) == ["Archive", "Q1", "summary.pdf"]
+    assert await mirror.list_items("1", is_recursive=True) is not None
+
+    # Never listed, the folder is not served
+    crawl.side_effect = lambda client, root, is_recursive, skipped: (
+        skipped.append("2") or [folder("2", "Q1")]
+    )
+    mirror.store.replace(["1"], [], "")
+    await mirror.bootstrap(MagicMock())
+    assert await mirror.list_items("2") is None
+    assert await mirror.list_items("1", is_recursive=True) is None
+    assert names(await mirror.list_items("1")) == ["Q1"]
@@ -0,0 +1,119 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cache.group_index import GroupIndex
+from tools.box_tools_groups import box_groups_list_by_user_tool, box_groups_search_tool
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def membership(group_id, user_id):
+    return {
+        "type": "group_membership",
+        "id": f"{group_id}-{user_id}",
+        "group": {"type": "group", "id": group_id},
+        "user": {"type": "user", "id": user_id},
+    }
+
+
+def ids(memberships, side):
+    return [m[side]["id"] for m in memberships]
+
+
+@pytest.fixture
+def box_api():
+    with (
+        patch(
+            "cache.group_index.list_group_memberships_async", new=AsyncMock()
+        ) as by_group,
+        patch(
+            "cache.group_index.list_user_memberships_async", new=AsyncMock()
+        ) as by_user,
+        patch("cache.group_index.list_groups_async", new=AsyncMock()) as groups,
+    ):
+        yield by_group, by_user, groups
+
+
+@pytest.mark.asyncio
+async def test_memberships_are_cached_per_group(box_api):
+    by_group, _, _ = box_api
+    clock = FakeClock()
+    index = GroupIndex(ttl=60, clock=clock)
+    by_group.return_value = [membership("g1", "u1")]
+    await index.list_members(MagicMock(), "g1")
+    assert ids(await index.list_members(MagicMock(), "g1"), "user") == ["u1"]
+    assert by_group.await_count == 1
+    clock.now = 61
+    await index.list_members(MagicMock(), "g1")
+    assert by_group.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_group_names_are_bounded(box_api):
+    _, _, groups = box_api
+    clock = FakeClock()
+    index = GroupIndex(ttl=60, max_size=2, clock=clock)
+    groups.return_value = [{"type": "group", "id": "g1", "name": "Finance"}]
+    for identity in ["a", "b", "c"]:
+        await index.search(MagicMock(), "fin", identity)
+    assert index.names.stats()["snapshots"] == 2
+    assert index.names.peek("a") is None
+    # Dropped once past max_stale
+    clock.now = 121
+    assert index.names.peek("c") is None
+
+
+@pytest.mark.asyncio
+async def test_fetches_update_the_reverse_direction(box_api):
+    by_group, by_user, _ = box_api
+    clock = FakeClock()
+    index = GroupIndex(ttl=60, clock=clock)
+    by_user.return_value = [membership("g1", "u1")]
+    by_group.return_value = [membership("g2", "u1")]
+    assert ids(await index.list_by_user(MagicMock(), "u1"), "group") == ["g1"]
+
+    # u1 joined g2
+    await index.list_members(MagicMock(), "g2")
+    groups = await index.list_by_user(MagicMock(), "u1")
+    assert ids(groups, "group") == ["g1", "g2"]
+
+    # u1 left g2
+    clock.now = 30
+    index._by_group.pop(("", "g2"))
+    by_group.return_value = []
+    await index.list_members(MagicMock(), "g2")
+    assert ids(await index.list_by_user(MagicMock(), "u1"), "group") == ["g1"]
+    assert by_user.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_tools_use_the_index(box_api):
+    _, by_user, groups = box_api
+    ctx = MagicMock()
+    ctx.request_context.request.scope = {}
+    by_user.return_value = []
+    groups.return_value = [
+        {"type": "group", "id": "g1", "name": "Finance"},
+        {"type": "group", "id": "g2", "name": "Legal Finance"},
+        {"type": "group", "id": "g3", "name": "Sales"},
+    ]
+    with (
+        patch("tools.box_tools_groups.get_box_client"),
+        patch("tools.box_tools_groups.get_group_index", return_value=GroupIndex()),
+    ):
+        result = await box_groups_search_tool(ctx, "fin")
+        assert [g["id"] for g in result["groups"]] == ["g1", "g2"]
+        assert await box_groups_search_tool(ctx, "hr") == {
+            "message": "No groups found."
+        }
+        assert await box_groups_list_by_user_tool(ctx, "u1") == {
+            "message": "No groups found for the user."
+        }
+    assert groups.await_count == 1
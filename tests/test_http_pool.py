@@ -0,0 +1,82 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from config import BoxApiConfig, HttpConfig
+from http_pool import (
+    configure_http_pool,
+    get_network_session,
+    get_pool_stats,
+    get_requests_session,
+)
+from mcp_auth.auth_box_api import get_ccg_client
+from metrics import collect_metrics
+from server_context import BoxContext, get_client_cache
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"type": "folder", "id": "0"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    configure_http_pool(HttpConfig(pool_maxsize=4))
+    # Clients cached by other tests still point at their old pool
+    get_client_cache().clear()
+    yield
+    configure_http_pool(HttpConfig())
+
+
+def test_clients_share_one_network_client():
+    ccg_client = get_ccg_client(
+        BoxApiConfig(
+            client_id="id",
+            client_secret="secret",
+            subject_type="enterprise",
+            subject_id="123",
+        )
+    )
+    token_client = BoxContext().get_client_from_token("token")
+
+    shared = get_network_session().network_client
+    assert ccg_client.network_session.network_client is shared
+    assert token_client.network_session.network_client is shared
+    assert shared.requests_session is get_requests_session()
+
+
+def test_pool_reuses_connections(local_server):
+    session = get_requests_session()
+    for _ in range(10):
+        assert session.get(f"{local_server}/2.0/folders/0").status_code == 200
+
+    stats = get_pool_stats()
+    assert stats["requests"] == 10
+    assert stats["connections_opened"] == 1
+    assert stats["idle_connections"] == 1
+    assert stats["pool_maxsize"] == 4
+
+
+def test_pool_stats_are_reported_as_metrics():
+    assert collect_metrics()["http_pool"]["pool_maxsize"] == 4
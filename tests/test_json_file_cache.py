@@ -0,0 +1,65 @@
+import json
+import os
+
+from cache.json_file_cache import JsonFileCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def write(path, data, mtime_ns):
+    path.write_text(json.dumps(data))
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_file_is_parsed_once(tmp_path):
+    path = tmp_path / "config.json"
+    write(path, {"resource": "a"}, 1_000_000_000)
+    clock = FakeClock()
+    cache = JsonFileCache(str(path), clock=clock)
+
+    entry = cache.get()
+    assert entry.data == {"resource": "a"}
+    assert json.loads(entry.body) == {"resource": "a"}
+    for step in range(10):
+        clock.now = step * 5.0
+        assert cache.get() is entry
+    assert cache.loads == 1
+
+
+def test_file_is_reloaded_when_modified(tmp_path):
+    path = tmp_path / "config.json"
+    write(path, {"resource": "a"}, 1_000_000_000)
+    clock = FakeClock()
+    cache = JsonFileCache(str(path), check_interval=1.0, clock=clock)
+    first = cache.get()
+
+    write(path, {"resource": "b"}, 2_000_000_000)
+    # Not checked again within the interval
+    clock.now = 0.5
+    assert cache.get() is first
+    clock.now = 1.5
+    second = cache.get()
+    assert second.data == {"resource": "b"}
+    assert second.etag != first.etag
+    assert cache.loads == 2
+
+
+def test_missing_and_invalid_files_are_empty(tmp_path):
+    path = tmp_path / "config.json"
+    clock = FakeClock()
+    cache = JsonFileCache(str(path), clock=clock)
+    assert cache.get().data == {}
+
+    path.write_text("{not json")
+    clock.now = 10
+    assert cache.get().data == {}
+
+    write(path, {"resource": "a"}, 3_000_000_000)
+    clock.now = 20
+    assert cache.get().data == {"resource": "a"}
@@ -0,0 +1,165 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cache.metadata_templates import MetadataTemplateCache, MetadataTemplateError
+from cache.ttl_cache import TTLCache
+from tools.box_tools_metadata import (
+    box_metadata_template_create_tool,
+    box_metadata_template_get_by_name_tool,
+    box_metadata_template_list_tool,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+TEMPLATES = [
+    {"templateKey": "invoice", "displayName": "Invoice", "fields": []},
+    {"templateKey": "contract", "displayName": "Contract", "fields": []},
+]
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def template_list():
+    with patch(
+        "cache.metadata_templates.box_metadata_template_list",
+        return_value={"metadata_templates": list(TEMPLATES)},
+    ) as template_list:
+        yield template_list
+
+
+@pytest.mark.asyncio
+async def test_templates_are_indexed_by_key_and_name(clock, template_list):
+    cache = MetadataTemplateCache(ttl=60, clock=clock)
+    client = MagicMock()
+    assert (await cache.get_template(client, "invoice"))["displayName"] == "Invoice"
+    template = await cache.find_template_by_name(client, "contract")
+    assert template["templateKey"] == "contract"
+    assert template_list.call_count == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_index_is_kept_per_enterprise(clock, template_list):
+    cache = MetadataTemplateCache(ttl=60, clock=clock)
+    await cache.get_index(MagicMock(), "a")
+    await cache.get_index(MagicMock(), "b")
+    await cache.get_index(MagicMock(), "a")
+    assert template_list.call_count == 2
+    assert cache.stats()["enterprises"] == 2
+
+
+@pytest.mark.asyncio
+async def test_indexes_are_bounded(clock, template_list):
+    cache = MetadataTemplateCache(ttl=60, max_stale=60, max_size=2, clock=clock)
+    for enterprise in ["a", "b", "c"]:
+        await cache.get_index(MagicMock(), enterprise)
+    assert cache.stats()["enterprises"] == 2
+    assert cache._inflight == {}
+    await cache.get_index(MagicMock(), "a")
+    assert template_list.call_count == 4
+
+    # Dropped once past max_stale
+    clock.now = 121
+    assert cache.stats()["enterprises"] == 2
+    await cache.get_index(MagicMock(), "a")
+    assert template_list.call_count == 5
+    assert cache.stats()["stale_hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_tokens_of_one_enterprise_share_the_index(clock, template_list):
+    cache = MetadataTemplateCache(ttl=60, clock=clock)
+
+    def ctx_with(token):
+        ctx = MagicMock()
+        ctx.request_context.request.scope = {"oauth_token": token}
+        return ctx
+
+    with (
+        patch(
+            "tools.box_tools_metadata.get_metadata_template_cache", return_value=cache
+        ),
+        patch("tools.box_tools_metadata.get_box_client"),
+        patch(
+            "tools.box_tools_generic.get_enterprise_cache",
+            return_value=TTLCache(max_size=10, ttl=60),
+        ),
+        patch(
+            "tools.box_tools_generic.box_user_enterprise_id_async",
+            new=AsyncMock(return_value="42"),
+        ),
+    ):
+        await box_metadata_template_list_tool(ctx_with("a"))
+        await box_metadata_template_list_tool(ctx_with("b"))
+    assert template_list.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_index_is_served_while_reloading(clock, template_list):
+    cache = MetadataTemplateCache(ttl=60, max_stale=600, clock=clock)
+    first = await cache.get_index(MagicMock())
+    clock.now = 100
+    assert await cache.get_index(MagicMock()) is first
+    await cache._inflight[""]
+    assert template_list.call_count == 2
+    assert cache.stats()["stale_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unknown_template_reloads_once(clock, template_list):
+    cache = MetadataTemplateCache(ttl=60, clock=clock)
+    client = MagicMock()
+    await cache.get_index(client)
+    assert await cache.get_template(client, "missing") is None
+    assert template_list.call_count == 1
+    clock.now = 30
+    assert await cache.get_template(client, "missing") is None
+    assert template_list.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_load_error_keeps_previous_index(clock, template_list):
+    cache = MetadataTemplateCache(ttl=60, max_stale=600, clock=clock)
+    first = await cache.get_index(MagicMock())
+    template_list.return_value = {"error": "503"}
+    clock.now = 100
+    assert await cache.get_index(MagicMock(), refresh=True) is first
+    cache.invalidate()
+    with pytest.raises(MetadataTemplateError):
+        await cache.get_index(MagicMock())
+
+
+@pytest.mark.asyncio
+@patch("tools.box_tools_metadata.box_metadata_template_create")
+@patch("tools.box_tools_metadata.get_box_client")
+async def test_tools_use_the_cache_and_create_invalidates(
+    mock_get_client, mock_create, clock, template_list
+):
+    cache = MetadataTemplateCache(ttl=60, clock=clock)
+    ctx = MagicMock()
+    ctx.request_context.request.scope = {}
+    with patch(
+        "tools.box_tools_metadata.get_metadata_template_cache", return_value=cache
+    ):
+        result = await box_metadata_template_list_tool(ctx)
+        assert result == {"metadata_templates": TEMPLATES}
+        result = await box_metadata_template_get_by_name_tool(ctx, "INVOICE")
+        assert result["metadata_template"]["templateKey"] == "invoice"
+        assert template_list.call_count == 1
+
+        mock_create.return_value = {"templateKey": "po", "displayName": "PO"}
+        await box_metadata_template_create_tool(ctx, "PO", [], template_key="po")
+        await box_metadata_template_list_tool(ctx)
+        assert template_list.call_count == 2
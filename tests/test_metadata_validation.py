@@ -0,0 +1,112 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from cache.metadata_templates import MetadataTemplateCache
+from metadata_validation import MetadataValidationError, MetadataValidator
+from tools.box_tools_metadata import box_metadata_set_instance_on_file_tool
+
+TEMPLATE = {
+    "templateKey": "invoice",
+    "fields": [
+        {"type": "string", "key": "vendor"},
+        {"type": "float", "key": "amount"},
+        {"type": "date", "key": "due"},
+        {
+            "type": "enum",
+            "key": "status",
+            "options": [{"key": "open"}, {"key": "paid"}],
+        },
+        {
+            "type": "multiSelect",
+            "key": "tags",
+            "options": [{"key": "urgent"}, {"key": "disputed"}],
+        },
+    ],
+}
+
+
+@pytest.fixture
+def validator():
+    return MetadataValidator.compile(TEMPLATE)
+
+
+def test_valid_metadata_is_coerced(validator):
+    result = validator.validate(
+        {
+            "vendor": "Acme",
+            "amount": "12.5",
+            "due": "2023-10-01",
+            "status": "paid",
+            "tags": "urgent",
+        }
+    )
+    assert result == {
+        "vendor": "Acme",
+        "amount": 12.5,
+        "due": "2023-10-01T00:00:00.000Z",
+        "status": "paid",
+        "tags": ["urgent"],
+    }
+
+
+def test_dates_are_converted_to_utc(validator):
+    assert validator.validate({"due": "2023-10-01T02:30:00+02:00"}) == {
+        "due": "2023-10-01T00:30:00.000Z"
+    }
+    assert validator.validate({"due": "2023-10-01T00:00:00.000Z"}) == {
+        "due": "2023-10-01T00:00:00.000Z"
+    }
+
+
+def test_all_errors_are_reported(validator):
+    with pytest.raises(MetadataValidationError) as e:
+        validator.validate(
+            {"vendor": 1, "amount": "lots", "status": "late", "colour": "red"}
+        )
+    assert e.value.template_key == "invoice"
+    assert len(e.value.errors) == 4
+    assert "'colour' is not a field of the template" in str(e.value)
+
+
+def test_none_clears_a_field(validator):
+    assert validator.validate({"amount": None}) == {"amount": None}
+
+
+def test_booleans_are_not_numbers(validator):
+    with pytest.raises(MetadataValidationError):
+        validator.validate({"amount": True})
+
+
+@pytest.mark.asyncio
+@patch("tools.box_tools_metadata.box_metadata_set_instance_on_file")
+@patch("tools.box_tools_metadata.get_box_client")
+async def test_set_instance_tool_rejects_invalid_metadata(mock_get_client, mock_set):
+    cache = MetadataTemplateCache(ttl=60)
+    ctx = MagicMock()
+    ctx.request_context.request.scope = {}
+    mock_set.return_value = {"metadata_instance": {}}
+    with (
+        patch(
+            "cache.metadata_templates.box_metadata_template_list",
+            return_value={"metadata_templates": [TEMPLATE]},
+        ),
+        patch(
+            "tools.box_tools_metadata.get_metadata_template_cache", return_value=cache
+        ),
+    ):
+        result = await box_metadata_set_instance_on_file_tool(
+            ctx, "invoice", "123", {"amount": "lots"}
+        )
+        assert "'amount': expected a number" in result["error"]
+        mock_set.assert_not_called()
+
+        await box_metadata_set_instance_on_file_tool(
+            ctx, "invoice", "123", {"amount": "3"}
+        )
+        assert mock_set.call_args.args[3] == {"amount": 3.0}
+        # Templates that are not in the cache are left to Box
+        await box_metadata_set_instance_on_file_tool(
+            ctx, "global_props", "123", {"x": 1}
+        )
+        assert mock_set.call_args.args[3] == {"x": 1}
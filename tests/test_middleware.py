@@ -0,0 +1,121 @@
+import pytest
+
+from config import AppConfig, BoxAuthType, McpAuthType
+from mcp_auth.auth_header import get_authorization_header
+from middleware import AuthMiddleware
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = 0
+        self.scope = None
+
+    async def __call__(self, scope, receive, send):
+        self.calls += 1
+        self.scope = scope
+
+
+def make_scope(path="/mcp", authorization=None):
+    headers = [(b"content-type", b"application/json")]
+    if authorization is not None:
+        headers.append((b"authorization", authorization))
+    return {"type": "http", "method": "POST", "path": path, "headers": headers}
+
+
+async def call(middleware, scope):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    return messages
+
+
+def make_middleware(mcp_auth_type, box_auth=BoxAuthType.OAUTH, auth_token="secret"):
+    config = AppConfig()
+    config.server.mcp_auth_type = mcp_auth_type
+    config.server.box_auth = box_auth
+    config.mcp_auth.auth_token = auth_token
+    app = Recorder()
+    return app, AuthMiddleware(app, app_config=config)
+
+
+def test_get_authorization_header():
+    assert (
+        get_authorization_header(make_scope(authorization=b"Bearer a")) == b"Bearer a"
+    )
+    assert get_authorization_header(make_scope()) is None
+
+
+@pytest.mark.asyncio
+async def test_token_auth_accepts_expected_token():
+    app, middleware = make_middleware(McpAuthType.TOKEN)
+    assert await call(middleware, make_scope(authorization=b"Bearer secret")) == []
+    assert app.calls == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "authorization,status,error",
+    [
+        (None, 401, b"invalid_request"),
+        (b"Basic secret", 401, b"invalid_request"),
+        (b"Bearer wrong", 401, b"invalid_token"),
+        (b"Bearer secretsecret", 401, b"invalid_token"),
+    ],
+)
+async def test_token_auth_rejects_request(authorization, status, error):
+    app, middleware = make_middleware(McpAuthType.TOKEN)
+    # The prebuilt responses are sent more than once
+    for _ in range(2):
+        start, body = await call(middleware, make_scope(authorization=authorization))
+        assert start["status"] == status
+        assert (
+            b"www-authenticate",
+            b'Bearer realm="OAuth", resource_metadata="/.well-known/oauth-protected-resource"',
+        ) in start["headers"]
+        assert error in body["body"]
+    assert app.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_token_auth_without_configured_token():
+    app, middleware = make_middleware(McpAuthType.TOKEN, auth_token=None)
+    start, _ = await call(middleware, make_scope(authorization=b"Bearer secret"))
+    assert start["status"] == 500
+
+
+@pytest.mark.asyncio
+async def test_public_paths_skip_authentication():
+    app, middleware = make_middleware(McpAuthType.TOKEN)
+    await call(middleware, make_scope(path="/.well-known/oauth-protected-resource"))
+    assert app.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_no_auth_passes_through():
+    app, middleware = make_middleware(McpAuthType.NONE, box_auth=BoxAuthType.CCG)
+    await call(middleware, make_scope())
+    assert app.calls == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "mcp_auth_type,box_auth",
+    [
+        (McpAuthType.OAUTH, BoxAuthType.OAUTH),
+        (McpAuthType.NONE, BoxAuthType.MCP_CLIENT),
+    ],
+)
+async def test_box_auth_stores_token_in_scope(mcp_auth_type, box_auth):
+    app, middleware = make_middleware(mcp_auth_type, box_auth=box_auth)
+    await call(middleware, make_scope(authorization=b"Bearer box-token"))
+    assert app.scope["oauth_token"] == "box-token"
+
+    start, _ = await call(middleware, make_scope())
+    assert start["status"] == 401
+    assert app.calls == 1
@@ -0,0 +1,222 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.testclient import TestClient
+
+from cache.oauth_metadata import AuthorizationServerMetadataCache
+from config import AppConfig
+from metrics import collect_metrics
+from oauth_endpoints import add_oauth_endpoints, merge_authorization_server_metadata
+
+BOX_METADATA = {
+    "issuer": "https://account.box.com",
+    "authorization_endpoint": "https://account.box.com/api/oauth2/authorize",
+    "token_endpoint": "https://api.box.com/oauth2/token",
+}
+
+
+class UpstreamHandler(BaseHTTPRequestHandler):
+    """Stand-in for Box's /.well-known/oauth-authorization-server."""
+
+    protocol_version = "HTTP/1.1"
+    fetches = 0
+    delay = 0.0
+    fail = False
+    document = BOX_METADATA
+
+    def do_GET(self):
+        UpstreamHandler.fetches += 1
+        time.sleep(self.delay)
+        status = 503 if self.fail else 200
+        body = json.dumps({} if self.fail else self.document).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def upstream():
+    UpstreamHandler.fetches = 0
+    UpstreamHandler.delay = 0.0
+    UpstreamHandler.fail = False
+    UpstreamHandler.document = BOX_METADATA
+    server = ThreadingHTTPServer(("127.0.0.1", 0), UpstreamHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/.well-known/oauth-authorization-server"
+    server.shutdown()
+    server.server_close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_fetch(upstream):
+    UpstreamHandler.delay = 0.1
+    cache = AuthorizationServerMetadataCache(url=upstream)
+    documents = await asyncio.gather(*[cache.get() for _ in range(20)])
+    assert all(document == BOX_METADATA for document in documents)
+    assert UpstreamHandler.fetches == 1
+
+
+@pytest.mark.asyncio
+async def test_fresh_document_is_served_from_memory(upstream):
+    clock = FakeClock()
+    cache = AuthorizationServerMetadataCache(url=upstream, ttl=60, clock=clock)
+    await cache.get()
+    clock.now = 59
+    await cache.get()
+    assert UpstreamHandler.fetches == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_document_is_served_while_revalidating(upstream):
+    clock = FakeClock()
+    cache = AuthorizationServerMetadataCache(
+        url=upstream, ttl=60, max_stale=600, clock=clock
+    )
+    await cache.get()
+
+    UpstreamHandler.document = {**BOX_METADATA, "issuer": "updated"}
+    clock.now = 120
+    # The stale document is returned straight away
+    assert (await cache.get())["issuer"] == "https://account.box.com"
+    await cache._inflight
+    assert (await cache.get())["issuer"] == "updated"
+    assert UpstreamHandler.fetches == 2
+    assert cache.generation == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_document_is_fetched_again(upstream):
+    clock = FakeClock()
+    cache = AuthorizationServerMetadataCache(
+        url=upstream, ttl=60, max_stale=600, clock=clock
+    )
+    await cache.get()
+    UpstreamHandler.document = {**BOX_METADATA, "issuer": "updated"}
+    clock.now = 1000
+    assert (await cache.get())["issuer"] == "updated"
+
+
+@pytest.mark.asyncio
+async def test_last_document_is_served_when_upstream_fails(upstream):
+    clock = FakeClock()
+    cache = AuthorizationServerMetadataCache(
+        url=upstream, ttl=60, max_stale=600, clock=clock
+    )
+    await cache.get()
+    UpstreamHandler.fail = True
+    clock.now = 1000
+    assert await cache.get() == BOX_METADATA
+    assert cache.stats()["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_upstream_failure_without_document_raises(upstream):
+    UpstreamHandler.fail = True
+    cache = AuthorizationServerMetadataCache(url=upstream)
+    with pytest.raises(httpx.HTTPStatusError):
+        await cache.get()
+
+
+def test_merge_adds_registration_endpoint_and_scopes():
+    merged = merge_authorization_server_metadata(
+        BOX_METADATA,
+        {"resource": "https://mcp.example.org/mcp", "scopes_supported": ["root"]},
+    )
+    assert merged["registration_endpoint"] == "https://mcp.example.org/oauth/register"
+    assert merged["scopes_supported"] == ["root"]
+    assert "registration_endpoint" not in BOX_METADATA
+
+
+@pytest.fixture
+def app_config(upstream, tmp_path):
+    config_file = tmp_path / ".oauth-protected-resource.json"
+    config_file.write_text(
+        json.dumps(
+            {"resource": "https://mcp.example.org/mcp", "scopes_supported": ["root"]}
+        )
+    )
+    config = AppConfig()
+    config.mcp_auth.oauth_protected_resources_config_file = str(config_file)
+    config.mcp_auth.oauth_authorization_server_metadata_url = upstream
+    return config
+
+
+def test_authorization_server_endpoint_uses_cache(app_config):
+    app = Starlette()
+    add_oauth_endpoints(app, app_config)
+
+    with TestClient(app) as client:
+        for path in ["", "/mcp", "/sse"]:
+            response = client.get(f"/.well-known/oauth-authorization-server{path}")
+            assert response.status_code == 200
+            assert response.json() == {
+                **BOX_METADATA,
+                "registration_endpoint": "https://mcp.example.org/oauth/register",
+                "scopes_supported": ["root"],
+            }
+
+    assert UpstreamHandler.fetches == 1
+    assert collect_metrics()["oauth_metadata"]["hits"] == 2
+
+
+def test_authorization_server_endpoint_reports_upstream_failure(app_config):
+    UpstreamHandler.fail = True
+    app = Starlette()
+    add_oauth_endpoints(app, app_config)
+
+    with TestClient(app) as client:
+        response = client.get("/.well-known/oauth-authorization-server")
+    assert response.status_code == 502
+    assert response.json()["error"] == "server_error"
+
+
+def test_protected_resource_endpoint_supports_etag(app_config):
+    app = Starlette()
+    add_oauth_endpoints(app, app_config)
+
+    with TestClient(app) as client:
+        response = client.get("/.well-known/oauth-protected-resource")
+        assert response.status_code == 200
+        assert response.json()["resource"] == "https://mcp.example.org/mcp"
+        etag = response.headers["etag"]
+
+        response = client.get(
+            "/.well-known/oauth-protected-resource/mcp",
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+
+def test_protected_resource_endpoint_without_config(app_config, tmp_path):
+    app_config.mcp_auth.oauth_protected_resources_config_file = str(
+        tmp_path / "missing.json"
+    )
+    app = Starlette()
+    add_oauth_endpoints(app, app_config)
+
+    with TestClient(app) as client:
+        response = client.get("/.well-known/oauth-protected-resource")
+    assert response.status_code == 500
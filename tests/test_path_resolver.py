@@ -0,0 +1,206 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from mcp.server.fastmcp import Context
+
+from cache.path_resolver import PathResolver, split_path
+from tools.box_api_async import BoxAsyncAPIError
+from tools.box_tools_folders import box_folder_rename_tool, box_resolve_path_tool
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def item(item_type, item_id, name):
+    return {"type": item_type, "id": item_id, "name": name}
+
+
+# Folder contents, sorted as Box sorts them by name
+FOLDERS = {
+    "0": [
+        item("folder", "1", "Archive"),
+        item("folder", "2", "Finance"),
+        item("folder", "3", "Legal"),
+        item("file", "90", "readme.txt"),
+    ],
+    "2": [
+        item("folder", "20", "2024"),
+        item("folder", "21", "2025"),
+        item("file", "91", "budget.xlsx"),
+    ],
+    "21": [item("folder", "210", "Q3"), item("file", "92", "plan.docx")],
+    "210": [item("file", "93", "report.pdf")],
+}
+
+
+class FakeBox:
+    def __init__(self, folders, page_size=2):
+        self.folders = folders
+        self.page_size = page_size
+        self.calls = []
+
+    async def __call__(self, client, folder_id, offset, limit, fields):
+        self.calls.append((folder_id, offset))
+        entries = self.folders[folder_id]
+        return {
+            "entries": entries[offset : offset + self.page_size],
+            "total_count": len(entries),
+        }
+
+
+@pytest.fixture
+def box():
+    fake = FakeBox(FOLDERS)
+    with patch("cache.path_resolver.list_folder_items_by_name_async", new=fake):
+        yield fake
+
+
+def test_split_path():
+    assert split_path("/Finance//2025/ Q3 /") == ["Finance", "2025", " Q3 "]
+    assert split_path("/") == []
+
+
+@pytest.mark.asyncio
+async def test_resolves_paths_and_caches_them(box):
+    resolver = PathResolver()
+    client = MagicMock()
+    assert await resolver.resolve(client, "/finance/2025/q3/Report.PDF") == {
+        "type": "file",
+        "id": "93",
+        "name": "report.pdf",
+        "path": "/Finance/2025/Q3/report.pdf",
+    }
+    walked = len(box.calls)
+
+    # A resolved path is one cache hit
+    item = await resolver.resolve(client, "Finance/2025/Q3/report.pdf")
+    assert item["id"] == "93"
+    assert len(box.calls) == walked
+
+    # Paths below a cached prefix only list the remaining folders
+    box.calls.clear()
+    assert (await resolver.resolve(client, "/Finance/2025/plan.docx"))["id"] == "92"
+    assert box.calls == [("21", 0)]
+
+
+@pytest.mark.asyncio
+async def test_walk_stops_once_names_pass_the_target(box):
+    resolver = PathResolver()
+    # "Finance" on the first page sorts after "Bills", the next page is not read
+    assert await resolver.resolve(MagicMock(), "/Bills/2025") is None
+    assert box.calls == [("0", 0)]
+
+    # A folder is not looked for among the files, a file is
+    box.calls.clear()
+    assert await resolver.resolve(MagicMock(), "/readme.txt/x") is None
+    assert (await resolver.resolve(MagicMock(), "/readme.txt"))["id"] == "90"
+
+
+@pytest.mark.asyncio
+async def test_walk_only_stops_on_plain_names(box):
+    resolver = PathResolver()
+    # Sorted by locale, "~archive" and "Äpfel" come before "Zeta" though
+    # they fold after it
+    box.folders = {
+        "0": [
+            item("folder", "5", "~archive"),
+            item("folder", "1", "Äpfel"),
+            item("folder", "2", "Zeta"),
+            item("folder", "3", "Zürich"),
+            item("folder", "4", "Zz"),
+        ]
+    }
+    assert (await resolver.resolve(MagicMock(), "/Zeta"))["id"] == "2"
+    assert (await resolver.resolve(MagicMock(), "/zürich"))["id"] == "3"
+    box.calls.clear()
+    assert await resolver.resolve(MagicMock(), "/Zürich2") is None
+    assert box.calls == [("0", 0), ("0", 2), ("0", 4)]
+
+
+@pytest.mark.asyncio
+async def test_rename_drops_the_paths_through_the_item(box):
+    resolver = PathResolver()
+    client = MagicMock()
+    await resolver.resolve(client, "/Finance/2025/Q3")
+    box.folders = {
+        **FOLDERS,
+        "2": [item("folder", "20", "2024"), item("folder", "21", "FY2025")],
+    }
+    resolver.invalidate("21")
+    assert await resolver.resolve(client, "/Finance/2025/Q3") is None
+    assert (await resolver.resolve(client, "/Finance/FY2025/Q3"))["id"] == "210"
+    # Paths resolved after the rename are cached again
+    box.calls.clear()
+    assert (await resolver.resolve(client, "/Finance/FY2025/Q3"))["id"] == "210"
+    assert box.calls == []
+
+
+@pytest.mark.asyncio
+async def test_cached_paths_expire(box):
+    clock = FakeClock()
+    resolver = PathResolver(ttl=60, clock=clock)
+    await resolver.resolve(MagicMock(), "/Legal")
+    box.calls.clear()
+    clock.now = 61
+    await resolver.resolve(MagicMock(), "/Legal")
+    assert box.calls == [("0", 0), ("0", 2)]
+
+
+@pytest.mark.asyncio
+async def test_paths_are_cached_per_caller(box):
+    resolver = PathResolver()
+    await resolver.resolve(MagicMock(), "/Legal", identity="a")
+    box.calls.clear()
+    await resolver.resolve(MagicMock(), "/Legal", identity="b")
+    assert box.calls != []
+
+
+@pytest.mark.asyncio
+async def test_resolve_path_tool():
+    ctx = MagicMock(spec=Context)
+    resolver = PathResolver()
+    with (
+        patch("tools.box_tools_folders.get_box_client"),
+        patch("tools.box_tools_folders.get_path_resolver", return_value=resolver),
+        patch("tools.box_tools_folders.box_folder_rename") as rename,
+        patch(
+            "cache.path_resolver.list_folder_items_by_name_async",
+            new=FakeBox(FOLDERS),
+        ),
+    ):
+        result = await box_resolve_path_tool(ctx, "/Finance/2025")
+        assert result == {
+            "item": {
+                "type": "folder",
+                "id": "21",
+                "name": "2025",
+                "path": "/Finance/2025",
+            }
+        }
+        assert await box_resolve_path_tool(ctx, "/Finance/2026") == {
+            "error": "Path not found: /Finance/2026"
+        }
+
+        # A failed rename keeps the cached paths
+        rename.return_value = {"error": "name in use"}
+        await box_folder_rename_tool(ctx, "21", "FY2025")
+        assert resolver._lookup(("", "0", ("finance", "2025"))) is not None
+
+        rename.return_value = {"folder": {}}
+        await box_folder_rename_tool(ctx, "21", "FY2025")
+        assert resolver._lookup(("", "0", ("finance", "2025"))) is None
+
+    with (
+        patch("tools.box_tools_folders.get_box_client"),
+        patch(
+            "cache.path_resolver.list_folder_items_by_name_async",
+            side_effect=BoxAsyncAPIError(404, "404 Not Found; Request ID: 1"),
+        ),
+    ):
+        result = await box_resolve_path_tool(ctx, "/Finance", base_folder_id="5")
+        assert result == {"error": "404 Not Found; Request ID: 1"}
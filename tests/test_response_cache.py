@@ -0,0 +1,249 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cache import response_cache
+from cache.response_cache import (
+    ResponseCache,
+    cache_responses,
+    collect_object_ids,
+    configure_response_cache,
+    is_write_tool,
+)
+from config import CacheConfig, parse_tool_ttls
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_ctx(token=None):
+    ctx = MagicMock()
+    ctx.request_context.request.scope = {"oauth_token": token} if token else {}
+    return ctx
+
+
+def box_response(status_code, etag=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = {"etag": etag} if etag else {}
+    return response
+
+
+@pytest.fixture
+def clock():
+    clock = FakeClock()
+    cache = ResponseCache(CacheConfig(response_cache=True), clock=clock)
+    with patch.object(response_cache, "_response_cache", cache):
+        yield clock
+
+
+@pytest.fixture
+def box_api():
+    with (
+        patch("cache.response_cache.get_box_client"),
+        patch("cache.response_cache.box_api_request", new=AsyncMock()) as request,
+    ):
+        yield request
+
+
+def make_folder_tools():
+    calls = {"info": 0}
+
+    async def box_folder_info_tool(ctx, folder_id: str) -> dict:
+        calls["info"] += 1
+        return {"folder": {"id": folder_id, "etag": str(calls["info"]), "name": "F"}}
+
+    async def box_folder_rename_tool(ctx, folder_id: str, new_name: str) -> dict:
+        return {"folder": {"id": folder_id, "name": new_name}}
+
+    return (
+        cache_responses(box_folder_info_tool),
+        cache_responses(box_folder_rename_tool),
+        calls,
+    )
+
+
+def test_write_tools_are_detected():
+    assert is_write_tool("box_folder_rename_tool")
+    assert is_write_tool("box_shared_link_file_create_or_update_tool")
+    assert is_write_tool("box_folder_tag_add_tool")
+    assert is_write_tool("box_collaboration_file_user_by_user_id_tool")
+    assert is_write_tool("box_collaboration_folder_group_by_group_id_tool")
+    assert not is_write_tool("box_folder_info_tool")
+    assert not is_write_tool("box_ai_ask_file_single_tool")
+
+
+def test_collect_object_ids():
+    result = {"entries": [{"id": "1", "item": {"id": 2}}, {"name": "x"}]}
+    assert collect_object_ids(result) == {"1", "2"}
+
+
+def test_other_tools_are_not_wrapped():
+    async def box_search_tool(ctx, query: str) -> dict:
+        return {}
+
+    assert cache_responses(box_search_tool) is box_search_tool
+
+
+def test_parse_tool_ttls():
+    assert parse_tool_ttls("") == {}
+    assert parse_tool_ttls("box_folder_info_tool=300, a=0") == {
+        "box_folder_info_tool": 300.0,
+        "a": 0.0,
+    }
+    with pytest.raises(ValueError):
+        parse_tool_ttls("box_folder_info_tool")
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_passes_through():
+    configure_response_cache(CacheConfig(response_cache=False))
+    info, _, calls = make_folder_tools()
+    await info(make_ctx(), folder_id="1")
+    await info(make_ctx(), folder_id="1")
+    assert calls["info"] == 2
+
+
+@pytest.mark.asyncio
+async def test_fresh_result_is_served_from_cache(clock, box_api):
+    info, _, calls = make_folder_tools()
+    first = await info(make_ctx(), folder_id="1")
+    clock.now = 30
+    assert await info(make_ctx(), "1") == first
+    assert calls["info"] == 1
+    box_api.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_results_are_kept_per_identity_and_arguments(clock, box_api):
+    info, _, calls = make_folder_tools()
+    await info(make_ctx("token-a"), folder_id="1")
+    await info(make_ctx("token-b"), folder_id="1")
+    await info(make_ctx("token-a"), folder_id="2")
+    await info(make_ctx("token-a"), folder_id="1")
+    assert calls["info"] == 3
+
+
+@pytest.mark.asyncio
+async def test_stale_result_is_revalidated_with_etag(clock, box_api):
+    info, _, calls = make_folder_tools()
+    first = await info(make_ctx(), folder_id="1")
+
+    box_api.return_value = box_response(304)
+    clock.now = 120
+    assert await info(make_ctx(), folder_id="1") == first
+    assert calls["info"] == 1
+    assert box_api.call_args.kwargs["headers"] == {"If-None-Match": "1"}
+    # Renewed for another TTL
+    clock.now = 150
+    await info(make_ctx(), folder_id="1")
+    assert box_api.call_count == 1
+
+    box_api.return_value = box_response(200, etag="2")
+    clock.now = 300
+    assert (await info(make_ctx(), folder_id="1"))["folder"]["etag"] == "2"
+    assert calls["info"] == 2
+    stats = response_cache.get_response_cache().stats()
+    assert stats["not_modified"] == 1
+    assert stats["revalidations"] == 2
+
+
+@pytest.mark.asyncio
+async def test_etag_is_fetched_when_result_has_none(clock, box_api):
+    calls = []
+
+    async def box_folder_list_tags_tool(ctx, folder_id: str) -> dict:
+        calls.append(folder_id)
+        return {"tags": ["a"]}
+
+    tool = cache_responses(box_folder_list_tags_tool)
+    box_api.return_value = box_response(200, etag="7")
+    await tool(make_ctx(), folder_id="1")
+    box_api.return_value = box_response(304)
+    clock.now = 120
+    assert await tool(make_ctx(), folder_id="1") == {"tags": ["a"]}
+    assert len(calls) == 1
+    assert box_api.call_args.kwargs["headers"] == {"If-None-Match": "7"}
+
+
+@pytest.mark.asyncio
+async def test_write_tool_invalidates_object(clock, box_api):
+    info, rename, calls = make_folder_tools()
+    await info(make_ctx(), folder_id="1")
+    await info(make_ctx(), folder_id="2")
+    await rename(make_ctx(), folder_id="1", new_name="G")
+    await info(make_ctx(), folder_id="1")
+    await info(make_ctx(), folder_id="2")
+    assert calls["info"] == 3
+
+
+@pytest.mark.asyncio
+async def test_write_invalidates_results_containing_returned_ids(clock, box_api):
+    calls = []
+
+    async def box_collaboration_list_by_folder_tool(ctx, folder_id: str) -> dict:
+        calls.append(folder_id)
+        return {"collaborations": [{"id": "c1", "item": {"id": folder_id}}]}
+
+    async def box_collaboration_delete_tool(ctx, collaboration_id: str) -> dict:
+        return {"message": "deleted"}
+
+    list_tool = cache_responses(box_collaboration_list_by_folder_tool)
+    delete_tool = cache_responses(box_collaboration_delete_tool)
+    await list_tool(make_ctx(), folder_id="1")
+    await delete_tool(make_ctx(), collaboration_id="c1")
+    await list_tool(make_ctx(), folder_id="1")
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_collaboration_create_invalidates_list(clock, box_api):
+    collaborators = []
+
+    async def box_collaboration_list_by_file_tool(ctx, file_id: str) -> dict:
+        return {"collaborations": [{"id": user} for user in collaborators]}
+
+    async def box_collaboration_file_user_by_user_id_tool(
+        ctx, file_id: str, user_id: str, role: str = "editor"
+    ) -> dict:
+        collaborators.append(user_id)
+        return {"collaboration": {"id": "c1", "item": {"id": file_id}}}
+
+    list_tool = cache_responses(box_collaboration_list_by_file_tool)
+    create_tool = cache_responses(box_collaboration_file_user_by_user_id_tool)
+    assert await list_tool(make_ctx(), file_id="7") == {"collaborations": []}
+    await create_tool(make_ctx(), file_id="7", user_id="42")
+    assert await list_tool(make_ctx(), file_id="7") == {
+        "collaborations": [{"id": "42"}]
+    }
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached(clock, box_api):
+    calls = []
+
+    async def box_folder_info_tool(ctx, folder_id: str) -> dict:
+        calls.append(folder_id)
+        return {"error": "404 Not Found"}
+
+    tool = cache_responses(box_folder_info_tool)
+    await tool(make_ctx(), folder_id="1")
+    await tool(make_ctx(), folder_id="1")
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_tool_ttl_override_disables_caching(box_api):
+    config = CacheConfig(
+        response_cache=True, response_cache_ttls={"box_folder_info_tool": 0}
+    )
+    with patch.object(response_cache, "_response_cache", ResponseCache(config)):
+        info, _, calls = make_folder_tools()
+        await info(make_ctx(), folder_id="1")
+        await info(make_ctx(), folder_id="1")
+    assert calls["info"] == 2
@@ -0,0 +1,133 @@
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from config import CacheConfig
+from metrics import collect_metrics
+from server_context import (
+    BoxContext,
+    configure_client_cache,
+    get_client_cache,
+    hash_token,
+)
+from tools.box_tools_generic import get_box_client
+
+
+def make_request(token: str | None):
+    """A stand-in for the Starlette request the middleware annotated."""
+    scope = {"oauth_token": token} if token else {}
+    return SimpleNamespace(scope=scope)
+
+
+def make_ctx(box_context: BoxContext, token: str | None):
+    """A stand-in for the FastMCP Context of a single tool call."""
+    return SimpleNamespace(
+        request_context=SimpleNamespace(
+            lifespan_context=box_context,
+            request=make_request(token),
+        )
+    )
+
+
+def test_get_active_client_prefers_pre_created_client():
+    client = MagicMock()
+    box_context = BoxContext(client=client)
+    assert box_context.get_active_client(make_request("token")) is client
+
+
+def test_get_active_client_without_request():
+    with pytest.raises(ValueError, match="No request context available"):
+        BoxContext().get_active_client()
+
+
+def test_get_active_client_without_token():
+    with pytest.raises(ValueError, match="No OAuth token found in request scope"):
+        BoxContext().get_active_client(make_request(None))
+
+
+def test_get_active_client_uses_request_token():
+    box_context = BoxContext()
+    with patch.object(
+        BoxContext, "get_client_from_token", side_effect=lambda token: token
+    ):
+        assert box_context.get_active_client(make_request("token-a")) == "token-a"
+        assert box_context.get_active_client(make_request("token-b")) == "token-b"
+
+
+def test_get_box_client_does_not_store_request_on_shared_context():
+    box_context = BoxContext()
+    with patch.object(
+        BoxContext, "get_client_from_token", side_effect=lambda token: token
+    ):
+        assert get_box_client(make_ctx(box_context, "first")) == "first"
+        assert get_box_client(make_ctx(box_context, "second")) == "second"
+    assert not hasattr(box_context, "request")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_multi_token_isolation():
+    """Many users share one lifespan context; each call must see its own token."""
+    box_context = BoxContext()
+    users = [f"token-{i}" for i in range(50)]
+    calls = 5000
+    mismatches = []
+
+    async def tool_call(token: str):
+        ctx = make_ctx(box_context, token)
+        # Interleave with other calls before and after resolving the client
+        await asyncio.sleep(random.random() * 0.001)
+        client = get_box_client(ctx)
+        await asyncio.sleep(random.random() * 0.001)
+        if client.token != token:
+            mismatches.append((token, client.token))
+
+    with patch.object(
+        BoxContext,
+        "get_client_from_token",
+        side_effect=lambda token: SimpleNamespace(token=token),
+    ):
+        start = time.perf_counter()
+        await asyncio.gather(*[tool_call(random.choice(users)) for _ in range(calls)])
+        elapsed = time.perf_counter() - start
+
+    assert mismatches == []
+    assert calls / elapsed > 1000
+
+
+@pytest.fixture
+def client_cache():
+    """A fresh per-token client cache for each test"""
+    configure_client_cache(CacheConfig(client_cache_max_size=2))
+    yield get_client_cache()
+    configure_client_cache(CacheConfig())
+
+
+def test_get_client_from_token_reuses_cached_client(client_cache):
+    box_context = BoxContext()
+    first = box_context.get_client_from_token("token-a")
+    assert box_context.get_client_from_token("token-a") is first
+    assert box_context.get_client_from_token("token-b") is not first
+    assert client_cache.stats()["hits"] == 1
+    assert client_cache.stats()["misses"] == 2
+
+
+def test_client_cache_is_keyed_by_token_hash(client_cache):
+    BoxContext().get_client_from_token("secret-token")
+    assert hash_token("secret-token") in client_cache
+    assert "secret-token" not in client_cache
+
+
+def test_client_cache_is_bounded(client_cache):
+    box_context = BoxContext()
+    for i in range(10):
+        box_context.get_client_from_token(f"token-{i}")
+    assert len(client_cache) == 2
+
+
+def test_client_cache_metrics_are_registered(client_cache):
+    BoxContext().get_client_from_token("token-a")
+    assert collect_metrics()["client_cache"]["size"] == 1
@@ -0,0 +1,85 @@
+import sys
+from unittest.mock import patch
+
+import pytest
+from starlette.testclient import TestClient
+
+import mcp_server_box
+from config import BoxAuthType, McpAuthType, ServerConfig, TransportType
+from server_workers import (
+    SERVER_CONFIG_ENV,
+    create_app,
+    export_server_config,
+    load_server_config,
+)
+
+
+@pytest.fixture
+def server_config_env(monkeypatch):
+    monkeypatch.delenv(SERVER_CONFIG_ENV, raising=False)
+    yield
+    monkeypatch.delenv(SERVER_CONFIG_ENV, raising=False)
+
+
+def test_server_config_round_trip(server_config_env):
+    config = ServerConfig(
+        transport=TransportType.STREAMABLE_HTTP,
+        host="0.0.0.0",
+        port=9000,
+        box_auth=BoxAuthType.MCP_CLIENT,
+        mcp_auth_type=McpAuthType.NONE,
+        workers=4,
+    )
+    export_server_config(config)
+
+    loaded = ServerConfig()
+    load_server_config(loaded)
+    assert loaded == config
+
+
+def test_load_server_config_without_export(server_config_env):
+    config = ServerConfig()
+    load_server_config(config)
+    assert config == ServerConfig()
+
+
+def test_create_app_keeps_auth_and_oauth_endpoints(server_config_env):
+    export_server_config(
+        ServerConfig(
+            transport=TransportType.STREAMABLE_HTTP,
+            box_auth=BoxAuthType.MCP_CLIENT,
+            mcp_auth_type=McpAuthType.NONE,
+            workers=2,
+        )
+    )
+    app = create_app()
+    paths = {route.path for route in app.routes}
+    assert "/mcp" in paths
+    assert "/.well-known/oauth-protected-resource" in paths
+
+    with TestClient(app) as client:
+        # mcp_client mode needs the bearer token of the MCP client
+        response = client.post("/mcp", json={})
+        assert response.status_code == 401
+
+
+@pytest.mark.parametrize(
+    "transport, expected_workers",
+    [("http", 3), ("sse", 1), ("stdio", 1)],
+)
+def test_main_runs_workers_only_for_http(transport, expected_workers):
+    argv = ["mcp-server-box", "--transport", transport, "--workers", "3"]
+    with (
+        patch.object(sys, "argv", argv),
+        patch.object(mcp_server_box, "run_workers") as run_workers,
+        patch.object(mcp_server_box, "build_mcp_server") as build_mcp_server,
+    ):
+        assert mcp_server_box.main() == 0
+
+    assert mcp_server_box.app_config.server.workers == expected_workers
+    if expected_workers > 1:
+        run_workers.assert_called_once_with(mcp_server_box.app_config)
+        build_mcp_server.assert_not_called()
+    else:
+        run_workers.assert_not_called()
+        build_mcp_server.return_value.run.assert_called_once()
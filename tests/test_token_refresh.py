@@ -0,0 +1,157 @@
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from box_sdk_gen import AccessToken
+
+from config import BoxApiConfig, TokenRefreshConfig
+from mcp_auth.token_refresh import (
+    TokenRefresher,
+    start_token_refresher,
+    stop_token_refreshers,
+)
+from metrics import collect_metrics
+from server_context import box_lifespan_ccg, clear_service_clients
+
+
+class FakeAuth:
+    """An auth object whose tokens live for expires_in seconds."""
+
+    def __init__(self, expires_in=3600, failures=0):
+        self.expires_in = expires_in
+        self.failures = failures
+        self.calls = 0
+        self.stored = None
+        self.token_storage = MagicMock()
+        self.token_storage.get.side_effect = lambda: self.stored
+        self.refreshed = threading.Event()
+
+    def refresh_token(self, network_session=None):
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("token endpoint unavailable")
+        self.stored = AccessToken(
+            access_token=f"token-{self.calls}", expires_in=self.expires_in
+        )
+        self.refreshed.set()
+        return self.stored
+
+
+@pytest.fixture(autouse=True)
+def reset_refreshers():
+    yield
+    stop_token_refreshers()
+    clear_service_clients()
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        time.sleep(0.01)
+
+
+def test_next_delay_refreshes_before_expiry():
+    now = [1000.0]
+    auth = FakeAuth(expires_in=3600)
+    refresher = TokenRefresher(
+        "ccg",
+        auth,
+        TokenRefreshConfig(refresh_margin=300, jitter=0.1),
+        clock=lambda: now[0],
+    )
+    # Unknown expiry, refresh straight away
+    assert refresher.next_delay() == 0.0
+
+    refresher.refresh()
+    assert refresher.seconds_until_expiry() == 3600
+    assert 3300 * 0.9 <= refresher.next_delay() <= 3300
+
+    now[0] += 3000
+    assert refresher.seconds_until_expiry() == 600
+    assert 300 * 0.9 <= refresher.next_delay() <= 300
+
+
+def test_short_lived_tokens_refresh_half_way():
+    auth = FakeAuth(expires_in=100)
+    refresher = TokenRefresher(
+        "ccg", auth, TokenRefreshConfig(refresh_margin=300, jitter=0), clock=lambda: 0.0
+    )
+    refresher.refresh()
+    assert refresher.next_delay() == 50
+
+
+def test_token_refreshed_uses_stored_token():
+    auth = FakeAuth(expires_in=3600)
+    auth.stored = AccessToken(access_token="startup", expires_in=1800)
+    refresher = TokenRefresher("jwt", auth, TokenRefreshConfig(), clock=lambda: 0.0)
+    refresher.token_refreshed()
+    assert refresher.seconds_until_expiry() == 1800
+    assert auth.calls == 0
+
+
+def test_failures_back_off_exponentially():
+    auth = FakeAuth()
+    refresher = TokenRefresher(
+        "ccg", auth, TokenRefreshConfig(min_backoff=1, max_backoff=4)
+    )
+    refresher._consecutive_failures = 1
+    assert 0.5 <= refresher.next_delay() <= 1
+    refresher._consecutive_failures = 3
+    assert 2 <= refresher.next_delay() <= 4
+    refresher._consecutive_failures = 10
+    assert 2 <= refresher.next_delay() <= 4
+
+
+def test_background_thread_refreshes_before_expiry():
+    auth = FakeAuth(expires_in=0.2)
+    refresher = start_token_refresher(
+        "ccg.enterprise.1", auth, TokenRefreshConfig(refresh_margin=0.05)
+    )
+    wait_for(lambda: refresher.refreshes >= 3)
+    assert refresher.seconds_until_expiry() > 0
+
+
+def test_background_thread_recovers_from_failures():
+    auth = FakeAuth(failures=2)
+    refresher = start_token_refresher(
+        "ccg.enterprise.1",
+        auth,
+        TokenRefreshConfig(min_backoff=0.01, max_backoff=0.05),
+    )
+    assert auth.refreshed.wait(5)
+    assert refresher.failures == 2
+    assert refresher.last_error == "token endpoint unavailable"
+    assert refresher.stats()["seconds_until_expiry"] > 3500
+
+
+def test_start_token_refresher_is_idempotent():
+    auth = FakeAuth()
+    first = start_token_refresher("ccg.enterprise.1", auth, TokenRefreshConfig())
+    second = start_token_refresher("ccg.enterprise.1", FakeAuth(), TokenRefreshConfig())
+    assert first is second
+    wait_for(lambda: auth.calls == 1)
+    metrics = collect_metrics()["token_refresh"]["ccg.enterprise.1"]
+    assert metrics["running"] is True
+    assert metrics["refreshes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_ccg_lifespan_shares_client_and_refresher():
+    auth = FakeAuth()
+    client = MagicMock(auth=auth)
+    config = BoxApiConfig(subject_type="enterprise", subject_id="1")
+
+    with patch("server_context.get_ccg_client", return_value=client) as factory:
+        for _ in range(3):
+            async with box_lifespan_ccg(
+                MagicMock(), config, TokenRefreshConfig()
+            ) as ctx:
+                assert ctx.client is client
+
+    factory.assert_called_once()
+    wait_for(lambda: auth.calls == 1)
+    assert list(collect_metrics()["token_refresh"]) == ["ccg.enterprise.1"]
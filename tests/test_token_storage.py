@@ -0,0 +1,189 @@
+import json
+import multiprocessing
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from box_sdk_gen import AccessToken, BaseUrls, CCGConfig, NetworkSession
+
+from config import BoxApiConfig, TokenRefreshConfig
+from mcp_auth.auth_box_api import get_ccg_client
+from mcp_auth.token_refresh import TokenRefresher
+from mcp_auth.token_storage import SharedFileTokenStorage, SharedTokenCCGAuth
+
+
+class TokenHandler(BaseHTTPRequestHandler):
+    """A token endpoint that counts the tokens it hands out."""
+
+    protocol_version = "HTTP/1.1"
+    fetches = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with self.lock:
+            TokenHandler.fetches += 1
+            number = TokenHandler.fetches
+        # Slow enough for the workers to race for the token
+        time.sleep(0.2)
+        body = json.dumps(
+            {
+                "access_token": f"token-{number}",
+                "expires_in": 3600,
+                "token_type": "bearer",
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def token_server():
+    TokenHandler.fetches = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), TokenHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_auth(filename: str) -> SharedTokenCCGAuth:
+    return SharedTokenCCGAuth(
+        CCGConfig(
+            client_id="id",
+            client_secret="secret",
+            enterprise_id="1",
+            token_storage=SharedFileTokenStorage(filename),
+        )
+    )
+
+
+def worker_retrieve_token(filename: str, base_url: str, barrier) -> str:
+    """Runs in a separate process, like one uvicorn worker."""
+    auth = make_auth(filename)
+    network_session = NetworkSession(base_urls=BaseUrls(base_url=base_url))
+    barrier.wait()
+    return auth.retrieve_token(network_session=network_session).access_token
+
+
+def worker_refresh_token(filename: str, base_url: str, barrier) -> str:
+    """Runs in a separate process and refreshes a token every worker has seen."""
+    auth = make_auth(filename)
+    network_session = NetworkSession(base_urls=BaseUrls(base_url=base_url))
+    # Pretend the token expired long ago, as a 401 response would tell
+    auth.min_refresh_interval = 0
+    barrier.wait()
+    return auth.refresh_token(network_session=network_session).access_token
+
+
+def run_workers(worker, filename: str, base_url: str, count: int = 6) -> list:
+    """Run worker in count processes that start their token calls together."""
+    context = multiprocessing.get_context("spawn")
+    with context.Manager() as manager, context.Pool(count) as pool:
+        barrier = manager.Barrier(count)
+        return pool.starmap(worker, [(filename, base_url, barrier)] * count)
+
+
+def test_store_and_get_round_trip(tmp_path):
+    storage = SharedFileTokenStorage(str(tmp_path / "token.json"), clock=lambda: 100.0)
+    assert storage.get() is None
+
+    storage.store(AccessToken(access_token="abc", expires_in=3600))
+
+    # A second instance, as in another process, sees the same token
+    other = SharedFileTokenStorage(str(tmp_path / "token.json"))
+    assert other.get().access_token == "abc"
+    assert other.fetched_at() == 100.0
+    assert other.expires_at() == 3700.0
+
+    storage.clear()
+    assert other.get() is None
+
+
+def test_store_replaces_file_atomically(tmp_path):
+    filename = tmp_path / "token.json"
+    storage = SharedFileTokenStorage(str(filename))
+    storage.store(AccessToken(access_token="first", expires_in=3600))
+    storage.store(AccessToken(access_token="second", expires_in=3600))
+
+    assert storage.get().access_token == "second"
+    # No temporary files are left behind
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["token.json"]
+
+
+def test_unreadable_file_is_ignored(tmp_path):
+    filename = tmp_path / "token.json"
+    filename.write_text("{not json")
+    assert SharedFileTokenStorage(str(filename)).get() is None
+
+
+def test_workers_fetch_one_token(tmp_path, token_server):
+    filename = str(tmp_path / "token.json")
+    tokens = run_workers(worker_retrieve_token, filename, token_server)
+
+    assert TokenHandler.fetches == 1
+    assert set(tokens) == {"token-1"}
+
+
+def test_workers_refresh_token_once(tmp_path, token_server):
+    filename = str(tmp_path / "token.json")
+    SharedFileTokenStorage(filename).store(
+        AccessToken(access_token="expired", expires_in=3600)
+    )
+    tokens = run_workers(worker_refresh_token, filename, token_server)
+
+    assert TokenHandler.fetches == 1
+    assert set(tokens) == {"token-1"}
+
+
+def test_refresher_adopts_token_of_other_worker(tmp_path):
+    filename = str(tmp_path / "token.json")
+    auth = make_auth(filename)
+    refresher = TokenRefresher("ccg", auth, TokenRefreshConfig())
+
+    # Another worker stored a fresh token
+    SharedFileTokenStorage(filename).store(
+        AccessToken(access_token="shared", expires_in=3600)
+    )
+    refresher.refresh()
+
+    assert refresher.refreshes == 0
+    assert refresher.seconds_until_expiry() > 3500
+
+
+def test_refresher_expiry_counts_from_the_shared_fetch(tmp_path):
+    filename = str(tmp_path / "token.json")
+    auth = make_auth(filename)
+    # Too close to expiry to be adopted, but too recent to be fetched again
+    refresher = TokenRefresher("ccg", auth, TokenRefreshConfig(refresh_margin=3590))
+    SharedFileTokenStorage(filename, clock=lambda: time.time() - 20).store(
+        AccessToken(access_token="shared", expires_in=3600)
+    )
+    refresher.refresh()
+
+    assert auth.token_storage.get().access_token == "shared"
+    assert 3570 < refresher.seconds_until_expiry() <= 3580
+
+
+def test_ccg_client_uses_shared_store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = BoxApiConfig(
+        client_id="id",
+        client_secret="secret",
+        subject_type="enterprise",
+        subject_id="1",
+    )
+    client = get_ccg_client(config)
+    assert isinstance(client.auth, SharedTokenCCGAuth)
+    assert client.auth.token_storage.filename == ".auth.ccg.enterprise.1.json"
+
+    config.shared_token_store = False
+    assert not isinstance(get_ccg_client(config).auth, SharedTokenCCGAuth)
@@ -0,0 +1,169 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from config import AppConfig, BoxAuthType, CacheConfig, McpAuthType
+from mcp_auth.token_validation import TokenValidator
+from middleware import AuthMiddleware
+
+
+class UsersMeHandler(BaseHTTPRequestHandler):
+    """Stand-in for Box's /2.0/users/me."""
+
+    protocol_version = "HTTP/1.1"
+    requests = 0
+    delay = 0.0
+    status = None
+
+    def do_GET(self):
+        UsersMeHandler.requests += 1
+        time.sleep(self.delay)
+        if self.status is not None:
+            status = self.status
+        elif self.headers.get("Authorization") == "Bearer good":
+            status = 200
+        else:
+            status = 401
+        body = b'{"type": "user", "id": "1"}' if status == 200 else b"{}"
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def box_api():
+    UsersMeHandler.requests = 0
+    UsersMeHandler.delay = 0.0
+    UsersMeHandler.status = None
+    server = ThreadingHTTPServer(("127.0.0.1", 0), UsersMeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    session = MagicMock()
+    session.base_urls.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    with patch("mcp_auth.token_validation.get_network_session", return_value=session):
+        yield
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_valid_token_is_probed_once(box_api):
+    validator = TokenValidator(CacheConfig())
+    for _ in range(5):
+        assert await validator.validate("good")
+    assert UsersMeHandler.requests == 1
+    assert validator.stats()["valid_hits"] == 4
+
+
+@pytest.mark.asyncio
+async def test_invalid_token_is_cached(box_api):
+    validator = TokenValidator(CacheConfig())
+    for _ in range(5):
+        assert not await validator.validate("bad")
+    assert UsersMeHandler.requests == 1
+    stats = validator.stats()
+    assert stats["invalid_hits"] == 4
+    assert stats["rejections"] == 5
+
+
+@pytest.mark.asyncio
+async def test_negative_entries_expire_first(box_api):
+    clock = FakeClock()
+    config = CacheConfig(token_cache_ttl=300, token_negative_cache_ttl=60)
+    validator = TokenValidator(config, clock=clock)
+    await validator.validate("good")
+    await validator.validate("bad")
+    clock.now = 61
+    await validator.validate("good")
+    await validator.validate("bad")
+    assert UsersMeHandler.requests == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checks_share_one_probe(box_api):
+    UsersMeHandler.delay = 0.1
+    validator = TokenValidator(CacheConfig())
+    results = await asyncio.gather(*[validator.validate("good") for _ in range(10)])
+    assert all(results)
+    assert UsersMeHandler.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_finished_probe_keeps_a_newer_one_in_flight():
+    validator = TokenValidator(CacheConfig())
+    release = asyncio.Event()
+
+    async def probe(key, token):
+        await release.wait()
+        return True
+
+    with patch.object(validator, "_probe", side_effect=probe):
+        first = asyncio.ensure_future(validator.validate("good"))
+        await asyncio.sleep(0)
+        (key,) = validator._inflight
+        # Replaced meanwhile, e.g. by a probe started on another event loop
+        newer = asyncio.get_running_loop().create_future()
+        validator._inflight[key] = newer
+        release.set()
+        assert await first
+        assert validator._inflight[key] is newer
+        newer.cancel()
+
+
+@pytest.mark.asyncio
+async def test_box_errors_let_the_token_through_uncached(box_api):
+    UsersMeHandler.status = 503
+    validator = TokenValidator(CacheConfig())
+    assert await validator.validate("bad")
+    assert await validator.validate("bad")
+    assert UsersMeHandler.requests == 2
+    assert validator.stats()["errors"] == 2
+
+
+@pytest.mark.asyncio
+async def test_middleware_rejects_invalid_token(box_api):
+    config = AppConfig()
+    config.server.mcp_auth_type = McpAuthType.OAUTH
+    config.server.box_auth = BoxAuthType.OAUTH
+    config.mcp_auth.validate_tokens = True
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(scope)
+
+    middleware = AuthMiddleware(app, app_config=config)
+    middleware.token_validator = TokenValidator(config.cache)
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    for token in [b"good", b"bad", b"bad"]:
+        scope = {
+            "type": "http",
+            "method": "POST",
+            "path": "/mcp",
+            "headers": [(b"authorization", b"Bearer " + token)],
+        }
+        await middleware(scope, None, send)
+
+    assert len(calls) == 1
+    assert [m["status"] for m in messages if "status" in m] == [401, 401]
+    assert UsersMeHandler.requests == 2
@@ -0,0 +1,69 @@
+import pytest
+
+from cache.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_get_and_set():
+    cache = TTLCache(max_size=2, ttl=10)
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire():
+    clock = FakeClock()
+    cache = TTLCache(max_size=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=100)
+    clock.now = 11
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert "a" not in cache
+    assert cache.stats()["expirations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # Touch "a" so "b" becomes the least recently used entry
+    cache.get("a")
+    cache.set("c", 3)
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_size_stays_bounded():
+    cache = TTLCache(max_size=100, ttl=10)
+    for i in range(10_000):
+        cache.set(i, i)
+    assert len(cache) == 100
+    assert cache.stats()["evictions"] == 9_900
+
+
+def test_pop_and_clear():
+    cache = TTLCache(max_size=2, ttl=10)
+    cache.set("a", 1)
+    assert cache.pop("a") == 1
+    assert cache.pop("a") is None
+    cache.set("b", 2)
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        TTLCache(max_size=0, ttl=10)
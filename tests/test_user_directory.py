@@ -0,0 +1,141 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from cache.snapshot_cache import SnapshotCache
+from cache.user_directory import UserDirectory
+from tools.box_tools_users import (
+    box_users_locate_by_email_tool,
+    box_users_search_by_name_or_email_tool,
+)
+
+USERS = [
+    {"type": "user", "id": "1", "name": "Ann Lee", "login": "ann@example.com"},
+    {"type": "user", "id": "2", "name": "Bob Annis", "login": "bob@example.com"},
+    {"type": "user", "id": "3", "name": "Joanne Roe", "login": "jroe@example.com"},
+    {"type": "user", "id": "4", "name": "Ann Lee", "login": "ann2@example.com"},
+]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def ids(users):
+    return [user["id"] for user in users]
+
+
+def test_exact_lookups():
+    directory = UserDirectory(USERS)
+    assert directory.locate_by_email("bob@example.com")["id"] == "2"
+    assert directory.locate_by_email("BOB@example.com") is None
+    # The first user with the name wins
+    assert directory.locate_by_name("Ann Lee")["id"] == "1"
+    assert directory.locate_by_name("Ann") is None
+    assert directory.users() == USERS
+
+
+def test_search_lists_prefix_matches_first():
+    directory = UserDirectory(USERS)
+    assert ids(directory.search("ann")) == ["1", "2", "4", "3"]
+    assert ids(directory.search("Lee")) == ["1", "4"]
+    assert ids(directory.search("jr")) == ["3"]
+    assert ids(directory.search("oann")) == ["3"]
+    # Short queries only match prefixes
+    assert ids(directory.search("nn")) == []
+    assert directory.search("  ") == []
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_reloaded_in_the_background():
+    clock = FakeClock()
+    loader = AsyncMock(side_effect=[["a"], ["b"]])
+    cache = SnapshotCache("test", loader, ttl=10, max_stale=100, clock=clock)
+    assert await cache.get(MagicMock()) == ["a"]
+    clock.now = 20
+    assert await cache.get(MagicMock()) == ["a"]
+    await cache._inflight[""]
+    assert await cache.get(MagicMock()) == ["b"]
+    assert cache.stats()["loads"] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_load_keeps_snapshot():
+    clock = FakeClock()
+    loader = AsyncMock(side_effect=[["a"], RuntimeError("down")])
+    cache = SnapshotCache("test", loader, ttl=10, max_stale=100, clock=clock)
+    await cache.get(MagicMock())
+    clock.now = 20
+    assert await cache.get(MagicMock(), refresh=True) == ["a"]
+    cache.invalidate()
+    loader.side_effect = RuntimeError("down")
+    with pytest.raises(RuntimeError):
+        await cache.get(MagicMock())
+
+
+@pytest.mark.asyncio
+async def test_snapshots_are_bounded():
+    clock = FakeClock()
+    loader = AsyncMock(side_effect=lambda client: [clock.now])
+    cache = SnapshotCache("test", loader, ttl=10, max_stale=20, max_size=2, clock=clock)
+    for key in ["a", "b", "c"]:
+        await cache.get(MagicMock(), key)
+    # The least recently used snapshot is dropped, finished loads are not kept
+    assert cache.peek("a") is None and cache.stats()["snapshots"] == 2
+    assert cache._inflight == {}
+
+    # Past max_stale a snapshot is loaded again before it is served
+    clock.now = 31
+    assert await cache.get(MagicMock(), "c") == [31]
+    assert cache.stats()["stale_hits"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_load_is_not_retried_at_once():
+    clock = FakeClock()
+    loader = AsyncMock(side_effect=RuntimeError("forbidden"))
+    cache = SnapshotCache(
+        "test", loader, ttl=10, max_stale=0, retry_after=60, clock=clock
+    )
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            await cache.get(MagicMock(), "token-hash")
+    assert loader.await_count == 1
+    assert cache.stats()["failure_hits"] == 2
+
+    # Other callers load their own directory
+    loader.side_effect = [["a"]]
+    assert await cache.get(MagicMock(), "other") == ["a"]
+    clock.now = 61
+    loader.side_effect = [["b"]]
+    assert await cache.get(MagicMock(), "token-hash") == ["b"]
+    assert loader.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_tools_use_the_directory():
+    ctx = MagicMock()
+    ctx.request_context.request.scope = {}
+    cache = SnapshotCache(
+        "test", AsyncMock(return_value=UserDirectory(USERS)), ttl=60, max_stale=0
+    )
+    with (
+        patch("tools.box_tools_users.get_box_client"),
+        patch("tools.box_tools_users.get_user_directory", return_value=cache),
+        patch("tools.box_tools_users.box_users_locate_by_email") as mock_locate,
+    ):
+        result = await box_users_locate_by_email_tool(ctx, "jroe@example.com")
+        assert result["user"]["id"] == "3"
+        mock_locate.assert_not_called()
+
+        result = await box_users_search_by_name_or_email_tool(ctx, "bob")
+        assert ids(result["users"]) == ["2"]
+
+        # Users missing from the directory are looked up in Box
+        mock_locate.return_value = {"user": {"id": "9"}}
+        result = await box_users_locate_by_email_tool(ctx, "new@example.com")
+        assert result == {"user": {"id": "9"}}